@@ -0,0 +1,253 @@
+import hashlib
+from array import array
+from itertools import compress
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.util.ints import uint32, uint64
+from clvm.casts import int_to_bytes
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+HASH_SIZE = 32
+
+_DTYPES = {"Q": "uint64", "I": "uint32", "B": "bool"}
+
+
+def _column(typecode: str, values: Iterable[int], count: int):
+    if numpy is not None: return numpy.fromiter(values, dtype=_DTYPES[typecode], count=count)
+    return array(typecode, values)
+
+
+def _select(column, mask):
+    if numpy is not None: return column[mask]
+    return array(column.typecode, compress(column, mask))
+
+
+def _concat(columns):
+    if numpy is not None: return numpy.concatenate(columns)
+    result = array(columns[0].typecode)
+    for column in columns: result.extend(column)
+    return result
+
+
+def _split_hashes(buffer: bytes) -> List[bytes]:
+    return [buffer[i:i + HASH_SIZE] for i in range(0, len(buffer), HASH_SIZE)]
+
+
+def _select_hashes(buffer: bytes, mask) -> bytes:
+    if numpy is not None: return numpy.frombuffer(buffer, dtype=f"V{HASH_SIZE}")[mask].tobytes()
+    return b"".join(compress(_split_hashes(buffer), mask))
+
+
+def _pack_hexstrs(hexstrs: Iterable[str]) -> bytes:
+    return bytes.fromhex("".join(h[2:] if h.startswith("0x") else h for h in hexstrs))
+
+
+def _sum_uint64(values) -> int:
+    """Sum a uint64 numpy array exactly, summing the lower and upper 32 bits separately to avoid overflow."""
+
+    shift = numpy.uint64(32)
+    low = values & numpy.uint64(0xFFFFFFFF)
+    high = values >> shift
+    return (int(high.sum(dtype=numpy.uint64)) << 32) + int(low.sum(dtype=numpy.uint64))
+
+
+class CoinRecordBatch():
+    """Columnar batch of coin records.
+
+    Integer and boolean fields are stored in contiguous arrays, one element per coin record: numpy arrays if numpy
+    is installed, and array.array instances otherwise. Parent coin infos and puzzle hashes are stored in packed buffers
+    of HASH_SIZE bytes per coin record. Coin names are computed on first access of names.
+
+    filter takes a boolean mask with one element per coin record, e.g. batch.spent_block_indices == 0 with numpy.
+    Filtering and aggregation don't create objects per coin record. Use coin_record or to_coin_records to convert
+    coin records into CoinRecord objects.
+    """
+
+    __slots__ = ("parent_coin_infos", "puzzle_hashes", "amounts", "confirmed_block_indices", "spent_block_indices", "coinbase", "timestamps", "_names")
+
+    def __init__(self, parent_coin_infos: bytes, puzzle_hashes: bytes, amounts, confirmed_block_indices, spent_block_indices, coinbase, timestamps):
+        """Initialize a CoinRecordBatch instance.
+
+        Arguments:
+        parent_coin_infos -- packed parent coin infos
+        puzzle_hashes -- packed puzzle hashes
+        amounts -- uint64 array of coin amounts
+        confirmed_block_indices -- uint32 array of confirmed block heights
+        spent_block_indices -- uint32 array of spent block heights (0 if unspent)
+        coinbase -- boolean array of coinbase flags
+        timestamps -- uint64 array of timestamps
+        """
+
+        self.parent_coin_infos = parent_coin_infos
+        self.puzzle_hashes = puzzle_hashes
+        self.amounts = amounts
+        self.confirmed_block_indices = confirmed_block_indices
+        self.spent_block_indices = spent_block_indices
+        self.coinbase = coinbase
+        self.timestamps = timestamps
+        self._names = None
+
+
+    @classmethod
+    def from_dicts(cls, coin_records: Sequence[Dict[str, Any]]) -> "CoinRecordBatch":
+        """Create a batch from coin record dicts as returned by the node provider.
+
+        Arguments:
+        coin_records -- list of coin record dicts
+        """
+
+        count = len(coin_records)
+        return cls(
+            _pack_hexstrs(cr["coin"]["parent_coin_info"] for cr in coin_records),
+            _pack_hexstrs(cr["coin"]["puzzle_hash"] for cr in coin_records),
+            _column("Q", (cr["coin"]["amount"] for cr in coin_records), count),
+            _column("I", (cr["confirmed_block_index"] for cr in coin_records), count),
+            _column("I", (cr["spent_block_index"] for cr in coin_records), count),
+            _column("B", (cr["coinbase"] for cr in coin_records), count),
+            _column("Q", (cr["timestamp"] for cr in coin_records), count),
+        )
+
+
+    @classmethod
+    def concat(cls, batches: Sequence["CoinRecordBatch"]) -> "CoinRecordBatch":
+        """Concatenate batches, e.g. the pages of a paginated query.
+
+        Arguments:
+        batches -- list of batches
+        """
+
+        if len(batches) == 0: return cls.from_dicts([])
+        return cls(
+            b"".join(b.parent_coin_infos for b in batches),
+            b"".join(b.puzzle_hashes for b in batches),
+            _concat([b.amounts for b in batches]),
+            _concat([b.confirmed_block_indices for b in batches]),
+            _concat([b.spent_block_indices for b in batches]),
+            _concat([b.coinbase for b in batches]),
+            _concat([b.timestamps for b in batches]),
+        )
+
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def __repr__(self) -> str:
+        return f"CoinRecordBatch({len(self)} coin records)"
+
+
+    @property
+    def names(self) -> bytes:
+        """Packed coin names."""
+
+        if self._names is None:
+            self._names = b"".join(
+                hashlib.sha256(parent_coin_info + puzzle_hash + int_to_bytes(int(amount))).digest()
+                for parent_coin_info, puzzle_hash, amount in zip(_split_hashes(self.parent_coin_infos), _split_hashes(self.puzzle_hashes), self.amounts)
+            )
+        return self._names
+
+    def name(self, index: int) -> bytes32:
+        return bytes32(self.names[index * HASH_SIZE:(index + 1) * HASH_SIZE])
+
+    def parent_coin_info(self, index: int) -> bytes32:
+        return bytes32(self.parent_coin_infos[index * HASH_SIZE:(index + 1) * HASH_SIZE])
+
+    def puzzle_hash(self, index: int) -> bytes32:
+        return bytes32(self.puzzle_hashes[index * HASH_SIZE:(index + 1) * HASH_SIZE])
+
+
+    def coin_record(self, index: int) -> CoinRecord:
+        """Return the coin record at the given index as a CoinRecord."""
+
+        return CoinRecord(
+            Coin(self.parent_coin_info(index), self.puzzle_hash(index), uint64(self.amounts[index])),
+            uint32(self.confirmed_block_indices[index]),
+            uint32(self.spent_block_indices[index]),
+            bool(self.coinbase[index]),
+            uint64(self.timestamps[index]),
+        )
+
+    def to_coin_records(self) -> List[CoinRecord]:
+        return [self.coin_record(i) for i in range(len(self))]
+
+
+    def filter(self, mask) -> "CoinRecordBatch":
+        """Return a batch with the coin records selected by a boolean mask.
+
+        Arguments:
+        mask -- sequence of booleans with one element per coin record
+        """
+
+        if numpy is not None: mask = numpy.asarray(mask, dtype=bool)
+        if len(mask) != len(self): raise ValueError(f"Mask length {len(mask)} differs from batch length {len(self)}")
+
+        batch = CoinRecordBatch(
+            _select_hashes(self.parent_coin_infos, mask),
+            _select_hashes(self.puzzle_hashes, mask),
+            _select(self.amounts, mask),
+            _select(self.confirmed_block_indices, mask),
+            _select(self.spent_block_indices, mask),
+            _select(self.coinbase, mask),
+            _select(self.timestamps, mask),
+        )
+        if self._names is not None: batch._names = _select_hashes(self._names, mask)
+        return batch
+
+    def unspent(self) -> "CoinRecordBatch":
+        """Return a batch with the unspent coin records."""
+
+        if numpy is not None: return self.filter(self.spent_block_indices == 0)
+        return self.filter([h == 0 for h in self.spent_block_indices])
+
+    def with_puzzle_hash(self, puzzle_hash: bytes32) -> "CoinRecordBatch":
+        """Return a batch with the coin records of the given puzzle hash."""
+
+        if numpy is not None:
+            hashes = numpy.frombuffer(self.puzzle_hashes, dtype=numpy.uint8).reshape(-1, HASH_SIZE)
+            return self.filter((hashes == numpy.frombuffer(bytes(puzzle_hash), dtype=numpy.uint8)).all(axis=1))
+        return self.filter([ph == puzzle_hash for ph in _split_hashes(self.puzzle_hashes)])
+
+
+    def total_amount(self) -> int:
+        """Return the sum of all coin amounts."""
+
+        if numpy is not None: return _sum_uint64(self.amounts)
+        return sum(self.amounts)
+
+    def amount_by_puzzle_hash(self) -> Dict[bytes32, int]:
+        """Return the sum of coin amounts per puzzle hash."""
+
+        if numpy is not None:
+            hashes, inverse = numpy.unique(numpy.frombuffer(self.puzzle_hashes, dtype=f"V{HASH_SIZE}"), return_inverse=True)
+            inverse = inverse.reshape(-1)
+            low = numpy.zeros(len(hashes), dtype=numpy.uint64)
+            high = numpy.zeros(len(hashes), dtype=numpy.uint64)
+            numpy.add.at(low, inverse, self.amounts & numpy.uint64(0xFFFFFFFF))
+            numpy.add.at(high, inverse, self.amounts >> numpy.uint64(32))
+            return {bytes32(h.tobytes()): (int(hi) << 32) + int(lo) for h, hi, lo in zip(hashes, high, low)}
+
+        amounts = {}
+        for puzzle_hash, amount in zip(_split_hashes(self.puzzle_hashes), self.amounts):
+            amounts[puzzle_hash] = amounts.get(puzzle_hash, 0) + amount
+        return {bytes32(ph): amount for ph, amount in amounts.items()}
+
+    def balance_by_puzzle_hash(self) -> Dict[bytes32, int]:
+        """Return the sum of unspent coin amounts per puzzle hash."""
+
+        return self.unspent().amount_by_puzzle_hash()
+
+
+def convert_coin_record_batch(coin_records: List[Dict[str, Any]]) -> CoinRecordBatch:
+    return CoinRecordBatch.from_dicts(coin_records)
+
+
+def convert_additions_and_removals_batches(additions_and_removals: Dict[str, Any]) -> Tuple[CoinRecordBatch, CoinRecordBatch]:
+    return convert_coin_record_batch(additions_and_removals["additions"]), convert_coin_record_batch(additions_and_removals["removals"])
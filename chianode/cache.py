@@ -0,0 +1,406 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from .constants import CONTENT_ADDRESSED_ENDPOINTS, DEFAULT_CONFIRMATION_DEPTH, DISK_CACHE_FLUSH_INTERVAL, DISK_CACHE_WRITE_BATCH_SIZE
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+# Endpoints whose responses are cached if they are final
+HEIGHT_KEYED_ENDPOINTS = ["get_block_record_by_height", "get_block_records", "get_blocks", "get_coin_record_by_name"]
+
+# Endpoints whose decoded responses the cache needs. Responses of other endpoints are cached without being decoded
+DECODED_ENDPOINTS = ["get_blockchain_state", "get_coin_record_by_name"]
+
+_FAILURE = re.compile(rb'"success"\s*:\s*false')
+
+
+class ResponseCache():
+    """Size-bounded LRU cache for responses containing immutable blockchain data.
+
+    The cache stores raw response bodies. Which responses get cached is decided by the update method:
+      * Responses of content-addressed endpoints (constants.CONTENT_ADDRESSED_ENDPOINTS) are always cached
+      * Block records and blocks requested by height are cached if they are buried at least confirmation_depth blocks below the peak
+      * Coin records are cached if the coin was spent at least confirmation_depth blocks below the peak
+
+    The peak is learned from get_blockchain_state responses. Until a peak has been observed, height-keyed responses are not cached.
+    Peaks lower than the current one (e.g. from a node lagging behind) are ignored. If a new peak doesn't extend the current one,
+    a reorg is assumed and height-keyed responses within confirmation_depth blocks of the new peak are dropped.
+
+    A cache instance can be shared by several clients connected to the same network.
+    """
+
+    def __init__(self, max_entries: Optional[int] =None, max_bytes: Optional[int] =None, confirmation_depth: int =DEFAULT_CONFIRMATION_DEPTH):
+        """Initialize a ResponseCache instance.
+
+        At least one of max_entries and max_bytes must be provided.
+
+        Keyword arguments:
+        max_entries -- maximum number of cached responses
+        max_bytes -- maximum total size of cached responses in bytes
+        confirmation_depth -- number of blocks below the peak from which on height-keyed data is considered final. Default is constants.DEFAULT_CONFIRMATION_DEPTH
+        """
+
+        if max_entries is None and max_bytes is None:
+            raise ValueError("Must provide a value for 'max_entries' or 'max_bytes' parameter (or both)")
+        if confirmation_depth < 0:
+            raise ValueError("Confirmation depth must be non-negative")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.confirmation_depth = confirmation_depth
+
+        self.size = 0 # total size of cached responses in bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict() # cache key -> (response body, height or None)
+        self._peak = None # (height, header hash) of latest peak observed
+
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+    @property
+    def peak_height(self) -> Optional[int]:
+        return None if self._peak is None else self._peak[0]
+
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """Return the cached response body for a request key, or None on a cache miss.
+
+        Arguments:
+        key -- request key
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+
+    def put(self, key: Hashable, payload: bytes, height: Optional[int] =None):
+        """Add a response body to the cache, evicting least recently used responses if the cache is full.
+
+        Arguments:
+        key -- request key
+        payload -- response body
+
+        Keyword arguments:
+        height -- block height the response depends on, or None if the response is content-addressed
+        """
+
+        if self.max_bytes is not None and len(payload) > self.max_bytes: return
+
+        if key in self._entries: self._remove(key)
+        self._entries[key] = (payload, height)
+        self.size += len(payload)
+
+        while (self.max_entries is not None and len(self._entries) > self.max_entries) or (self.max_bytes is not None and self.size > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+
+    def is_cacheable(self, endpoint: str) -> bool:
+        """Return True if responses from the given endpoint may be cached.
+
+        Arguments:
+        endpoint -- endpoint a request is sent to
+        """
+
+        return endpoint in HEIGHT_KEYED_ENDPOINTS or "/" + endpoint in CONTENT_ADDRESSED_ENDPOINTS
+
+
+    def is_relevant(self, endpoint: str) -> bool:
+        """Return True if responses from the given endpoint may be cached or are used to track the peak.
+
+        Arguments:
+        endpoint -- endpoint a request is sent to
+        """
+
+        return endpoint == "get_blockchain_state" or self.is_cacheable(endpoint)
+
+
+    def update(self, endpoint: str, params: Dict[str, Any], key: Hashable, payload: bytes, response: Optional[Dict[str, Any]] =None):
+        """Cache a response if its data is immutable, and track the peak to detect reorgs.
+
+        Arguments:
+        endpoint -- endpoint the request was sent to
+        params -- request parameters
+        key -- request key
+        payload -- response body
+
+        Keyword arguments:
+        response -- decoded response body. Required for endpoints in DECODED_ENDPOINTS. For other endpoints, failed
+                    responses are recognized in the payload, so that large responses don't need to be decoded
+        """
+
+        if response is not None:
+            if not response.get("success", True): return
+        elif _FAILURE.search(payload) is not None:
+            return
+
+        if endpoint == "get_blockchain_state":
+            peak = response["blockchain_state"]["peak"]
+            if peak is not None: self.observe_peak(peak["height"], peak["header_hash"], peak["prev_hash"])
+        elif "/" + endpoint in CONTENT_ADDRESSED_ENDPOINTS:
+            self.put(key, payload)
+        elif endpoint == "get_block_record_by_height":
+            self._put_final(key, payload, params["height"])
+        elif endpoint == "get_block_records" or endpoint == "get_blocks":
+            self._put_final(key, payload, params["end"] - 1)
+        elif endpoint == "get_coin_record_by_name":
+            spent_block_index = response["coin_record"]["spent_block_index"]
+            if spent_block_index > 0: self._put_final(key, payload, spent_block_index)
+
+
+    def observe_peak(self, height: int, header_hash: str, prev_hash: str):
+        """Record a new peak, and drop height-keyed responses close to it if it doesn't extend the previous peak.
+
+        Peaks lower than the current peak are ignored.
+
+        Arguments:
+        height -- height of the peak
+        header_hash -- header hash of the peak
+        prev_hash -- header hash of the block preceding the peak
+        """
+
+        if self._peak is not None:
+            peak_height, peak_header_hash = self._peak
+            if height < peak_height or (height == peak_height and header_hash == peak_header_hash): return
+            if height == peak_height or (height == peak_height + 1 and prev_hash != peak_header_hash):
+                # Responses are only cached confirmation_depth blocks below the peak, so shallower reorgs can't affect the others
+                invalidate_height = max(0, height - self.confirmation_depth)
+                logging.info(f"Reorg detected at height {height}. Dropping cached height-keyed responses from height {invalidate_height}")
+                self.invalidate_heights(invalidate_height)
+
+        self._peak = (height, header_hash)
+
+
+    def invalidate_heights(self, height: int =0):
+        """Drop cached height-keyed responses at or above a block height.
+
+        Keyword arguments:
+        height -- lowest block height to drop. Default is 0 (drop all height-keyed responses)
+        """
+
+        for key in [k for k, (_, h) in self._entries.items() if h is not None and h >= height]:
+            self._remove(key)
+
+
+    def clear(self):
+        """Drop all cached responses."""
+
+        self._entries.clear()
+        self.size = 0
+
+
+    def _put_final(self, key: Hashable, payload: bytes, height: int):
+        """Cache a height-keyed response if the height is buried deep enough below the peak."""
+
+        if self._peak is not None and height <= self._peak[0] - self.confirmation_depth:
+            self.put(key, payload, height)
+
+
+    def _remove(self, key: Hashable):
+        payload, _ = self._entries.pop(key)
+        self.size -= len(payload)
+
+
+class DiskResponseCache(ResponseCache):
+    """Persistent cache for responses containing immutable blockchain data, backed by a local SQLite database.
+
+    Uses the same caching policy as ResponseCache, and can be passed to a client in its place. Cached responses
+    and the latest peak observed survive restarts. The database is opened in WAL mode. New responses and access times
+    are buffered and written in bulk once write_batch_size of either have accumulated, once flush_interval seconds have
+    passed since the last write, or when flush or close is called. When the cache exceeds max_entries or max_bytes,
+    least recently used responses are evicted.
+
+    Database reads and writes are synchronous and block the event loop while they run. Reads are lookups by primary key,
+    and writes are batched, so this is cheap for a local database, but a database on slow storage delays all other tasks.
+    """
+
+    def __init__(
+            self,
+            path: str,
+            max_entries: Optional[int] =None,
+            max_bytes: Optional[int] =None,
+            confirmation_depth: int =DEFAULT_CONFIRMATION_DEPTH,
+            write_batch_size: int =DISK_CACHE_WRITE_BATCH_SIZE,
+            flush_interval: Optional[float] =DISK_CACHE_FLUSH_INTERVAL
+    ):
+        """Initialize a DiskResponseCache instance.
+
+        At least one of max_entries and max_bytes must be provided.
+
+        Arguments:
+        path -- path of the SQLite database file. Created if it doesn't exist
+
+        Keyword arguments:
+        max_entries -- maximum number of cached responses
+        max_bytes -- maximum total size of cached responses in bytes
+        confirmation_depth -- number of blocks below the peak from which on height-keyed data is considered final. Default is constants.DEFAULT_CONFIRMATION_DEPTH
+        write_batch_size -- number of new responses or access times buffered before they are written to the database. Default is constants.DISK_CACHE_WRITE_BATCH_SIZE
+        flush_interval -- maximum age in seconds of buffered writes before they are written on the next cache access. Set to None to write by count only. Default is constants.DISK_CACHE_FLUSH_INTERVAL
+        """
+
+        ResponseCache.__init__(self, max_entries=max_entries, max_bytes=max_bytes, confirmation_depth=confirmation_depth)
+
+        self.path = path
+        self.write_batch_size = write_batch_size
+        self.flush_interval = flush_interval
+        self._flushed = time.monotonic() # time of last write
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key BLOB PRIMARY KEY, payload BLOB NOT NULL, height INTEGER, size INTEGER NOT NULL, accessed INTEGER NOT NULL)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_height ON responses(height)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS peak (id INTEGER PRIMARY KEY CHECK (id = 0), height INTEGER NOT NULL, header_hash TEXT NOT NULL)")
+        self._db.commit()
+
+        count, size, accessed = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(MAX(accessed), 0) FROM responses").fetchone()
+        self._count = count
+        self.size = size
+        self._clock = accessed # logical clock for LRU ordering
+
+        row = self._db.execute("SELECT height, header_hash FROM peak").fetchone()
+        if row is not None: self._peak = (row[0], row[1])
+
+        self._pending = {} # database key -> (payload, height) of responses not yet written
+        self._accessed = {} # database key -> logical access time not yet written
+
+
+    def __len__(self) -> int:
+        return self._count + len(self._pending)
+
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+
+        db_key = self._db_key(key)
+        self._clock += 1
+
+        if db_key in self._pending:
+            self.hits += 1
+            return self._pending[db_key][0]
+
+        row = self._db.execute("SELECT payload FROM responses WHERE key = ?", (db_key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._accessed[db_key] = self._clock
+        self._maybe_flush()
+        return row[0]
+
+
+    def put(self, key: Hashable, payload: bytes, height: Optional[int] =None):
+
+        if self.max_bytes is not None and len(payload) > self.max_bytes: return
+
+        self._pending[self._db_key(key)] = (payload, height)
+        self._maybe_flush()
+
+
+    def observe_peak(self, height: int, header_hash: str, prev_hash: str):
+
+        peak = self._peak
+        ResponseCache.observe_peak(self, height, header_hash, prev_hash)
+        if self._peak != peak:
+            self._db.execute("INSERT OR REPLACE INTO peak (id, height, header_hash) VALUES (0, ?, ?)", self._peak)
+            self._db.commit()
+
+
+    def invalidate_heights(self, height: int =0):
+
+        self._pending = {k: (p, h) for k, (p, h) in self._pending.items() if h is None or h < height}
+        self._db.execute("DELETE FROM responses WHERE height >= ?", (height,))
+        self._db.commit()
+        self._refresh_totals()
+
+
+    def clear(self):
+
+        self._pending.clear()
+        self._accessed.clear()
+        self._db.execute("DELETE FROM responses")
+        self._db.commit()
+        self._refresh_totals()
+
+
+    def flush(self):
+        """Write buffered responses and access times to the database, and evict responses if the cache is full."""
+
+        added = len(self._pending) > 0
+        if added:
+            self._clock += 1
+            rows = [(k, p, h, len(p), self._clock) for k, (p, h) in self._pending.items()]
+            self._db.executemany("INSERT OR REPLACE INTO responses (key, payload, height, size, accessed) VALUES (?, ?, ?, ?, ?)", rows)
+            self._pending.clear()
+
+        if self._accessed:
+            self._db.executemany("UPDATE responses SET accessed = ? WHERE key = ?", [(t, k) for k, t in self._accessed.items()])
+            self._accessed.clear()
+
+        self._db.commit()
+        if added: # access times don't change the size of the cache
+            self._refresh_totals()
+            self._evict()
+        self._flushed = time.monotonic()
+
+
+    def _maybe_flush(self):
+        """Flush buffered writes if enough of them have accumulated or the oldest is due."""
+
+        if len(self._pending) >= self.write_batch_size or len(self._accessed) >= self.write_batch_size:
+            self.flush()
+        elif (self._pending or self._accessed) and self.flush_interval is not None and time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+
+    def close(self):
+        """Flush buffered writes and close the database."""
+
+        self.flush()
+        self._db.close()
+
+
+    def _evict(self):
+        """Delete least recently used responses until the cache is within its limits."""
+
+        while (self.max_entries is not None and self._count > self.max_entries) or (self.max_bytes is not None and self.size > self.max_bytes):
+            excess = self._count - self.max_entries if self.max_entries is not None else 0
+            # Evict in batches to avoid a round trip per response
+            rows = self._db.execute("SELECT key, size FROM responses ORDER BY accessed LIMIT ?", (max(excess, 100),)).fetchall()
+            if not rows: break
+            evicted = []
+            for db_key, size in rows:
+                if not ((self.max_entries is not None and self._count > self.max_entries) or (self.max_bytes is not None and self.size > self.max_bytes)): break
+                evicted.append((db_key,))
+                self._count -= 1
+                self.size -= size
+            self._db.executemany("DELETE FROM responses WHERE key = ?", evicted)
+            self._db.commit()
+
+
+    def _refresh_totals(self):
+        self._count, self.size = self._db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        self.size += sum(len(p) for p, _ in self._pending.values())
+
+
+    @staticmethod
+    def _db_key(key: Hashable) -> bytes:
+        url, data = key
+        return hashlib.sha256(url.encode() + b"\x00" + data).digest()
@@ -0,0 +1,174 @@
+import logging
+from typing import AsyncIterator, Dict, List, Optional
+
+from chia.consensus.block_record import BlockRecord
+from chia.types.blockchain_format.sized_bytes import bytes32
+
+from .constants import ChainEventType, Decode, DEFAULT_CHAIN_POLL_INTERVAL, DEFAULT_CHAIN_WINDOW
+from .trigger import PollTrigger
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class ChainEvent():
+    """Block connected to or disconnected from the main chain followed by a ChainFollower."""
+
+    __slots__ = ("type", "block_record")
+
+    def __init__(self, type: ChainEventType, block_record: BlockRecord):
+        self.type = type
+        self.block_record = block_record
+
+    def __repr__(self) -> str:
+        return f"ChainEvent({self.type.name}, height={self.block_record.height}, header_hash={self.block_record.header_hash})"
+
+
+class ChainFollower():
+    """Follower of a node's main chain, detecting reorgs.
+
+    The follower polls the node's peak and yields a ChainEvent for each block connected to or disconnected from
+    the main chain, in order: on a reorg, the blocks of the abandoned chain are disconnected from the top down to
+    the fork point, and then the blocks of the new chain are connected from the bottom up.
+
+    The block records of the last window blocks of the main chain are kept in memory, keyed by header hash and height.
+    Missing blocks are fetched in bulk with get_block_records. Reorgs deeper than window blocks can't be traced
+    to the fork point, in which case all blocks in the window are disconnected. When catching up from start_height,
+    at most window blocks are connected per poll.
+
+    Polls happen every interval seconds. With use_events enabled, Mojonode block events trigger a poll as soon as
+    a new block arrives, and interval only serves as a fallback for when the stream is down.
+    """
+
+    def __init__(
+            self,
+            client,
+            interval: float = DEFAULT_CHAIN_POLL_INTERVAL,
+            window: int = DEFAULT_CHAIN_WINDOW,
+            start_height: Optional[int] = None,
+            use_events: bool = False
+    ):
+        """Initialize a ChainFollower instance.
+
+        Arguments:
+        client -- StandardClient or MojoClient to fetch block records with
+
+        Keyword arguments:
+        interval -- maximum number of seconds between polls. Default is constants.DEFAULT_CHAIN_POLL_INTERVAL
+        window -- number of recent blocks kept in memory, i.e. maximum reorg depth traced to the fork point. Default is constants.DEFAULT_CHAIN_WINDOW
+        start_height -- height of the first block to connect. Default is None (start with the node's peak)
+        use_events -- boolean indicating whether to poll on Mojonode block events. Requires a MojoClient. Default is False
+        """
+
+        if use_events and not hasattr(client, "events"): raise ValueError("Polling on events requires a MojoClient")
+        if window < 1: raise ValueError("Window must be a positive integer")
+        if start_height is not None and start_height < 0: raise ValueError("Start height must be non-negative")
+
+        self.client = client
+        self.window = window
+        self.start_height = start_height
+        self.trigger = PollTrigger(interval, client if use_events else None, "block")
+        self.peak: Optional[BlockRecord] = None # highest block connected
+        self._by_hash: Dict[bytes32, BlockRecord] = {}
+        self._by_height: Dict[int, BlockRecord] = {}
+
+
+    def get_block_record(self, header_hash: bytes32) -> Optional[BlockRecord]:
+        """Return the block record of a main chain block in the window, or None if there is none."""
+
+        return self._by_hash.get(header_hash)
+
+    def get_block_record_by_height(self, height: int) -> Optional[BlockRecord]:
+        """Return the block record of the main chain block at the given height in the window, or None if there is none."""
+
+        return self._by_height.get(height)
+
+
+    async def _fetch(self, height_start: int, height_end: int) -> List[BlockRecord]:
+        if height_start >= height_end: return []
+        return await self.client.get_block_records(height_start, height_end, decode=Decode.CHIA)
+
+
+    def _connect(self, block_record: BlockRecord) -> ChainEvent:
+        self._by_hash[block_record.header_hash] = block_record
+        self._by_height[block_record.height] = block_record
+        self.peak = block_record
+        return ChainEvent(ChainEventType.CONNECT, block_record)
+
+    def _disconnect(self, block_record: BlockRecord) -> ChainEvent:
+        del self._by_hash[block_record.header_hash]
+        del self._by_height[block_record.height]
+        self.peak = self._by_height.get(block_record.height - 1)
+        return ChainEvent(ChainEventType.DISCONNECT, block_record)
+
+
+    def _evict(self):
+        """Drop blocks that fell out of the window."""
+
+        min_height = self.peak.height - self.window + 1
+        for height in [h for h in self._by_height.keys() if h < min_height]:
+            del self._by_hash[self._by_height.pop(height).header_hash]
+
+
+    async def poll(self) -> List[ChainEvent]:
+        """Fetch the node's peak and return the events bringing the follower up to date with it."""
+
+        node_peak = (await self.client.get_blockchain_state())["peak"]
+        if node_peak is None: return []
+        if self.peak is not None and node_peak.header_hash == self.peak.header_hash: return []
+        if self.peak is not None and node_peak.weight < self.peak.weight: return [] # node is behind, e.g. another node in a node pool
+
+        if self.peak is None:
+            height_start = self.start_height if self.start_height is not None else node_peak.height
+            height_end = min(node_peak.height + 1, height_start + self.window)
+            records = await self._fetch(height_start, height_end)
+            fork_height = height_start - 1
+        else:
+            # Fetch the node's chain from the highest height both chains may share, extending it downwards until it
+            # meets the followed chain. Chains that diverged don't converge again, so the fork is where they stop matching.
+            min_height = min(self._by_height.keys())
+            height_start = min(self.peak.height, node_peak.height)
+            height_end = min(node_peak.height + 1, self.peak.height + 1 + self.window)
+            records = await self._fetch(height_start, height_end)
+            while True:
+                fork_height = None
+                for record in records:
+                    followed = self._by_height.get(record.height)
+                    if followed is None or followed.header_hash != record.header_hash: break
+                    fork_height = record.height
+                if fork_height is not None or height_start <= min_height: break
+                # Double the depth searched for the fork point
+                depth = height_end - height_start
+                records = await self._fetch(max(min_height, height_start - depth), height_start) + records
+                height_start = max(min_height, height_start - depth)
+
+            if fork_height is None:
+                logging.warning(f"Reorg deeper than the window of {self.window} blocks, disconnecting all blocks in the window")
+                fork_height = min_height - 1
+
+        for previous, record in zip(records, records[1:]):
+            if record.prev_hash != previous.header_hash:
+                logging.info("Node's chain changed while fetching block records, retrying")
+                self.trigger.fire()
+                return []
+
+        events = []
+        while self.peak is not None and self.peak.height > fork_height:
+            events.append(self._disconnect(self.peak))
+        for record in records:
+            if record.height > fork_height: events.append(self._connect(record))
+        if self.peak is not None: self._evict()
+
+        if len(records) > 0 and records[-1].height < node_peak.height: self.trigger.fire() # continue catching up right away
+
+        return events
+
+
+    def events(self) -> AsyncIterator[ChainEvent]:
+        """Follow the node's main chain and yield block connect and disconnect events in order."""
+
+        return self.trigger.run(self.poll)
+
+
+    def __aiter__(self) -> AsyncIterator[ChainEvent]:
+        return self.events()
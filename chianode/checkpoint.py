@@ -0,0 +1,185 @@
+import abc
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, Optional
+
+from .constants import CHECKPOINT_FLUSH_INTERVAL, CHECKPOINT_WRITE_BATCH_SIZE
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class CheckpointStore():
+    """In-memory store of event stream checkpoints, the timestamps of the last events processed per stream.
+
+    Pass a checkpoint store to MojoClient.events to resume a stream where it left off. This class keeps checkpoints
+    in memory only, which lets streams resume across reconnects and stream restarts within a process.
+    Use FileCheckpointStore or SQLiteCheckpointStore to resume across process restarts.
+    """
+
+    def __init__(self):
+        self._checkpoints: Dict[str, str] = {} # timestamp of last processed event by stream key
+
+
+    def load(self, key: str) -> Optional[str]:
+        """Return the checkpoint of a stream, or None if there is none.
+
+        Arguments:
+        key -- stream key
+        """
+
+        return self._checkpoints.get(key)
+
+
+    def save(self, key: str, ts: str):
+        """Record the timestamp of the last event processed on a stream.
+
+        Arguments:
+        key -- stream key
+        ts -- timestamp of the event
+        """
+
+        self._checkpoints[key] = ts
+
+
+    def flush(self):
+        """Write buffered checkpoints to durable storage."""
+
+        pass
+
+
+    def close(self):
+        """Flush buffered checkpoints and release the store's resources."""
+
+        self.flush()
+
+
+class _BatchedCheckpointStore(CheckpointStore, abc.ABC):
+    """Checkpoint store that buffers saves and writes them in bulk, by count or by age."""
+
+    def __init__(self, write_batch_size: int =CHECKPOINT_WRITE_BATCH_SIZE, flush_interval: Optional[float] =CHECKPOINT_FLUSH_INTERVAL):
+
+        if write_batch_size < 1: raise ValueError("Write batch size must be a positive integer")
+        if flush_interval is not None and flush_interval < 0: raise ValueError("Flush interval must be None or non-negative")
+
+        CheckpointStore.__init__(self)
+        self.write_batch_size = write_batch_size
+        self.flush_interval = flush_interval
+        self._pending = 0 # number of saves not yet written
+        self._flushed = time.monotonic() # time of last write
+
+
+    def save(self, key: str, ts: str):
+
+        CheckpointStore.save(self, key, ts)
+        self._pending += 1
+        if self._pending >= self.write_batch_size or (self.flush_interval is not None and time.monotonic() - self._flushed >= self.flush_interval):
+            self.flush()
+
+
+    def flush(self):
+
+        if self._pending > 0: self._write()
+        self._pending = 0
+        self._flushed = time.monotonic()
+
+
+    @abc.abstractmethod
+    def _write(self):
+        """Write the buffered checkpoints to durable storage."""
+
+
+class FileCheckpointStore(_BatchedCheckpointStore):
+    """Checkpoint store persisting checkpoints to a JSON file.
+
+    Saves are buffered and written once write_batch_size of them have accumulated or flush_interval seconds have
+    passed since the last write, or when flush or close is called. Each write replaces the file atomically with
+    a fsynced copy, so the file always holds a complete set of checkpoints. Checkpoints saved after the last write
+    are lost on a crash, and the events after the last written checkpoint are streamed again on restart.
+    """
+
+    def __init__(self, path: str, write_batch_size: int =CHECKPOINT_WRITE_BATCH_SIZE, flush_interval: Optional[float] =CHECKPOINT_FLUSH_INTERVAL):
+        """Initialize a FileCheckpointStore instance.
+
+        Arguments:
+        path -- path of the JSON file. Created on the first write if it doesn't exist
+
+        Keyword arguments:
+        write_batch_size -- number of saves buffered before checkpoints are written. Default is constants.CHECKPOINT_WRITE_BATCH_SIZE
+        flush_interval -- maximum age in seconds of buffered saves before checkpoints are written on the next save. Set to None to write by count only. Default is constants.CHECKPOINT_FLUSH_INTERVAL
+        """
+
+        _BatchedCheckpointStore.__init__(self, write_batch_size=write_batch_size, flush_interval=flush_interval)
+
+        self.path = path
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                self._checkpoints = json.load(f)
+
+
+    def _write(self):
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._checkpoints, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        logging.debug(f"Wrote {len(self._checkpoints)} event stream checkpoints to {self.path}")
+
+
+class SQLiteCheckpointStore(_BatchedCheckpointStore):
+    """Checkpoint store persisting checkpoints to a local SQLite database.
+
+    Saves are buffered and written in one transaction once write_batch_size of them have accumulated or flush_interval
+    seconds have passed since the last write, or when flush or close is called. The database is opened in WAL mode
+    with full synchronization, so that each write is durable once committed. A database can be shared with a
+    DiskResponseCache.
+    """
+
+    def __init__(self, path: str, write_batch_size: int =CHECKPOINT_WRITE_BATCH_SIZE, flush_interval: Optional[float] =CHECKPOINT_FLUSH_INTERVAL):
+        """Initialize a SQLiteCheckpointStore instance.
+
+        Arguments:
+        path -- path of the SQLite database file. Created if it doesn't exist
+
+        Keyword arguments:
+        write_batch_size -- number of saves buffered before checkpoints are written. Default is constants.CHECKPOINT_WRITE_BATCH_SIZE
+        flush_interval -- maximum age in seconds of buffered saves before checkpoints are written on the next save. Set to None to write by count only. Default is constants.CHECKPOINT_FLUSH_INTERVAL
+        """
+
+        _BatchedCheckpointStore.__init__(self, write_batch_size=write_batch_size, flush_interval=flush_interval)
+
+        self.path = path
+        self._dirty = set() # keys of checkpoints not yet written
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=FULL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, ts TEXT NOT NULL)")
+        self._db.commit()
+
+        self._checkpoints = dict(self._db.execute("SELECT key, ts FROM checkpoints").fetchall())
+
+
+    def save(self, key: str, ts: str):
+
+        self._dirty.add(key)
+        _BatchedCheckpointStore.save(self, key, ts)
+
+
+    def close(self):
+        """Flush buffered checkpoints and close the database."""
+
+        self.flush()
+        self._db.close()
+
+
+    def _write(self):
+
+        self._db.executemany("INSERT OR REPLACE INTO checkpoints (key, ts) VALUES (?, ?)", [(k, self._checkpoints[k]) for k in self._dirty])
+        self._db.commit()
+        self._dirty.clear()
@@ -0,0 +1,110 @@
+import json
+import re
+from typing import Any, Union
+
+from .constants import JsonCodec
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+# Integer literals that may not fit into 64 bits: 20 or more digits, or 19 or more digits if negative (int64 min has 19 digits).
+# Hex strings can't match since they contain none of the preceding characters
+_LARGE_INT = re.compile(rb'[:,\[]\s*(?:\d{20}|-\d{19})')
+
+
+def _has_large_int(data: Union[bytes, str]) -> bool:
+    if isinstance(data, str): data = data.encode()
+    return _LARGE_INT.search(data) is not None
+
+
+class StdlibCodec():
+    """JSON codec based on the json module of the Python standard library."""
+
+    json_codec = JsonCodec.STDLIB
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(StdlibCodec):
+    """JSON codec based on orjson.
+
+    orjson only supports integers up to 64 bits and silently decodes larger ones as floats. Chia data can contain
+    larger integers (e.g. weight, total_iters or network space), in which case encoding or decoding falls back to the standard library.
+    Data orjson fails to decode is also retried with the standard library.
+    """
+
+    json_codec = JsonCodec.ORJSON
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return StdlibCodec.dumps(self, obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if _has_large_int(data): return StdlibCodec.loads(self, data)
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return StdlibCodec.loads(self, data)
+
+
+class MsgspecCodec(StdlibCodec):
+    """JSON codec based on msgspec.
+
+    Falls back to the standard library for data msgspec can't handle (e.g. integers exceeding 64 bits).
+    """
+
+    json_codec = JsonCodec.MSGSPEC
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except (TypeError, OverflowError):
+            return StdlibCodec.dumps(self, obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        if _has_large_int(data): return StdlibCodec.loads(self, data)
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError:
+            return StdlibCodec.loads(self, data)
+
+
+def get_codec(json_codec: JsonCodec = JsonCodec.AUTO) -> StdlibCodec:
+    """Return a codec instance for the requested JSON codec.
+
+    Keyword arguments:
+    json_codec -- codec to use. JsonCodec.AUTO selects orjson, msgspec or the standard library, whichever is installed first in this order
+    """
+
+    if json_codec == JsonCodec.AUTO:
+        if orjson is not None: return OrjsonCodec()
+        if msgspec is not None: return MsgspecCodec()
+        return StdlibCodec()
+    elif json_codec == JsonCodec.STDLIB:
+        return StdlibCodec()
+    elif json_codec == JsonCodec.ORJSON:
+        if orjson is None: raise ImportError("JSON codec ORJSON requires the orjson package to be installed")
+        return OrjsonCodec()
+    elif json_codec == JsonCodec.MSGSPEC:
+        if msgspec is None: raise ImportError("JSON codec MSGSPEC requires the msgspec package to be installed")
+        return MsgspecCodec()
+    else:
+        raise ValueError(f"Unknown JSON codec {json_codec.name}")
@@ -0,0 +1,117 @@
+import asyncio
+import httpx
+import logging
+from typing import Dict, Optional, Tuple
+
+from .constants import DEFAULT_KEEPALIVE_EXPIRY, DEFAULT_MAX_CONNECTIONS, DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Transport handed out to clients by a ConnectionPool. Closing it leaves the underlying transport open."""
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass # the underlying transport is closed by the connection pool
+
+
+class ConnectionPool():
+    """HTTP connection pool that can be shared by many StandardClient and MojoClient instances.
+
+    Clients sharing a pool reuse its open connections, so that only the first request to a node provider pays for
+    the TCP and TLS handshakes. Connections with different TLS settings (e.g. a full node's private certificate vs Mojonode)
+    can't be shared, so the pool keeps one set of connections per TLS configuration, each subject to the limits.
+
+    Use the pool as an async context manager, or call aclose, to close all connections once the clients are no longer used.
+    Closing a client doesn't close the pool's connections.
+    """
+
+    def __init__(
+            self,
+            max_connections: Optional[int] = DEFAULT_MAX_CONNECTIONS,
+            max_keepalive_connections: Optional[int] = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry: Optional[float] = DEFAULT_KEEPALIVE_EXPIRY,
+            http1: bool = True,
+            http2: bool = True
+    ):
+        """Initialize a ConnectionPool instance.
+
+        Keyword arguments:
+        max_connections -- maximum number of connections per TLS configuration. Default is constants.DEFAULT_MAX_CONNECTIONS. Set to None for no limit
+        max_keepalive_connections -- maximum number of idle connections kept open per TLS configuration. Default is constants.DEFAULT_MAX_KEEPALIVE_CONNECTIONS. Set to None for no limit
+        keepalive_expiry -- seconds after which idle connections are closed. Default is constants.DEFAULT_KEEPALIVE_EXPIRY. Set to None to keep them open
+        http1 -- boolean indicating whether to support HTTP/1.1. Default is True
+        http2 -- boolean indicating whether to support HTTP/2, which multiplexes concurrent requests over a single connection. Default is True
+        """
+
+        if not (http1 or http2): raise ValueError("At least one of HTTP/1.1 and HTTP/2 must be enabled")
+
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive_connections, keepalive_expiry=keepalive_expiry)
+        self.http1 = http1
+        self.http2 = http2
+        self._transports: Dict[Tuple, httpx.AsyncHTTPTransport] = {}
+        self._base_urls: Dict[str, Tuple] = {} # base URLs of clients by TLS configuration, for prewarming
+
+
+    def transport(self, base_url: str, cert: Optional[Tuple[str, str]] =None, verify: bool =True) -> httpx.AsyncBaseTransport:
+        """Return a transport using the pool's connections for the given TLS configuration.
+
+        Arguments:
+        base_url -- base URL the transport is used for. Connections to it are opened by prewarm
+
+        Keyword arguments:
+        cert -- tuple of paths to a client certificate and key file
+        verify -- boolean indicating whether to verify the server's certificate
+        """
+
+        tls = (cert, verify)
+        if tls not in self._transports:
+            self._transports[tls] = httpx.AsyncHTTPTransport(verify=verify, cert=cert, http1=self.http1, http2=self.http2, limits=self.limits)
+        self._base_urls[base_url] = tls
+
+        return _SharedTransport(self._transports[tls])
+
+
+    async def prewarm(self, timeout: Optional[float] =5):
+        """Open a connection to the base URL of each client using the pool, so that the clients' first requests don't wait for handshakes.
+
+        Connection failures are logged and otherwise ignored.
+
+        Keyword arguments:
+        timeout -- timeout in seconds per connection. Default is 5 seconds
+        """
+
+        async def connect(base_url: str, tls: Tuple):
+            request = httpx.Request("HEAD", base_url, extensions={"timeout": httpx.Timeout(timeout).as_dict()})
+            try:
+                response = await self._transports[tls].handle_async_request(request)
+                await response.aread()
+                await response.aclose()
+                logging.debug(f"Prewarmed connection to {base_url}")
+            except httpx.HTTPError as e:
+                logging.warning(f"Failed to prewarm connection to {base_url} ({e!r})")
+
+        await asyncio.gather(*[connect(base_url, tls) for base_url, tls in self._base_urls.items()])
+
+
+    async def aclose(self):
+        """Close all connections."""
+
+        for transport in self._transports.values():
+            await transport.aclose()
+        self._transports.clear()
+        self._base_urls.clear()
+
+
+    async def __aenter__(self) -> "ConnectionPool":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -22,6 +22,41 @@ class NodeProvider(Enum):
         else:
             raise ValueError(f"Base URL for {self.name} not defined")
 
+class LoadBalancing(Enum):
+    LEAST_OUTSTANDING = 1 # node with the fewest requests in flight
+    LATENCY_WEIGHTED = 2 # node with the lowest average latency weighted by requests in flight
+
+DEFAULT_MAX_CONCURRENCY = 8 # Max number of concurrent requests when fetching a height range in windows
+STREAM_MAX_BUFFER_SIZE = 64 * 1024 * 1024 # Max number of bytes buffered per item when streaming blocks or block records
+DEFAULT_CONFIRMATION_DEPTH = 32 # Number of blocks below the peak from which on height-keyed data is cached
+DISK_CACHE_WRITE_BATCH_SIZE = 100 # Number of responses or access times buffered by the disk cache before they are written in bulk
+DISK_CACHE_FLUSH_INTERVAL = 5.0 # Max age in seconds of buffered disk cache writes when the cache is next accessed
+EXECUTOR_THRESHOLD = 1024 * 1024 # Min response size in bytes from which on responses are decoded in the client's executor
+DEFAULT_MAX_PEAK_LAG = 10 # Max number of blocks a node in a node pool may lag the highest peak in the pool to be considered healthy
+DEFAULT_HEALTH_CHECK_INTERVAL = 30 # Seconds between health checks of the nodes in a node pool
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504] # Status codes of responses considered transient errors
+ADAPTIVE_MAX_CONCURRENCY = 64 # Max concurrency limit of the adaptive concurrency limiter
+DEFAULT_MAX_CONNECTIONS = 100 # Max number of connections per TLS configuration in a connection pool
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20 # Max number of idle connections kept open per TLS configuration in a connection pool
+DEFAULT_KEEPALIVE_EXPIRY = 5.0 # Seconds after which idle connections in a connection pool are closed
+DEFAULT_DAEMON_PORT = 55400 # Port of the Chia daemon's websocket if not set in the config file
+DAEMON_MAX_MESSAGE_SIZE = 50 * 1000 * 1000 # Max size in bytes of a message received from the Chia daemon (daemon default)
+DAEMON_SERVICE_NAME = "chianode" # Service name clients register with the Chia daemon to receive replies
+DEFAULT_MEMPOOL_POLL_INTERVAL = 5 # Max seconds between syncs of a mempool mirror
+DEFAULT_CHAIN_POLL_INTERVAL = 5 # Max seconds between polls of a chain follower
+DEFAULT_CHAIN_WINDOW = 100 # Number of recent blocks a chain follower keeps in memory to trace reorgs
+PUZZLE_HASH_BATCH_SIZE = 500 # Max number of puzzle hashes per request when loading the coins of watched puzzle hashes
+COIN_ID_BATCH_SIZE = 500 # Max number of coin IDs per request when looking up the current coins of tracked singletons
+DEFAULT_SUBSCRIPTION_QUEUE_SIZE = 1000 # Max number of events buffered per event hub subscription
+CHECKPOINT_WRITE_BATCH_SIZE = 100 # Number of event stream checkpoints saved before they are written to disk
+CHECKPOINT_FLUSH_INTERVAL = 1.0 # Max age in seconds of unwritten event stream checkpoints when the next one is saved
+EVENT_STREAM_BUFFER_SIZE = 1000 # Max number of events read ahead of the consumer per event stream
+EVENT_STREAM_IDLE_TIMEOUT = 60 # Seconds without data after which an event stream is considered dead and reconnected
+EVENT_STREAM_BACKOFF_BASE = 0.5 # Upper bound in seconds of the delay before the first reconnect after an event stream failed
+EVENT_STREAM_BACKOFF_MAX = 60 # Max delay in seconds between reconnects of an event stream
+EVENT_BATCH_SIZE = 500 # Max number of events per batch yielded by events_batched
+EVENT_BATCH_LATENCY_MS = 100 # Max milliseconds an event waits for its batch to fill up in events_batched
+
 MOJONODE_EVENT_OBJECTS = ["coin", "block", "transaction"]
 MOJONODE_PAGE_SIZE = 50
 MOJONODE_MAX_HEIGHT_DIFF = 100
@@ -56,9 +91,41 @@ MOJONODE_NONSTANDARD_ENDPOINTS = [
     "/events",
     "/get_latest_singleton_spend"
 ]
+CONTENT_ADDRESSED_ENDPOINTS = [
+    "/get_block",
+    "/get_block_record",
+    "/get_block_spends",
+    "/get_puzzle_and_solution",
+    "/get_additions_and_removals"
+]
+NON_IDEMPOTENT_ENDPOINTS = [
+    "/push_tx"
+]
 UNSUPPORTED_STANDARD_ENDPOINTS = [
     "/get_connections",
     "/open_connection",
     "/close_connection",
     "/stop_node"
 ]
+
+class ChainEventType(Enum):
+    CONNECT = 1 # block connected to the main chain
+    DISCONNECT = 2 # block disconnected from the main chain by a reorg
+
+class OverflowPolicy(Enum):
+    DROP_OLDEST = 1 # drop the oldest buffered event
+    BLOCK = 2 # wait until the subscriber has received a buffered event
+    DISCONNECT = 3 # close the subscription
+
+class JsonCodec(Enum):
+    AUTO = 1 # fastest codec available (orjson, then msgspec, then stdlib json)
+    STDLIB = 2
+    ORJSON = 3
+    MSGSPEC = 4
+
+class Decode(Enum):
+    RAW = 1 # response body as bytes
+    DICT = 2 # decoded JSON (dicts and lists)
+    CHIA = 3 # chia types (CoinRecord, BlockRecord, FullBlock, etc.)
+    VIEW = 4 # lazily decoded views (CoinRecordView), coin record methods only
+    BATCH = 5 # columnar batches (CoinRecordBatch), coin record list methods only
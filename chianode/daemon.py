@@ -0,0 +1,168 @@
+import asyncio
+import aiohttp
+import httpx
+import logging
+import secrets
+import ssl
+from typing import Dict, Optional, Tuple
+
+from .codec import get_codec
+from .constants import JsonCodec, DAEMON_MAX_MESSAGE_SIZE, DAEMON_SERVICE_NAME
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class DaemonTransport(httpx.AsyncBaseTransport):
+    """Transport sending full node RPCs over a persistent websocket connection to the Chia daemon.
+
+    The daemon relays messages between the services registered with it, including the full node. Requests are sent as
+    daemon messages with a random request id and multiplexed over a single connection, so that after the first request
+    no TLS handshake or HTTP framing is needed per call. Replies are matched to requests by their request id.
+
+    The connection is opened on the first request and reopened on the next request after it was lost.
+    Requests in flight when the connection is lost fail with httpx.ReadError. If the full node isn't running,
+    the daemon drops requests, which then fail with httpx.ReadTimeout.
+
+    Use StandardClient(use_daemon=True) to send standard RPCs through the daemon of the full node running on localhost.
+    """
+
+    base_url = "https://daemon" # placeholder host, requests are sent to the daemon's websocket
+
+    def __init__(
+            self,
+            url: str,
+            cert: Optional[Tuple[str, str]] = None,
+            service_name: str = DAEMON_SERVICE_NAME,
+            destination: str = "chia_full_node",
+            max_message_size: int = DAEMON_MAX_MESSAGE_SIZE,
+            json_codec: JsonCodec = JsonCodec.AUTO
+    ):
+        """Initialize a DaemonTransport instance.
+
+        Arguments:
+        url -- URL of the daemon's websocket, e.g. wss://localhost:55400
+
+        Keyword arguments:
+        cert -- tuple of paths to a certificate and key file signed by the private CA of the Chia installation, e.g. those of the full node
+        service_name -- name the transport registers with the daemon to receive replies. Default is constants.DAEMON_SERVICE_NAME
+        destination -- service requests are sent to. Default is chia_full_node
+        max_message_size -- maximum size in bytes of a reply. Default is constants.DAEMON_MAX_MESSAGE_SIZE
+        json_codec -- JSON codec for decoding replies. Default is JsonCodec.AUTO
+        """
+
+        self.url = url
+        self.cert = cert
+        self.service_name = service_name
+        self.destination = destination
+        self.max_message_size = max_message_size
+        self.codec = get_codec(json_codec)
+        self._session = None
+        self._websocket = None
+        self._reader = None
+        self._pending: Dict[str, asyncio.Future] = {} # futures of requests awaiting a reply by request id
+        self._lock = None # created on first use to bind it to the running event loop
+
+
+    def _ssl_context(self) -> Optional[ssl.SSLContext]:
+        if not self.url.startswith("wss://"): return None
+        # Like the HTTPS clients, don't verify the daemon's self-signed certificate
+        context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        if self.cert is not None: context.load_cert_chain(certfile=self.cert[0], keyfile=self.cert[1])
+        return context
+
+
+    def _message(self, command: str, data: bytes, destination: str) -> Tuple[str, bytes]:
+        """Return the request id and encoded daemon message for a command. data must be a JSON-encoded object."""
+
+        request_id = secrets.token_hex(32)
+        header = self.codec.dumps({"command": command, "ack": False, "origin": self.service_name, "destination": destination, "request_id": request_id})
+        # Splice the already encoded request body into the message instead of decoding and reencoding it
+        return request_id, header[:-1] + b', "data": ' + (data or b"{}") + b"}"
+
+
+    async def _connect(self, timeout: Optional[float]):
+        """Open the websocket connection and register with the daemon, unless already connected."""
+
+        if self._lock is None: self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._websocket is not None and not self._websocket.closed: return
+
+            if self._session is None: self._session = aiohttp.ClientSession()
+            try:
+                connect = self._session.ws_connect(self.url, ssl=self._ssl_context(), max_msg_size=self.max_message_size)
+                self._websocket = await asyncio.wait_for(connect, timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                raise httpx.ConnectError(f"Failed to connect to daemon at {self.url} ({e!r})") from e
+            self._reader = asyncio.ensure_future(self._read(self._websocket))
+
+            request_id, message = self._message("register_service", self.codec.dumps({"service": self.service_name}), "daemon")
+            try:
+                response = await self._request(request_id, message, timeout)
+                if not response.get("success"): raise httpx.ConnectError(f"Failed to register service {self.service_name} with daemon ({response})")
+            except BaseException:
+                await self._websocket.close() # reconnect on the next request
+                raise
+            logging.debug(f"Connected to daemon at {self.url} as {self.service_name}")
+
+
+    async def _read(self, websocket: aiohttp.ClientWebSocketResponse):
+        """Resolve the futures of pending requests with the replies received until the connection is closed."""
+
+        try:
+            async for message in websocket:
+                if message.type != aiohttp.WSMsgType.TEXT: continue
+                try:
+                    reply = self.codec.loads(message.data)
+                except ValueError:
+                    logging.warning("Received invalid message from daemon")
+                    continue
+                future = self._pending.pop(reply.get("request_id"), None)
+                if future is not None and not future.done(): future.set_result(reply.get("data", {}))
+        finally:
+            logging.info(f"Connection to daemon at {self.url} closed")
+            error = httpx.ReadError(f"Connection to daemon at {self.url} closed")
+            for future in self._pending.values():
+                if not future.done(): future.set_exception(error)
+            self._pending.clear()
+
+
+    async def _request(self, request_id: str, message: bytes, timeout: Optional[float]) -> dict:
+        """Send a message and return the data of the reply."""
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._websocket.send_str(message.decode()) # the daemon only handles text messages
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise httpx.ReadTimeout(f"No reply from daemon for request {request_id}")
+        except ConnectionError as e:
+            raise httpx.WriteError(f"Failed to send request to daemon ({e!r})") from e
+        finally:
+            self._pending.pop(request_id, None)
+
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+
+        timeouts = request.extensions.get("timeout", {})
+        await self._connect(timeouts.get("connect"))
+
+        timeout = timeouts.get("read")
+        command = request.url.path.lstrip("/")
+        request_id, message = self._message(command, await request.aread(), self.destination)
+        data = await self._request(request_id, message, timeout)
+
+        return httpx.Response(200, headers={"Content-Type": "application/json"}, content=self.codec.dumps(data), request=request)
+
+
+    async def aclose(self):
+        if self._websocket is not None: await self._websocket.close()
+        if self._reader is not None: await self._reader
+        if self._session is not None: await self._session.close()
+        self._websocket = None
+        self._reader = None
+        self._session = None
@@ -0,0 +1,212 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from .constants import OverflowPolicy, DEFAULT_SUBSCRIPTION_QUEUE_SIZE, MOJONODE_EVENT_OBJECTS
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class Subscription():
+    """Subscription to the events of an EventHub.
+
+    Iterate over a subscription to receive its events. Events are buffered in a queue of at most maxsize events.
+    If the subscriber falls behind and the queue is full, the overflow policy applies:
+      * OverflowPolicy.DROP_OLDEST drops the oldest buffered event. The number of dropped events is counted in dropped
+      * OverflowPolicy.BLOCK makes the hub wait for the subscriber, which delays all subscribers and the upstream stream
+      * OverflowPolicy.DISCONNECT closes the subscription. Iteration raises asyncio.QueueFull once the buffered events have been received
+
+    If the hub's upstream stream fails, the subscription is closed and iteration raises the stream's exception, also
+    available as error, once the buffered events have been received.
+
+    Events are shared between subscribers and must not be modified.
+    """
+
+    def __init__(
+            self,
+            hub: "EventHub",
+            for_object: Optional[str] = None,
+            predicate: Optional[Callable[[Dict[str, Any]], bool]] = None,
+            maxsize: int = DEFAULT_SUBSCRIPTION_QUEUE_SIZE,
+            overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST
+    ):
+        if for_object is not None and for_object not in MOJONODE_EVENT_OBJECTS: raise ValueError(f"Unknown object specified ({for_object})")
+        if maxsize < 1: raise ValueError("Queue size must be a positive integer")
+
+        self.hub = hub
+        self.for_object = for_object
+        self.predicate = predicate
+        self.overflow = overflow
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0 # number of events dropped by OverflowPolicy.DROP_OLDEST
+        self.closed = False
+        self.overflowed = False
+        self.error: Optional[BaseException] = None # exception that ended the hub's upstream stream
+        self._discard = False
+        self._closing = None # future resolved when the subscription is closed, created on first wait
+
+
+    def _accepts(self, event: Dict[str, Any]) -> bool:
+        if self.for_object is not None and event.get("object") != self.for_object: return False
+        return self.predicate is None or self.predicate(event)
+
+
+    async def _put(self, event: Dict[str, Any]):
+        """Buffer an event, applying the overflow policy if the queue is full."""
+
+        if self.closed: return
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+        elif self.overflow == OverflowPolicy.DROP_OLDEST:
+            self.queue.get_nowait()
+            self.queue.put_nowait(event)
+            self.dropped += 1
+        elif self.overflow == OverflowPolicy.BLOCK:
+            await self.queue.put(event)
+        elif self.overflow == OverflowPolicy.DISCONNECT:
+            logging.warning(f"Closing event subscription after its queue of {self.queue.maxsize} events overflowed")
+            self.overflowed = True
+            self.close(discard=False)
+        else:
+            raise ValueError(f"Unknown overflow policy {self.overflow.name}")
+
+
+    def _fail(self, error: BaseException):
+        """Close the subscription because the upstream stream ended, keeping the buffered events."""
+
+        self.error = error
+        self.close(discard=False)
+
+
+    def close(self, discard: bool =True):
+        """Unsubscribe from the hub. Iteration stops once the buffered events have been received, or right away if discard is True."""
+
+        if self.closed: return
+        self.closed = True
+        self._discard = discard
+        self.hub._unsubscribe(self)
+        if discard:
+            while not self.queue.empty(): self.queue.get_nowait() # also unblocks the hub if waiting with OverflowPolicy.BLOCK
+        if self._closing is not None and not self._closing.done(): self._closing.set_result(None)
+
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        while not (self.closed and (self._discard or self.queue.empty())):
+            if not self.queue.empty():
+                yield self.queue.get_nowait()
+                continue
+
+            # Wait for the next event or for the subscription to be closed
+            if self._closing is None: self._closing = asyncio.get_running_loop().create_future()
+            getter = asyncio.ensure_future(self.queue.get())
+            try:
+                await asyncio.wait([getter, self._closing], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                if not getter.done(): getter.cancel()
+            if getter.done() and not getter.cancelled() and not (self.closed and self._discard): yield getter.result()
+
+        if self.overflowed: raise asyncio.QueueFull("Event subscription closed after its queue overflowed")
+        if self.error is not None: raise self.error
+
+
+class EventHub():
+    """Hub fanning out the events of a single Mojonode event stream to many subscribers.
+
+    The hub reads the upstream stream of a MojoClient, decoding each event once, and passes each event to the subscriptions
+    whose object and predicate match it. The upstream stream is opened on the first subscription and closed when
+    the last subscription is closed. When it is reopened, it resumes from the timestamp of the last event received.
+
+    Each subscription has its own bounded queue, so that with the DROP_OLDEST and DISCONNECT overflow policies
+    a slow subscriber neither delays the others nor makes memory grow without limit. See Subscription for details.
+    """
+
+    def __init__(self, client, for_object: Optional[str] =None, from_ts: str ="$", filters: str =""):
+        """Initialize an EventHub instance.
+
+        Arguments:
+        client -- MojoClient to stream events with
+
+        Keyword arguments:
+        for_object -- only stream events for specified object (coin, block, transaction). Streams all events if set to None
+        from_ts -- only stream events from the given timestamp onwards ("$" to start from now)
+        filters -- only stream events that pass the filter. See MojoClient.events for details
+        """
+
+        self.client = client
+        self.for_object = for_object
+        self.from_ts = from_ts
+        self.filters = filters
+        self.subscriptions: List[Subscription] = []
+        self._reader = None
+        self._stopping = [] # cancelled readers that may still be closing the upstream stream
+
+
+    def subscribe(
+            self,
+            for_object: Optional[str] =None,
+            predicate: Optional[Callable[[Dict[str, Any]], bool]] =None,
+            maxsize: int =DEFAULT_SUBSCRIPTION_QUEUE_SIZE,
+            overflow: OverflowPolicy =OverflowPolicy.DROP_OLDEST
+    ) -> Subscription:
+        """Subscribe to events.
+
+        Keyword arguments:
+        for_object -- only receive events for specified object (coin, block, transaction). Receives all events if set to None
+        predicate -- function taking an event and returning whether to receive it. Called on the hub's reader, so it must be fast
+        maxsize -- maximum number of buffered events. Default is constants.DEFAULT_SUBSCRIPTION_QUEUE_SIZE
+        overflow -- policy applied when the buffer is full. Default is OverflowPolicy.DROP_OLDEST
+        """
+
+        subscription = Subscription(self, for_object, predicate, maxsize, overflow)
+        self.subscriptions.append(subscription)
+        if self._reader is None: self._reader = asyncio.ensure_future(self._read())
+        return subscription
+
+
+    def _unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscriptions: self.subscriptions.remove(subscription)
+        if len(self.subscriptions) == 0 and self._reader is not None:
+            self._reader.cancel()
+            self._stopping = [r for r in self._stopping if not r.done()] + [self._reader]
+            self._reader = None
+
+
+    async def _publish(self, event: Dict[str, Any]):
+        for subscription in list(self.subscriptions):
+            if subscription._accepts(event): await subscription._put(event)
+
+
+    async def _read(self):
+        stream = self.client.events(for_object=self.for_object, from_ts=self.from_ts, filters=self.filters)
+        try:
+            await stream.__anext__() # stream ID
+            async for event in stream:
+                self.from_ts = event["ts"]
+                await self._publish(event)
+            error = ConnectionError("Upstream event stream ended")
+        except Exception as e:
+            error = e
+        finally:
+            await stream.aclose()
+
+        # Close all subscriptions, so that subscribers don't wait forever. The reader is done, so closing them must not cancel it
+        if self._reader is not asyncio.current_task(): return
+        self._reader = None
+        logging.error(f"Upstream event stream failed ({type(error).__name__}: {error}). Closing {len(self.subscriptions)} subscriptions")
+        for subscription in list(self.subscriptions): subscription._fail(error)
+
+
+    async def aclose(self):
+        """Close all subscriptions and the upstream stream."""
+
+        for subscription in list(self.subscriptions): subscription.close()
+        await asyncio.gather(*self._stopping, return_exceptions=True)
+        self._stopping.clear()
+
+
+    async def __aenter__(self) -> "EventHub":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -0,0 +1,121 @@
+import re
+from typing import List
+
+
+_STRUCTURAL = re.compile(rb'["\[\]{}]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+
+
+class JsonArrayStream():
+    """Incremental parser extracting the items of an array in a JSON object from a stream of bytes.
+
+    The array is identified by its key in the top-level object of the response body, e.g. 'blocks' for
+    {"blocks": [{...}, {...}], "success": true}. Items are returned as raw JSON bytes as soon as they are complete,
+    so that only the item currently being received is held in memory. Array items must be JSON objects or arrays.
+    """
+
+    def __init__(self, key: str, max_buffer_size: int):
+        """Initialize a JsonArrayStream instance.
+
+        Arguments:
+        key -- key of the array in the top-level object
+        max_buffer_size -- maximum number of bytes buffered for a single item. Exceeding it raises a ValueError
+        """
+
+        self.key = key.encode()
+        self.max_buffer_size = max_buffer_size
+        self.found = False # whether the array has been encountered
+        self.finished = False # whether the end of the array has been reached
+
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = None
+        self._last_key = None
+        self._in_array = False
+        self._item_start = None
+
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Feed a chunk of the response body and return the array items completed by it.
+
+        Arguments:
+        chunk -- next chunk of the response body
+        """
+
+        if self.finished: return []
+
+        buffer = self._buffer
+        buffer += chunk
+        items = []
+        pos = self._pos
+
+        while pos < len(buffer) and not self.finished:
+
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                pos = match.start()
+                if buffer[pos] == 0x5c: # backslash
+                    if pos + 1 >= len(buffer): break # escaped character not received yet
+                    pos += 2
+                    continue
+                self._in_string = False
+                if self._depth == 1 and not self._in_array:
+                    self._last_key = bytes(buffer[self._string_start + 1:pos])
+                pos += 1
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            pos = match.start()
+            char = buffer[pos]
+
+            if char == 0x22: # double quote
+                self._in_string = True
+                self._string_start = pos
+            elif char == 0x7b or char == 0x5b: # opening brace or bracket
+                if self._in_array and self._depth == 2:
+                    self._item_start = pos
+                elif self._depth == 1 and char == 0x5b and self._last_key == self.key:
+                    self._in_array = True
+                    self.found = True
+                self._depth += 1
+            else: # closing brace or bracket
+                self._depth -= 1
+                if self._in_array:
+                    if self._depth == 2:
+                        if pos + 1 - self._item_start > self.max_buffer_size: self._raise_buffer_exceeded()
+                        items.append(bytes(buffer[self._item_start:pos + 1]))
+                        self._item_start = None
+                    elif self._depth == 1:
+                        self._in_array = False
+                        self.finished = True
+            pos += 1
+
+        # Discard bytes that are no longer needed
+        if self._item_start is not None:
+            discard = self._item_start
+        elif self._in_string and self._depth == 1:
+            discard = self._string_start
+        else:
+            discard = pos
+        if discard > 0:
+            del buffer[:discard]
+            pos -= discard
+            if self._item_start is not None: self._item_start -= discard
+            if self._string_start is not None: self._string_start -= discard
+        self._pos = pos
+
+        if len(buffer) > self.max_buffer_size: self._raise_buffer_exceeded()
+
+        return items
+
+
+    def _raise_buffer_exceeded(self):
+        raise ValueError(f"Item in '{self.key.decode()}' array exceeds maximum buffer size of {self.max_buffer_size} bytes")
@@ -0,0 +1,240 @@
+import asyncio
+import httpx
+import logging
+import time
+from collections import deque
+from typing import Dict, Hashable, List, Optional
+
+from .constants import ADAPTIVE_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY, RETRY_STATUS_CODES
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+LATENCY_SMOOTHING = 0.1 # Weight of the latest request in the moving average of request durations
+
+
+class TokenBucket():
+    """Token bucket limiting the rate of requests.
+
+    Tokens are added at rate tokens per second up to burst tokens. Each request takes a token, waiting for one if none is left.
+    Waiting requests are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] =None):
+        """Initialize a TokenBucket instance.
+
+        Arguments:
+        rate -- number of tokens added per second
+
+        Keyword arguments:
+        burst -- maximum number of tokens. Default is max(1, rate)
+        """
+
+        if rate <= 0: raise ValueError("Rate must be positive")
+
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self.tokens = self.burst
+        self._updated = time.monotonic()
+        self._paused_until = 0
+        self._lock = None # created on first use to bind it to the running event loop
+
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for the given number of seconds, e.g. after a response with a Retry-After header."""
+
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+    async def acquire(self):
+        """Take a token, waiting for one if necessary."""
+
+        if self._lock is None: self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AIMDLimiter():
+    """Concurrency limiter adapting its limit by additive increase, multiplicative decrease (AIMD).
+
+    The limit grows by additive_increase per limit successful requests, i.e. roughly by additive_increase per round trip,
+    and is multiplied by multiplicative_decrease on overload. Overload signals from requests sent before the last decrease
+    are ignored, so that a burst of failures only decreases the limit once.
+    """
+
+    def __init__(
+            self,
+            initial_limit: float = DEFAULT_MAX_CONCURRENCY,
+            min_limit: float = 1,
+            max_limit: float = ADAPTIVE_MAX_CONCURRENCY,
+            additive_increase: float = 1,
+            multiplicative_decrease: float = 0.5
+    ):
+        """Initialize an AIMDLimiter instance.
+
+        Keyword arguments:
+        initial_limit -- initial concurrency limit. Default is constants.DEFAULT_MAX_CONCURRENCY
+        min_limit -- minimum concurrency limit. Default is 1
+        max_limit -- maximum concurrency limit. Default is constants.ADAPTIVE_MAX_CONCURRENCY
+        additive_increase -- increase of the limit per round trip without overload. Default is 1
+        multiplicative_decrease -- factor the limit is multiplied by on overload. Default is 0.5
+        """
+
+        if not 1 <= min_limit <= initial_limit <= max_limit: raise ValueError("Concurrency limits must satisfy 1 <= min_limit <= initial_limit <= max_limit")
+        if not 0 < multiplicative_decrease < 1: raise ValueError("Multiplicative decrease must be in (0, 1)")
+
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.additive_increase = additive_increase
+        self.multiplicative_decrease = multiplicative_decrease
+        self.in_flight = 0
+        self._last_decrease = 0
+        self._waiters = deque()
+
+
+    async def acquire(self):
+        """Wait until the number of requests in flight is below the limit and take a slot."""
+
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Pass on the wake-up if this waiter had been woken already
+                if waiter.done() and not waiter.cancelled(): self._wake()
+                raise
+            finally:
+                if waiter in self._waiters: self._waiters.remove(waiter)
+        self.in_flight += 1
+
+
+    def release(self, start: float, overloaded: Optional[bool]):
+        """Free a slot and adapt the limit.
+
+        Arguments:
+        start -- time (time.monotonic) the request was sent
+        overloaded -- boolean indicating whether the request signalled overload, or None to leave the limit unchanged (e.g. if cancelled)
+        """
+
+        self.in_flight -= 1
+
+        if overloaded:
+            if start >= self._last_decrease:
+                self._last_decrease = time.monotonic()
+                self.limit = max(self.min_limit, self.limit * self.multiplicative_decrease)
+                logging.info(f"Decreased concurrency limit to {self.limit:.1f}")
+        elif overloaded is not None:
+            self.limit = min(self.max_limit, self.limit + self.additive_increase / self.limit)
+
+        self._wake()
+
+
+    def _wake(self):
+        free = int(self.limit) - self.in_flight
+        while free > 0 and len(self._waiters) > 0:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+class RateLimiter():
+    """Client-side rate limiter and adaptive concurrency limiter.
+
+    Requests first take a token from a token bucket (if rate is set), and then a slot from an AIMD concurrency limiter
+    (if adaptive is True). Responses with a status code in overload_status_codes, timeouts, network errors and latency spikes
+    signal overload and decrease the concurrency limit. A latency spike is a request taking more than latency_tolerance times
+    the moving average duration of requests to the same URL. A Retry-After header on a 429 response pauses the token bucket.
+
+    A RateLimiter can be shared by several clients to limit their combined load on a node provider.
+    """
+
+    def __init__(
+            self,
+            rate: Optional[float] = None,
+            burst: Optional[int] = None,
+            adaptive: bool = True,
+            initial_concurrency: float = DEFAULT_MAX_CONCURRENCY,
+            min_concurrency: float = 1,
+            max_concurrency: float = ADAPTIVE_MAX_CONCURRENCY,
+            latency_tolerance: float = 3.0,
+            overload_status_codes: List[int] = RETRY_STATUS_CODES
+    ):
+        """Initialize a RateLimiter instance.
+
+        Keyword arguments:
+        rate -- maximum number of requests per second. Default is None (no rate limit)
+        burst -- maximum number of requests sent at once after an idle period. Default is max(1, rate)
+        adaptive -- boolean indicating whether to limit concurrency adaptively. Default is True
+        initial_concurrency -- initial concurrency limit. Default is constants.DEFAULT_MAX_CONCURRENCY
+        min_concurrency -- minimum concurrency limit. Default is 1
+        max_concurrency -- maximum concurrency limit. Default is constants.ADAPTIVE_MAX_CONCURRENCY
+        latency_tolerance -- factor by which a request may exceed the average duration before signalling overload. Default is 3
+        overload_status_codes -- status codes of responses signalling overload. Default is constants.RETRY_STATUS_CODES
+        """
+
+        self.token_bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.concurrency = AIMDLimiter(initial_concurrency, min_concurrency, max_concurrency) if adaptive else None
+        self.latency_tolerance = latency_tolerance
+        self.overload_status_codes = overload_status_codes
+        self._latencies: Dict[Hashable, float] = {}
+
+
+    async def acquire(self) -> float:
+        """Wait until a request may be sent and return the time (time.monotonic) it was allowed to be sent."""
+
+        if self.token_bucket is not None: await self.token_bucket.acquire()
+        if self.concurrency is not None: await self.concurrency.acquire()
+        return time.monotonic()
+
+
+    def release(self, key: Hashable, start: float, response: Optional[httpx.Response] =None, error: Optional[BaseException] =None):
+        """Record the outcome of a request sent after acquire.
+
+        Arguments:
+        key -- key identifying requests with similar durations, e.g. their URL
+        start -- time returned by acquire
+
+        Keyword arguments:
+        response -- response to the request, if any
+        error -- error raised by the request, if any
+        """
+
+        duration = time.monotonic() - start
+        overloaded = None
+
+        if response is not None:
+            if response.status_code in self.overload_status_codes:
+                overloaded = True
+                if response.status_code == 429 and self.token_bucket is not None:
+                    try:
+                        self.token_bucket.pause(float(response.headers.get("Retry-After", 0)))
+                    except ValueError:
+                        pass # Retry-After given as HTTP date
+            else:
+                # The average includes spikes so that it adapts if the node provider becomes slower permanently
+                average = self._latencies.get(key)
+                overloaded = average is not None and duration > self.latency_tolerance * average
+                self._latencies[key] = duration if average is None else average + LATENCY_SMOOTHING * (duration - average)
+        elif isinstance(error, (httpx.TimeoutException, httpx.NetworkError)):
+            overloaded = True
+
+        if self.concurrency is not None: self.concurrency.release(start, overloaded)
@@ -0,0 +1,133 @@
+import inspect
+import logging
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from chia.types.blockchain_format.sized_bytes import bytes32
+
+from .constants import DEFAULT_MEMPOOL_POLL_INTERVAL
+from .trigger import PollTrigger
+from .utils import gather_bounded, resolve_max_concurrency
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class MempoolDelta():
+    """Changes to the mempool between two syncs of a MempoolMirror.
+
+    added and removed map transaction IDs (spend bundle names) to mempool items as returned by get_mempool_item_by_tx_id.
+    """
+
+    __slots__ = ("added", "removed")
+
+    def __init__(self, added: Dict[bytes32, Dict[str, Any]], removed: Dict[bytes32, Dict[str, Any]]):
+        self.added = added
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return len(self.added) > 0 or len(self.removed) > 0
+
+    def __repr__(self) -> str:
+        return f"MempoolDelta(added={len(self.added)}, removed={len(self.removed)})"
+
+
+class MempoolMirror():
+    """Local copy of a node's mempool, kept in sync incrementally.
+
+    Each sync fetches the mempool's transaction IDs, drops the items no longer in the mempool, and fetches only the new
+    items concurrently, rather than transferring the entire mempool. The changes are passed to the registered callbacks
+    and yielded by deltas as MempoolDelta objects. The first sync adds the entire mempool.
+
+    Syncs happen every interval seconds. With use_events enabled, the client's Mojonode transaction event stream
+    triggers a sync as soon as the mempool changes, and interval only serves as a fallback for when the stream is down.
+
+    The mirror's items must not be modified.
+    """
+
+    def __init__(
+            self,
+            client,
+            interval: float = DEFAULT_MEMPOOL_POLL_INTERVAL,
+            max_concurrency: Optional[int] = None,
+            use_events: bool = False
+    ):
+        """Initialize a MempoolMirror instance.
+
+        Arguments:
+        client -- StandardClient or MojoClient to fetch mempool items with
+
+        Keyword arguments:
+        interval -- maximum number of seconds between syncs. Default is constants.DEFAULT_MEMPOOL_POLL_INTERVAL
+        max_concurrency -- maximum number of mempool items fetched concurrently. Defaults to the client's max_concurrency
+        use_events -- boolean indicating whether to sync on Mojonode transaction events. Requires a MojoClient. Default is False
+        """
+
+        if use_events and not hasattr(client, "events"): raise ValueError("Syncing on events requires a MojoClient")
+
+        self.client = client
+        self.max_concurrency = resolve_max_concurrency(client, max_concurrency)
+        self.items: Dict[bytes32, Dict[str, Any]] = {} # mempool items by transaction ID
+        self.trigger = PollTrigger(interval, client if use_events else None, "transaction")
+        self._callbacks: List[Callable[[MempoolDelta], Any]] = []
+
+
+    def add_callback(self, callback: Callable[[MempoolDelta], Any]):
+        """Register a function or coroutine function to be called with each non-empty MempoolDelta."""
+
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: Callable[[MempoolDelta], Any]):
+        self._callbacks.remove(callback)
+
+
+    async def _fetch_items(self, tx_ids: List[bytes32]) -> Dict[bytes32, Dict[str, Any]]:
+        """Fetch mempool items concurrently, skipping those no longer in the mempool."""
+
+        async def fetch(tx_id: bytes32) -> Optional[Dict[str, Any]]:
+            try:
+                return await self.client.get_mempool_item_by_tx_id(tx_id)
+            except KeyError:
+                return None # removed from the mempool since the transaction IDs were fetched
+
+        items = await gather_bounded([fetch(tx_id) for tx_id in tx_ids], self.max_concurrency)
+        return {tx_id: item for tx_id, item in zip(tx_ids, items) if item is not None}
+
+
+    async def sync(self) -> MempoolDelta:
+        """Bring the mirror up to date with the node's mempool, call the callbacks if it changed, and return the changes."""
+
+        tx_ids = set(await self.client.get_all_mempool_tx_ids())
+
+        added = await self._fetch_items([tx_id for tx_id in tx_ids if tx_id not in self.items])
+        removed = {tx_id: self.items.pop(tx_id) for tx_id in list(self.items.keys()) if tx_id not in tx_ids}
+        self.items.update(added)
+
+        delta = MempoolDelta(added, removed)
+        if delta:
+            logging.debug(f"Mempool mirror synced: {len(added)} items added, {len(removed)} removed, {len(self.items)} in mempool")
+            for callback in self._callbacks:
+                result = callback(delta)
+                if inspect.isawaitable(result): await result
+
+        return delta
+
+
+    def deltas(self) -> AsyncIterator[MempoolDelta]:
+        """Sync continuously and yield the changes of each sync that changed the mirror."""
+
+        async def sync() -> List[MempoolDelta]:
+            delta = await self.sync()
+            return [delta] if delta else []
+
+        return self.trigger.run(sync)
+
+
+    def __aiter__(self) -> AsyncIterator[MempoolDelta]:
+        return self.deltas()
+
+
+    async def run(self):
+        """Sync continuously, passing the changes to the callbacks only."""
+
+        async for _ in self.deltas():
+            pass
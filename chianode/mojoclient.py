@@ -1,16 +1,24 @@
+import asyncio
 import logging
 import httpx
 import uuid
-import json
+from concurrent.futures import Executor
 from typing import Any, Dict, List, Optional, Tuple, cast
 
 from chia.types.blockchain_format.sized_bytes import bytes32
 from chia.types.coin_record import CoinRecord
 from chia.types.coin_spend import CoinSpend
 
-from .constants import NEWLINE, GET, POST, NodeProvider, Network, MOJONODE_STANDARD_ENDPOINTS, MOJONODE_NONSTANDARD_ENDPOINTS
+from .constants import NEWLINE, GET, POST, DEFAULT_MAX_CONCURRENCY, EXECUTOR_THRESHOLD, EVENT_STREAM_BUFFER_SIZE, EVENT_STREAM_IDLE_TIMEOUT, EVENT_STREAM_BACKOFF_BASE, EVENT_STREAM_BACKOFF_MAX, EVENT_BATCH_SIZE, EVENT_BATCH_LATENCY_MS, Decode, JsonCodec, NodeProvider, Network, MOJONODE_EVENT_OBJECTS, MOJONODE_STANDARD_ENDPOINTS, MOJONODE_NONSTANDARD_ENDPOINTS
+from .cache import ResponseCache
+from .checkpoint import CheckpointStore
+from .connection import ConnectionPool
+from .limiter import RateLimiter
+from .pool import NodePool
+from .retry import HedgingPolicy, RetryPolicy
 from .standardclient import StandardClient
 from .utils import hexstr_to_bytes32, coin_record_dict_backwards_compat, convert_tx, convert_uncurried_coin_spend, convert_coin_transactions
+from .views import convert_event_view
 
 
 from pprint import pprint
@@ -42,6 +50,8 @@ class MojoClient(StandardClient):
          - by default, the page 1 is returned
          - the number of items per page is specified by constants.MOJONODE_PAGE_SIZE (currently 50)
       *  The page parameter is ignored when querying nodes that don't support pagination.
+      * get_block_records, get_blocks and the iter_* methods transparently split height ranges into windows of at most
+        constants.MOJONODE_MAX_HEIGHT_DIFF blocks, which are fetched concurrently and merged in height order
     """
 
     def __init__(
@@ -49,7 +59,20 @@ class MojoClient(StandardClient):
             network: Network = Network.MAINNET,
             timeout: Optional[int] = 10,
             standard_node_provider: NodeProvider = NodeProvider.MOJONODE,
-            standard_node_timeout: Optional[int] = 5 # 5 second timeout is the httpx default
+            standard_node_timeout: Optional[int] = 5, # 5 second timeout is the httpx default
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+            json_codec: JsonCodec = JsonCodec.AUTO,
+            coalesce_requests: bool = False,
+            response_cache: Optional[ResponseCache] = None,
+            decode: Decode = Decode.CHIA,
+            executor: Optional[Executor] = None,
+            executor_threshold: int = EXECUTOR_THRESHOLD,
+            node_pool: Optional[NodePool] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            hedging_policy: Optional[HedgingPolicy] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            connection_pool: Optional[ConnectionPool] = None,
+            use_daemon: bool = False
     ): 
         """Initialize a MojoClient instance.
 
@@ -58,21 +81,43 @@ class MojoClient(StandardClient):
         timeout -- timeout in seconds for requests to Mojonode. Set to None for no timeout. Default is 10 seconds
         standard_node_provider -- node provider for standard remote procecure calls (RPCs). Default is NodeProvider.MOJONODE
         standard_node_timeout -- timeout in seconds for standard RPCs. Default is 5 seconds. Set to None for no timeout. Gets overwritten by the timeout argument if Mojonode is the standard node provider.
+        max_concurrency -- maximum number of concurrent requests when fetching a height range split into windows. Default is constants.DEFAULT_MAX_CONCURRENCY
+        json_codec -- JSON codec for encoding requests and decoding responses. Default is JsonCodec.AUTO, which uses orjson or msgspec if installed, and the json standard library module otherwise
+        coalesce_requests -- boolean indicating whether concurrent identical requests share a single network round trip. Default is False
+        response_cache -- cache for standard RPC responses containing immutable data. Default is None (no caching)
+        decode -- default decoding level for methods with a decode argument. Default is Decode.CHIA
+        executor -- executor (e.g. concurrent.futures.ProcessPoolExecutor) for decoding large responses. Default is None (decode on the event loop)
+        executor_threshold -- minimum response size in bytes for decoding in the executor. Default is constants.EXECUTOR_THRESHOLD
+        node_pool -- pool of official Chia full nodes for standard RPCs. Requires standard_node_provider to be NodeProvider.FULLNODE. Default is None
+        retry_policy -- policy for retrying idempotent requests that failed with a transient error. Default is None (no retries)
+        hedging_policy -- policy for hedging slow idempotent requests. Default is None (no hedging)
+        rate_limiter -- rate limiter and adaptive concurrency limiter applied to all requests except event streams. Can be shared between clients. Default is None (no limits)
+        connection_pool -- connection pool shared with other clients. Default is None (the client opens its own connections)
+        use_daemon -- boolean indicating whether to send standard RPCs over a websocket connection to the Chia daemon. Requires standard_node_provider to be NodeProvider.FULLNODE. Default is False
         """
 
         if timeout is not None and timeout < 0: ValueError("Timeout must be None or a non-negative integer")
         if standard_node_provider == NodeProvider.MOJONODE: standard_node_timeout = timeout # Override standard node timeout if Mojonode used as standard node provider
-        StandardClient.__init__(self, node_provider=standard_node_provider, network=Network.MAINNET, timeout=standard_node_timeout)
+        StandardClient.__init__(self, node_provider=standard_node_provider, network=Network.MAINNET, timeout=standard_node_timeout, max_concurrency=max_concurrency, json_codec=json_codec, coalesce_requests=coalesce_requests, response_cache=response_cache, decode=decode, executor=executor, executor_threshold=executor_threshold, node_pool=node_pool, retry_policy=retry_policy, hedging_policy=hedging_policy, rate_limiter=rate_limiter, connection_pool=connection_pool, use_daemon=use_daemon)
         
         self.mojo_headers = {"accept": "application/json", "Content-Type": "application/json"}
         self.mojo_timeout = timeout
 
         self._streams = {}
+        self._connected = set() # IDs of streams with an open connection to Mojonode
         
         if standard_node_provider == NodeProvider.MOJONODE:
             self.mojoclient = self.client
         else:
-            self.mojoclient = httpx.AsyncClient(base_url=NodeProvider.MOJONODE.base_url(), http2=True, timeout=self.mojo_timeout)
+            transport = connection_pool.transport(NodeProvider.MOJONODE.base_url()) if connection_pool is not None else None
+            self.mojoclient = httpx.AsyncClient(base_url=NodeProvider.MOJONODE.base_url(), http2=True, timeout=self.mojo_timeout, transport=transport)
+
+
+    async def aclose(self):
+        """Close the client's connections. Connections of a shared connection pool are left open."""
+
+        await StandardClient.aclose(self)
+        if self.mojoclient is not self.client: await self.mojoclient.aclose()
 
             
     async def _mojo_request(self, method: str, endpoint: str, params: dict, no_network: bool =False, timeout: Optional[int] =-1):
@@ -91,15 +136,29 @@ class MojoClient(StandardClient):
         if timeout is not None and timeout < 0: timeout = self.mojo_timeout
 
         url = NodeProvider.MOJONODE.base_url() + "/" + endpoint
-        data = json.dumps(self._add_network_param(params, no_network))
+        data = self.codec.dumps(self._add_network_param(params, no_network))
 
         if method == POST:
-            logging.info(f"Sending POST request{NEWLINE}  URL: {url}{NEWLINE}  data: {data}")
-            response = await self.mojoclient.post(url, content=data, headers=self.mojo_headers)
+            # All Mojonode endpoints are read-only
+            send = lambda: self._send(url, lambda: self._mojo_post(url, data, timeout))
+            if self.coalesce_requests:
+                return await self._coalesce((url, data), send)
+            return await send()
         else:
             raise ValueError(f"Unsupported REST method {method}")
 
-        return response
+
+    async def _mojo_post(self, url: str, data: bytes, timeout: Optional[int]) -> httpx.Response:
+        """Send a POST request to Mojonode.
+
+        Arguments:
+        url -- URL to send request to
+        data -- encoded request body
+        timeout -- request timeout in seconds
+        """
+
+        logging.info(f"Sending POST request{NEWLINE}  URL: {url}{NEWLINE}  data: {data.decode()}")
+        return await self.mojoclient.post(url, content=data, headers=self.mojo_headers)
 
     
     async def _mojo_request_no_network(self, method: str, endpoint: str, params: dict, timeout: Optional[int] =-1):
@@ -134,9 +193,9 @@ class MojoClient(StandardClient):
 
         params = {"name": tx_id.hex()}
 
-        transaction = (await self._mojo_request(POST, "get_tx_by_name", params)).json()["transaction"]
+        response = await self._mojo_request(POST, "get_tx_by_name", params)
 
-        return convert_tx(transaction)
+        return await self._decode_convert(response, "transaction", convert_tx)
 
     
     async def get_uncurried_coin_spend(self, coin_id: bytes32, timeout: Optional[int] =-1) -> Dict[str, Any]:
@@ -155,7 +214,7 @@ class MojoClient(StandardClient):
 
         params = {"name": coin_id.hex()}
 
-        uncurried_coin_spend = (await self._mojo_request(POST, "get_uncurried_coin_spend", params)).json()["uncurried_coin_spend"]
+        uncurried_coin_spend = self._decode(await self._mojo_request(POST, "get_uncurried_coin_spend", params))["uncurried_coin_spend"]
 
         return convert_uncurried_coin_spend(uncurried_coin_spend)
 
@@ -177,7 +236,7 @@ class MojoClient(StandardClient):
 
         params = {"name": coin_id.hex()}
 
-        coin_transactions = (await self._mojo_request(POST, "get_transactions_for_coin", params)).json()["coin_transactions"]
+        coin_transactions = self._decode(await self._mojo_request(POST, "get_transactions_for_coin", params))["coin_transactions"]
         
         return convert_coin_transactions(coin_transactions)
 
@@ -191,7 +250,7 @@ class MojoClient(StandardClient):
 
         if timeout is not None and timeout < 0: timeout = self.mojo_timeout
 
-        query_schema = (await self._mojo_request_no_network(POST, "get_query_schema", {})).json()
+        query_schema = self._decode(await self._mojo_request_no_network(POST, "get_query_schema", {}))
         
         return cast(List[Dict[str, Any]], query_schema)
 
@@ -213,7 +272,7 @@ class MojoClient(StandardClient):
 
         params = {"query": query}
 
-        response = (await self._mojo_request_no_network(POST, "query", params)).json()
+        response = self._decode(await self._mojo_request_no_network(POST, "query", params))
         
         return response
 
@@ -232,7 +291,7 @@ class MojoClient(StandardClient):
 
         params = {"address": address}
 
-        response = (await self._mojo_request(POST, "get_latest_singleton_spend", params)).json()
+        response = self._decode(await self._mojo_request(POST, "get_latest_singleton_spend", params))
         
         return (
             CoinSpend.from_json_dict(response["latest_spend"]),
@@ -250,7 +309,7 @@ class MojoClient(StandardClient):
         if timeout is not None and timeout < 0: timeout = self.mojo_timeout
 
         if self.node_provider == NodeProvider.FULLNODE:
-            routes = (await self._request(POST, "get_routes", {})).json()["routes"]
+            routes = self._decode(await self._request(POST, "get_routes", {}))["routes"]
             endpoints = routes + MOJONODE_NONSTANDARD_ENDPOINTS
         elif self.node_provider == NodeProvider.MOJONODE:
             endpoints = MOJONODE_STANDARD_ENDPOINTS + MOJONODE_NONSTANDARD_ENDPOINTS
@@ -261,62 +320,291 @@ class MojoClient(StandardClient):
     async def close_stream(self, stream_id: str):
         """Closes an event stream.
 
+        The stream's connection is released right away, and the stream stops yielding events.
+
         Arguments:
         stream_id -- ID of the event stream to close
         """
 
         if stream_id in self._streams.keys():
-            self._streams.pop(stream_id)
+            reader = self._streams.pop(stream_id)
         else:
             raise ValueError(f"No stream with ID {stream_id} to close")
 
-        
-    async def events(self, for_object: str =None, from_ts: str ="$", filters=""):
+        if reader is not None:
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            logging.debug(f"Closed stream ID {stream_id}")
+
+
+    def stream_connected(self, stream_id: str) -> bool:
+        """Return True if an event stream is currently connected to Mojonode, False while it is (re)connecting or closed.
+
+        Arguments:
+        stream_id -- ID of the event stream
+        """
+
+        return stream_id in self._connected
+
+
+    async def _read_stream(
+            self,
+            stream_id: str,
+            queue: asyncio.Queue,
+            for_object: Optional[str],
+            from_ts: str,
+            last_ts: Optional[str],
+            filters: str,
+            idle_timeout: Optional[float],
+            reconnect_policy: RetryPolicy
+    ):
+        """Read the data lines of an event stream into a queue until the stream is closed.
+
+        Reconnects when the connection fails or no data has been received for idle_timeout seconds, resuming from the last event read.
+        Connections that received data and then went idle or were disconnected by Mojonode are reopened right away.
+        Other reconnects are delayed by the reconnect policy's backoff, which is reset once a connection receives data.
+        """
+
+        loop = asyncio.get_running_loop()
+        reader = asyncio.current_task()
+        last_payload = None # data of last event read
+        failures = 0 # number of consecutive connections that failed since a connection last received data
+
+        try:
+            while stream_id in self._streams.keys():
+                if last_payload is not None: last_ts = self.codec.loads(last_payload)["ts"]
+                params =  f"&from_ts={last_ts if last_ts is not None else from_ts}" + f"&filters={filters}"
+                if for_object is not None: params = f"for_object={for_object}&" + params
+                boundary_ts = last_ts # the last event read may be streamed again after reconnecting
+                received = False # whether the connection received any line
+                reconnect_now = False # whether the connection went idle or was closed by Mojonode after receiving data
+
+                # Watchdog cancelling the reader if the connection is idle. Time blocked on a full queue doesn't count
+                last_activity = loop.time()
+                idle = False
+                watchdog = None
+                def check_idle():
+                    nonlocal idle, watchdog
+                    remaining = last_activity + idle_timeout - loop.time()
+                    if remaining > 0 or queue.full():
+                        watchdog = loop.call_later(remaining if remaining > 0 else idle_timeout, check_idle)
+                    else:
+                        idle = True
+                        reader.cancel()
+                if idle_timeout is not None: watchdog = loop.call_later(idle_timeout, check_idle)
+
+                try:
+
+                    # Context manager for Mojonode event stream
+                    async with self.mojoclient.stream(GET, NodeProvider.MOJONODE.base_url() + "/events?" + params, timeout=None) as response:
+                        response.raise_for_status()
+                        self._connected.add(stream_id)
+                        logging.debug(f"Connected to stream. Assigned stream ID {stream_id}")
+
+                        async for data in response.aiter_lines():
+                            last_activity = loop.time()
+                            if not received:
+                                received = True
+                                if failures > 0: logging.info(f"Stream ID {stream_id} recovered after {failures} failed connections")
+                                failures = 0
+                            if not data.startswith('data: '): continue # heartbeats and other SSE fields
+
+                            payload = data[6:]
+                            if boundary_ts is not None:
+                                if self.codec.loads(payload)["ts"] == boundary_ts: continue
+                                boundary_ts = None
+                            last_payload = payload
+                            await queue.put(payload)
+                            last_activity = loop.time()
+
+                    logging.debug(f"Stream ID {stream_id} disconnected by Mojonode")
+                    reconnect_now = received
+
+                except asyncio.CancelledError:
+                    if not idle: raise
+                    if hasattr(reader, "uncancel"): reader.uncancel()
+                    logging.info(f"No data received on stream ID {stream_id} for {idle_timeout} seconds. Reconnecting")
+                    reconnect_now = received
+                except Exception as e:
+                    log = logging.warning if failures == 0 else logging.debug
+                    log(f"Failed to read data from stream ID {stream_id} ({type(e).__name__}: {e}). Reconnecting")
+                finally:
+                    if watchdog is not None: watchdog.cancel()
+                    self._connected.discard(stream_id)
+
+                if reconnect_now: continue
+                await asyncio.sleep(reconnect_policy.backoff(failures))
+                failures += 1
+        finally:
+            self._streams.pop(stream_id, None)
+            if not queue.full(): queue.put_nowait(None) # wake the consumer. If the queue is full, it notices the stream is closed on the next event
+
+
+    async def events(
+            self,
+            for_object: str =None,
+            from_ts: str ="$",
+            filters="",
+            checkpoint_store: Optional[CheckpointStore] =None,
+            checkpoint_key: str =None,
+            idle_timeout: Optional[float] =EVENT_STREAM_IDLE_TIMEOUT,
+            reconnect_policy: Optional[RetryPolicy] =None,
+            decode: Decode =Decode.DICT
+    ):
         """Stream events.
 
-        Mojonode disconnects event streams every 5 mins. This function client automatically reconnects.
+        Mojonode disconnects event streams every 5 mins. This function client automatically reconnects, resuming from the last event received.
+        Events with the timestamp of the last event received before reconnecting are dropped, so no event is yielded twice.
+        Connections that receive no data for idle_timeout seconds are reconnected. Reconnects after failed connections are delayed
+        by the reconnect policy's jittered exponential backoff, while connections that received data before going idle or
+        being disconnected are reopened right away.
+        Events are read by a separate task, at most constants.EVENT_STREAM_BUFFER_SIZE events ahead of the consumer.
+
+        If a checkpoint store is provided, the stream resumes from the stream's checkpoint if there is one, instead of from_ts.
+        An event is acknowledged, and its timestamp saved as the stream's checkpoint, once the next event is requested.
+        Events that were received but not acknowledged are streamed again when the stream is resumed.
         
         Keyword arguments:
         for_object -- only stream events for specified object (coin, block, transaction). Streams all events if set to None
         from_ts -- only stream events from the given timestamp (Unix epoch in seconds) onwards ("$" to start from now). Timestamps are unique
         filters -- only stream events that pass the filter. See Mojonode documentation for details: https://api.mojonode.com/docs#/mojonode/mojonode_chiadata_views_subscribe
+        checkpoint_store -- store to resume the stream from and save acknowledged events to. Default is None (no checkpoints)
+        checkpoint_key -- key of the stream in the checkpoint store. Defaults to a key derived from for_object and filters
+        idle_timeout -- seconds without data after which the connection is considered dead. Set to None to disable. Default is constants.EVENT_STREAM_IDLE_TIMEOUT
+        reconnect_policy -- policy whose backoff delays reconnects after failed connections. Default is exponential backoff from constants.EVENT_STREAM_BACKOFF_BASE up to constants.EVENT_STREAM_BACKOFF_MAX seconds
+        decode -- decoding level of the events. Decode.DICT yields dicts, Decode.VIEW yields views.EventView objects (CoinEventView, BlockEventView or TransactionEventView) that build chia types on first access. Default is Decode.DICT
         """
 
-        if for_object is not None:
-            if not for_object in MOJONODE_EVENT_OBJECTS: raise ValueError(f"Unkown object specified ({object})")
+        checkpoint_key, last_ts, reconnect_policy = self._prepare_stream(for_object, filters, checkpoint_store, checkpoint_key, idle_timeout, reconnect_policy, decode)
+
+        stream_id = str(uuid.uuid4())
+        self._streams[stream_id] = None # reader task, started when the first event is requested
+        queue = asyncio.Queue(EVENT_STREAM_BUFFER_SIZE)
+        try:
+            yield stream_id
+            if not self._start_reader(stream_id, queue, for_object, from_ts, last_ts, filters, idle_timeout, reconnect_policy): return
+
+            while True:
+                payload = await queue.get()
+                if payload is None or stream_id not in self._streams.keys(): break
+                event = self.codec.loads(payload)
+                ts = event["ts"]
+                yield event if decode == Decode.DICT else convert_event_view(event)
+                if checkpoint_store is not None: checkpoint_store.save(checkpoint_key, ts)
+        finally:
+            await self._stop_stream(stream_id, checkpoint_store)
+
+
+    async def events_batched(
+            self,
+            max_items: int =EVENT_BATCH_SIZE,
+            max_latency_ms: float =EVENT_BATCH_LATENCY_MS,
+            for_object: str =None,
+            from_ts: str ="$",
+            filters="",
+            checkpoint_store: Optional[CheckpointStore] =None,
+            checkpoint_key: str =None,
+            idle_timeout: Optional[float] =EVENT_STREAM_IDLE_TIMEOUT,
+            reconnect_policy: Optional[RetryPolicy] =None,
+            decode: Decode =Decode.DICT
+    ):
+        """Stream events in batches.
+
+        Works like events, but yields lists of events. A batch is yielded once it holds max_items events, or max_latency_ms
+        milliseconds after its first event was received, whichever comes first. The events of a batch are decoded with a
+        single call to the JSON codec. With a checkpoint store, a batch is acknowledged once the next batch is requested.
+
+        Keyword arguments:
+        max_items -- maximum number of events per batch. Default is constants.EVENT_BATCH_SIZE
+        max_latency_ms -- maximum time in milliseconds an event waits for its batch to fill up. Default is constants.EVENT_BATCH_LATENCY_MS
+        for_object, from_ts, filters, checkpoint_store, checkpoint_key, idle_timeout, reconnect_policy, decode -- see events
+        """
 
-        params =  f"&from_ts={from_ts}" + f"&filters={filters}"
-        if for_object is not None: endpoint = f"for_object={for_object}&" + params
+        if max_items < 1: raise ValueError("Maximum batch size must be a positive integer")
+        if max_latency_ms < 0: raise ValueError("Maximum latency must be non-negative")
+        checkpoint_key, last_ts, reconnect_policy = self._prepare_stream(for_object, filters, checkpoint_store, checkpoint_key, idle_timeout, reconnect_policy, decode)
 
         stream_id = str(uuid.uuid4())
-        self._streams[stream_id] = True
-        yield stream_id
-
-        while stream_id in self._streams.keys():
-            try:
-
-                # Context manager for Mojonode event stream
-                async with self.mojoclient.stream(GET, NodeProvider.MOJONODE.base_url() + "/events?" + params, timeout=None) as response:
-
-                    logging.debug(f"Connected to stream. Assigned stream ID {stream_id}")
-
-                    try:
-                            async for data in response.aiter_lines():
-
-                                if stream_id in self._streams.keys():
-                                
-                                    if data.startswith('data: '):
-                                        event = json.loads(data[6:])
-                                        yield event
-                                        from_ts = event["ts"]
-                                else:
-                                    # If stream no longer active, close it
-                                    await response.aclose()
-                                    logging.debug(f"Closed stream ID {stream_id}")
-                                    break
-                    except Exception as e:
-                        logging.warning(f"Failed to read data from stream ID {stream_id}")
-                        
-            except Exception as e:
-                logging.warning(f"Failed to connect to stream ID {stream_id}")
+        self._streams[stream_id] = None # reader task, started when the first batch is requested
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(max(EVENT_STREAM_BUFFER_SIZE, max_items))
+        try:
+            yield stream_id
+            if not self._start_reader(stream_id, queue, for_object, from_ts, last_ts, filters, idle_timeout, reconnect_policy): return
+
+            closed = False
+            while not closed:
+                payload = await queue.get()
+                if payload is None or stream_id not in self._streams.keys(): break
+                payloads = [payload]
+                deadline = loop.time() + max_latency_ms / 1000
+
+                while len(payloads) < max_items:
+                    if queue.empty():
+                        # Wait for more events until the batch is due
+                        remaining = deadline - loop.time()
+                        if remaining <= 0: break
+                        getter = asyncio.ensure_future(queue.get())
+                        try:
+                            await asyncio.wait([getter], timeout=remaining)
+                        finally:
+                            if not getter.done(): getter.cancel()
+                        if getter.cancelled() or not getter.done(): break
+                        payload = getter.result()
+                    else:
+                        payload = queue.get_nowait()
+                    if payload is None:
+                        closed = True
+                        break
+                    payloads.append(payload)
+
+                if stream_id not in self._streams.keys(): break
+                events = self.codec.loads("[" + ",".join(payloads) + "]")
+                ts = events[-1]["ts"]
+                yield events if decode == Decode.DICT else [convert_event_view(e) for e in events]
+                if checkpoint_store is not None: checkpoint_store.save(checkpoint_key, ts)
+        finally:
+            await self._stop_stream(stream_id, checkpoint_store)
+
+
+    def _prepare_stream(
+            self,
+            for_object: Optional[str],
+            filters: str,
+            checkpoint_store: Optional[CheckpointStore],
+            checkpoint_key: Optional[str],
+            idle_timeout: Optional[float],
+            reconnect_policy: Optional[RetryPolicy],
+            decode: Decode
+    ) -> Tuple[Optional[str], Optional[str], RetryPolicy]:
+        """Validate event stream arguments and return the checkpoint key, the checkpoint to resume from, and the reconnect policy."""
+
+        if for_object is not None:
+            if not for_object in MOJONODE_EVENT_OBJECTS: raise ValueError(f"Unkown object specified ({for_object})")
+        if idle_timeout is not None and idle_timeout <= 0: raise ValueError("Idle timeout must be None or positive")
+        if decode not in (Decode.DICT, Decode.VIEW): raise ValueError(f"Events only support Decode.DICT and Decode.VIEW, not {decode.name}")
+        if reconnect_policy is None: reconnect_policy = RetryPolicy(backoff_base=EVENT_STREAM_BACKOFF_BASE, backoff_max=EVENT_STREAM_BACKOFF_MAX)
+
+        last_ts = None # timestamp of last event acknowledged
+        if checkpoint_store is not None:
+            if checkpoint_key is None: checkpoint_key = f"{for_object or 'all'}:{filters}"
+            last_ts = checkpoint_store.load(checkpoint_key)
+            if last_ts is not None: logging.debug(f"Resuming stream {checkpoint_key} from checkpoint {last_ts}")
+
+        return checkpoint_key, last_ts, reconnect_policy
+
+
+    def _start_reader(self, stream_id: str, queue: asyncio.Queue, *args) -> bool:
+        """Start the reader task of an event stream, unless the stream has been closed already. Returns whether the reader was started."""
+
+        if stream_id not in self._streams.keys(): return False
+        self._streams[stream_id] = asyncio.ensure_future(self._read_stream(stream_id, queue, *args))
+        return True
+
+
+    async def _stop_stream(self, stream_id: str, checkpoint_store: Optional[CheckpointStore]):
+        """Close an event stream if it is still open, and flush its checkpoints."""
 
+        if self._streams.get(stream_id) is not None: await self.close_stream(stream_id)
+        self._streams.pop(stream_id, None)
+        if checkpoint_store is not None: checkpoint_store.flush()
@@ -0,0 +1,62 @@
+import importlib
+import multiprocessing
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, Optional
+
+import blspy
+import chia_rs
+
+from .codec import get_codec
+from .constants import JsonCodec
+
+
+def _restore(module: str, name: str, data: bytes) -> Any:
+    return getattr(importlib.import_module(module), name).from_bytes(data)
+
+
+_registered = False
+
+
+def _register_reducers(module):
+    for name in dir(module):
+        cls = getattr(module, name)
+        if isinstance(cls, type) and hasattr(cls, "from_bytes"):
+            ForkingPickler.register(cls, lambda obj, name=name: (_restore, (module.__name__, name, bytes(obj))))
+
+
+def register_reducers():
+    """Make the native types of chia_rs and blspy picklable for process pools by serializing them to bytes.
+
+    Types implemented in Rust (chia_rs) or C++ (blspy) don't support pickling. Reducers are registered with the pickler
+    used by multiprocessing, which affects all multiprocessing queues and pools of the process. decode_response therefore
+    only registers them in worker processes, where its results are pickled, and not in the process using the client.
+    """
+
+    global _registered
+    if _registered: return
+    _register_reducers(chia_rs)
+    _register_reducers(blspy)
+    _registered = True
+
+
+def decode_response(content: bytes, json_codec: JsonCodec, key: Optional[str] =None, convert: Optional[Callable[[Any], Any]] =None) -> Any:
+    """Decode a response body and convert the data in it.
+
+    This is a module-level function so that it can be run in a process pool, in which case convert must be
+    a module-level function too. Registers the reducers needed to return native chia types from a worker process.
+
+    Arguments:
+    content -- response body
+    json_codec -- codec to decode the response body with
+
+    Keyword arguments:
+    key -- key of the data in the response body, or None for the entire body
+    convert -- function converting the decoded data, or None to return it unchanged
+    """
+
+    if multiprocessing.parent_process() is not None: register_reducers() # results are pickled in worker processes only
+
+    data = get_codec(json_codec).loads(content)
+    if key is not None: data = data[key]
+    if convert is None: return data
+    return convert(data)
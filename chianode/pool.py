@@ -0,0 +1,263 @@
+import asyncio
+import httpx
+import json
+import logging
+import time
+from typing import List, Optional, Set, Tuple
+
+from .constants import LoadBalancing, DEFAULT_HEALTH_CHECK_INTERVAL, DEFAULT_MAX_PEAK_LAG, NON_IDEMPOTENT_ENDPOINTS
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+LATENCY_SMOOTHING = 0.2 # Weight of the latest request in the exponentially weighted moving average of node latencies
+
+
+class Node():
+    """Official Chia full node in a NodePool."""
+
+    def __init__(self, base_url: str, cert: Optional[Tuple[str, str]] =None, transport: Optional[httpx.AsyncBaseTransport] =None):
+        """Initialize a Node instance.
+
+        Arguments:
+        base_url -- base URL of the node's RPC interface, e.g. https://10.0.0.5:8555
+
+        Keyword arguments:
+        cert -- tuple of paths to the private full node certificate and key files
+        transport -- transport for requests to the node, e.g. from a shared connection.ConnectionPool. Default is an HTTP/2 transport using cert
+        """
+
+        self.base_url = base_url
+        self.url = httpx.URL(base_url)
+        self.transport = transport if transport is not None else httpx.AsyncHTTPTransport(http2=True, cert=cert, verify=False)
+        self.healthy = True
+        self.peak_height = None # peak height at the last health check
+        self.outstanding = 0 # number of requests in flight
+        self.latency = None # moving average of request durations in seconds
+        self.requests = 0
+        self.failures = 0
+
+    def __repr__(self) -> str:
+        return f"Node({self.base_url}, healthy={self.healthy}, outstanding={self.outstanding}, latency={self.latency})"
+
+
+    def _record_latency(self, duration: float):
+        if self.latency is None: self.latency = duration
+        else: self.latency += LATENCY_SMOOTHING * (duration - self.latency)
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Response stream that notifies the node pool once the response has been read or closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+
+class NodePool(httpx.AsyncBaseTransport):
+    """Pool of official Chia full nodes that standard RPCs are spread across.
+
+    A NodePool is an httpx transport. Each request is sent to a healthy node selected by the load balancing strategy.
+    Idempotent requests that fail with a transport error or a 5xx response are retried on another node, and the failing
+    node is marked unhealthy. Nodes are health checked every health_check_interval seconds in the background:
+    a node is healthy if healthz succeeds and its peak height lags the highest peak in the pool by at most max_peak_lag blocks.
+    If no node is healthy, requests are sent to unhealthy nodes rather than failing outright.
+
+    Pass a NodePool to StandardClient or MojoClient via the node_pool argument.
+    """
+
+    base_url = "https://nodepool" # placeholder host, replaced by the selected node's base URL
+
+    def __init__(
+            self,
+            nodes: List[Node],
+            load_balancing: LoadBalancing = LoadBalancing.LEAST_OUTSTANDING,
+            max_peak_lag: int = DEFAULT_MAX_PEAK_LAG,
+            health_check_interval: Optional[float] = DEFAULT_HEALTH_CHECK_INTERVAL,
+            health_check_timeout: Optional[float] = 5
+    ):
+        """Initialize a NodePool instance.
+
+        Arguments:
+        nodes -- nodes in the pool
+
+        Keyword arguments:
+        load_balancing -- strategy for selecting a node. Default is LoadBalancing.LEAST_OUTSTANDING
+        max_peak_lag -- maximum number of blocks a node's peak may lag the highest peak in the pool. Default is constants.DEFAULT_MAX_PEAK_LAG
+        health_check_interval -- seconds between health checks. Default is constants.DEFAULT_HEALTH_CHECK_INTERVAL. Set to None to only check health when check_health is called
+        health_check_timeout -- timeout in seconds for health check requests. Default is 5 seconds
+        """
+
+        if len(nodes) == 0: raise ValueError("Node pool must contain at least one node")
+
+        self.nodes = nodes
+        self.load_balancing = load_balancing
+        self.max_peak_lag = max_peak_lag
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._next = 0 # index of the node preferred in case of ties, rotated to spread requests
+        self._last_health_check = None
+        self._health_check = None
+
+
+    def select(self, exclude: Optional[Set[Node]] =None) -> Optional[Node]:
+        """Return the node to send the next request to, or None if all nodes are excluded.
+
+        Keyword arguments:
+        exclude -- nodes not to select, e.g. because the request already failed on them
+        """
+
+        candidates = [n for n in self.nodes if exclude is None or n not in exclude]
+        if len(candidates) == 0: return None
+        healthy = [n for n in candidates if n.healthy]
+        if len(healthy) > 0: candidates = healthy
+
+        # Rotate candidates so that ties are broken in a round-robin fashion
+        self._next = (self._next + 1) % len(candidates)
+        candidates = candidates[self._next:] + candidates[:self._next]
+
+        if self.load_balancing == LoadBalancing.LEAST_OUTSTANDING:
+            return min(candidates, key=lambda n: n.outstanding)
+        elif self.load_balancing == LoadBalancing.LATENCY_WEIGHTED:
+            # Nodes without latency samples are preferred so that they get measured
+            return min(candidates, key=lambda n: (n.outstanding + 1) * (n.latency or 0))
+        else:
+            raise ValueError(f"Unknown load balancing strategy {self.load_balancing.name}")
+
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+
+        self._schedule_health_check()
+
+        await request.aread() # request body must be available for retries
+        idempotent = request.url.path not in NON_IDEMPOTENT_ENDPOINTS
+        tried = set()
+
+        while True:
+            node = self.select(tried)
+            tried.add(node)
+            retry = idempotent and len(tried) < len(self.nodes)
+
+            try:
+                response = await self._send(node, request)
+            except httpx.TransportError as e:
+                self._mark_failed(node, repr(e))
+                if not retry: raise
+                continue
+
+            if response.status_code >= 500 and retry:
+                await response.aclose()
+                self._mark_failed(node, f"status code {response.status_code}")
+                continue
+
+            return response
+
+
+    async def _send(self, node: Node, request: httpx.Request) -> httpx.Response:
+        """Send a request to a node, keeping track of outstanding requests and latency."""
+
+        url = request.url.copy_with(scheme=node.url.scheme, host=node.url.host, port=node.url.port)
+        headers = request.headers.copy()
+        headers["Host"] = url.netloc.decode()
+        forwarded = httpx.Request(request.method, url, headers=headers, content=request.content, extensions=request.extensions)
+
+        node.outstanding += 1
+        node.requests += 1
+        start = time.monotonic()
+
+        def on_close():
+            node.outstanding -= 1
+            node._record_latency(time.monotonic() - start)
+
+        try:
+            response = await node.transport.handle_async_request(forwarded)
+        except BaseException:
+            node.outstanding -= 1
+            raise
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedStream(response.stream, on_close),
+            extensions=response.extensions
+        )
+
+
+    def _mark_failed(self, node: Node, reason: str):
+        node.failures += 1
+        if node.healthy: logging.warning(f"Marking node {node.base_url} unhealthy after failed request ({reason})")
+        node.healthy = False
+
+
+    def _schedule_health_check(self):
+        """Start a health check in the background if the last one is older than health_check_interval."""
+
+        if self.health_check_interval is None: return
+        if self._health_check is not None and not self._health_check.done(): return
+        if self._last_health_check is not None and time.monotonic() - self._last_health_check < self.health_check_interval: return
+
+        self._last_health_check = time.monotonic()
+        self._health_check = asyncio.ensure_future(self.check_health())
+
+
+    async def _get_peak_height(self, node: Node) -> Optional[int]:
+        """Return the peak height of a node, or None if it fails the health check."""
+
+        headers = {"Content-Type": "application/json"}
+        extensions = {"timeout": httpx.Timeout(self.health_check_timeout).as_dict()}
+
+        try:
+            results = []
+            for endpoint in ["/healthz", "/get_blockchain_state"]:
+                request = httpx.Request("POST", node.url.join(endpoint), headers=headers, content=b"{}", extensions=extensions)
+                response = await node.transport.handle_async_request(request)
+                try:
+                    content = await response.aread()
+                finally:
+                    await response.aclose()
+                results.append(json.loads(content) if response.status_code == 200 else {})
+        except (httpx.TransportError, ValueError) as e:
+            logging.info(f"Health check of node {node.base_url} failed ({e!r})")
+            return None
+
+        healthz, blockchain_state = results
+        if not healthz.get("success") or not blockchain_state.get("success"): return None
+        peak = blockchain_state["blockchain_state"]["peak"]
+        return peak["height"] if peak is not None else None
+
+
+    async def check_health(self) -> List[Node]:
+        """Check the health of all nodes and return the healthy ones."""
+
+        self._last_health_check = time.monotonic()
+        peak_heights = await asyncio.gather(*[self._get_peak_height(n) for n in self.nodes])
+
+        max_peak_height = max((h for h in peak_heights if h is not None), default=None)
+        for node, peak_height in zip(self.nodes, peak_heights):
+            node.peak_height = peak_height
+            healthy = peak_height is not None and max_peak_height - peak_height <= self.max_peak_lag
+            if healthy != node.healthy:
+                logging.info(f"Node {node.base_url} is now {'healthy' if healthy else 'unhealthy'} (peak height {peak_height}, pool peak height {max_peak_height})")
+            node.healthy = healthy
+
+        return [n for n in self.nodes if n.healthy]
+
+
+    async def aclose(self):
+        if self._health_check is not None: self._health_check.cancel()
+        for node in self.nodes:
+            await node.transport.aclose()
@@ -0,0 +1,133 @@
+import httpx
+import math
+import random
+from collections import deque
+from typing import Dict, Hashable, List, Optional
+
+from .constants import RETRY_STATUS_CODES
+
+
+class RetryPolicy():
+    """Policy for retrying idempotent requests that failed with a transient error.
+
+    Transient errors are timeouts, network errors (e.g. connection resets), protocol errors and responses with a status code
+    in retry_status_codes. Retries are delayed by exponential backoff with full jitter, i.e. the delay before retry n
+    (starting from 0) is drawn uniformly from [0, min(backoff_max, backoff_base * 2**n)]. A Retry-After header sets a lower bound.
+    """
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            backoff_base: float = 0.1,
+            backoff_max: float = 5.0,
+            retry_status_codes: List[int] = RETRY_STATUS_CODES
+    ):
+        """Initialize a RetryPolicy instance.
+
+        Keyword arguments:
+        max_attempts -- maximum number of attempts per request, including the first one. Default is 3
+        backoff_base -- upper bound in seconds of the delay before the first retry. Default is 0.1 seconds
+        backoff_max -- maximum delay in seconds between attempts. Default is 5 seconds
+        retry_status_codes -- status codes of responses to retry. Default is constants.RETRY_STATUS_CODES
+        """
+
+        if max_attempts < 1: raise ValueError("Maximum number of attempts must be a positive integer")
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_status_codes = retry_status_codes
+
+
+    def is_transient_error(self, error: BaseException) -> bool:
+        return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    def is_transient_response(self, response: httpx.Response) -> bool:
+        return response.status_code in self.retry_status_codes
+
+
+    def backoff(self, attempt: int, response: Optional[httpx.Response] =None) -> float:
+        """Return the delay in seconds before the next attempt.
+
+        Arguments:
+        attempt -- number of the failed attempt, starting from 0
+
+        Keyword arguments:
+        response -- response of the failed attempt, if any
+        """
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+        if response is not None:
+            try:
+                delay = max(delay, min(self.backoff_max, float(response.headers.get("Retry-After", 0))))
+            except ValueError:
+                pass # Retry-After given as HTTP date
+
+        return delay
+
+
+class HedgingPolicy():
+    """Policy for hedging idempotent requests.
+
+    If a request hasn't completed after a delay, a duplicate request is sent, and whichever response arrives first is used.
+    The delay is the given percentile of recent request durations to the same URL, so that roughly (100 - percentile) percent
+    of requests are hedged. Until min_samples durations have been recorded for a URL, initial_delay is used.
+    """
+
+    def __init__(
+            self,
+            percentile: float = 95,
+            initial_delay: float = 1.0,
+            min_delay: float = 0.01,
+            window: int = 100,
+            min_samples: int = 20
+    ):
+        """Initialize a HedgingPolicy instance.
+
+        Keyword arguments:
+        percentile -- percentile of recent request durations after which a request is hedged. Default is 95
+        initial_delay -- delay in seconds until enough request durations have been recorded. Default is 1 second
+        min_delay -- minimum delay in seconds. Default is 0.01 seconds
+        window -- number of recent request durations kept per URL. Default is 100
+        min_samples -- number of request durations required before the percentile is used. Default is 20
+        """
+
+        if not 0 < percentile <= 100: raise ValueError("Percentile must be in (0, 100]")
+
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.window = window
+        self.min_samples = min_samples
+        self._durations: Dict[Hashable, deque] = {}
+
+
+    def record(self, key: Hashable, duration: float):
+        """Record the duration of a completed request.
+
+        Arguments:
+        key -- key identifying requests with similar durations, e.g. their URL
+        duration -- request duration in seconds
+        """
+
+        durations = self._durations.get(key)
+        if durations is None:
+            durations = deque(maxlen=self.window)
+            self._durations[key] = durations
+        durations.append(duration)
+
+
+    def delay(self, key: Hashable) -> float:
+        """Return the delay in seconds after which a request is hedged.
+
+        Arguments:
+        key -- key identifying requests with similar durations, e.g. their URL
+        """
+
+        durations = self._durations.get(key)
+        if durations is None or len(durations) < self.min_samples: return self.initial_delay
+
+        durations = sorted(durations)
+        index = math.ceil(self.percentile / 100 * len(durations)) - 1
+        return max(self.min_delay, durations[index])
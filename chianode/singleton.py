@@ -0,0 +1,178 @@
+import logging
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.types.coin_spend import CoinSpend
+
+from .constants import Decode, COIN_ID_BATCH_SIZE, DEFAULT_CHAIN_POLL_INTERVAL
+from .trigger import PollTrigger
+from .utils import gather_bounded, resolve_max_concurrency, split_batches
+from .views import CoinEventView
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class SingletonState():
+    """Current coin and latest spend of a singleton tracked by a SingletonTracker."""
+
+    __slots__ = ("address", "latest_spend", "coin_record")
+
+    def __init__(self, address: str, latest_spend: CoinSpend, coin_record: CoinRecord):
+        self.address = address
+        self.latest_spend = latest_spend
+        self.coin_record = coin_record
+
+    def __repr__(self) -> str:
+        return f"SingletonState({self.address}, coin_id={self.coin_record.name}, spent={self.coin_record.spent})"
+
+
+class SingletonTracker():
+    """Tracker of the current coin and latest spend of many singletons.
+
+    The state of each singleton is loaded once with MojoClient.get_latest_singleton_spend, at most max_concurrency
+    requests at a time. After that, only the latest spend of singletons whose current coin was spent is fetched again.
+
+    With use_events enabled, the tracker follows Mojonode's coin event stream and matches the IDs of spent coins
+    against the current coins of the tracked singletons, so each update only fetches the singletons that were
+    streamed as spent, and is triggered as soon as such a spend arrives. While the stream is down, and on the first
+    update after it reconnects, updates fall back to polling: the current coins of all tracked singletons are looked
+    up with get_coin_records_by_names in batches of batch_size. Without events, every update polls, every interval seconds.
+    Singletons whose current coin is spent without being recreated (melted) are no longer looked up.
+    """
+
+    def __init__(
+            self,
+            client,
+            addresses: Iterable[str] = (),
+            batch_size: int = COIN_ID_BATCH_SIZE,
+            max_concurrency: Optional[int] = None,
+            interval: float = DEFAULT_CHAIN_POLL_INTERVAL,
+            use_events: bool = False
+    ):
+        """Initialize a SingletonTracker instance.
+
+        Arguments:
+        client -- MojoClient to fetch singleton spends with
+
+        Keyword arguments:
+        addresses -- addresses (launcher IDs) of the singletons to track. More can be added with track
+        batch_size -- maximum number of coin IDs per request when polling current coins. Default is constants.COIN_ID_BATCH_SIZE
+        max_concurrency -- maximum number of concurrent requests. Defaults to the client's max_concurrency
+        interval -- maximum number of seconds between updates. Default is constants.DEFAULT_CHAIN_POLL_INTERVAL
+        use_events -- boolean indicating whether to follow spends on Mojonode's coin event stream. Default is False
+        """
+
+        if not hasattr(client, "get_latest_singleton_spend"): raise ValueError("Tracking singletons requires a MojoClient")
+        if batch_size < 1: raise ValueError("Batch size must be a positive integer")
+
+        self.client = client
+        self.batch_size = batch_size
+        self.max_concurrency = resolve_max_concurrency(client, max_concurrency)
+        self.trigger = PollTrigger(interval, client if use_events else None, "coin", on_event=self._on_event)
+        self.singletons: Dict[str, SingletonState] = {} # singleton states by address
+        self._pending = set(addresses) # addresses whose state hasn't been loaded yet
+        self._coins: Dict[bytes32, str] = {} # addresses of singletons by ID of their unspent current coin
+        self._spends = set() # IDs of current coins streamed as spent since the last update
+        self._synced = False # whether the event stream was connected at the start of the last update
+        self._updating = False
+
+
+    def track(self, addresses: Iterable[str]):
+        """Add singletons to track. Their state is loaded on the next update."""
+
+        self._pending.update(a for a in addresses if a not in self.singletons)
+
+    def untrack(self, addresses: Iterable[str]):
+        """Stop tracking singletons."""
+
+        for address in addresses:
+            state = self.singletons.pop(address, None)
+            if state is not None: self._coins.pop(state.coin_record.name, None)
+            self._pending.discard(address)
+
+
+    def get(self, address: str) -> Optional[SingletonState]:
+        """Return the state of a tracked singleton, or None if it hasn't been loaded yet."""
+
+        return self.singletons.get(address)
+
+
+    def _on_event(self, event: Dict[str, Any]) -> bool:
+        """Record a streamed coin spend, and return True if the coin is the current coin of a tracked singleton."""
+
+        coin_record = event.get("data")
+        if not isinstance(coin_record, dict) or not coin_record.get("spent_block_index"): return False
+
+        coin_id = CoinEventView(event).id
+        if coin_id in self._coins:
+            self._spends.add(coin_id)
+            return True
+        if self._updating: self._spends.add(coin_id) # may be the current coin of a singleton being fetched
+        return False
+
+
+    def _set(self, states: List[SingletonState]):
+        for state in states:
+            previous = self.singletons.get(state.address)
+            if previous is not None: self._coins.pop(previous.coin_record.name, None)
+            self.singletons[state.address] = state
+            self._pending.discard(state.address)
+            if not state.coin_record.spent: self._coins[state.coin_record.name] = state.address
+
+
+    async def _fetch(self, addresses: List[str]) -> List[SingletonState]:
+        """Fetch the latest spend and current coin of singletons concurrently."""
+
+        results = await gather_bounded([self.client.get_latest_singleton_spend(a) for a in addresses], self.max_concurrency)
+        return [SingletonState(address, *result) for address, result in zip(addresses, results)]
+
+
+    async def _spent(self) -> List[str]:
+        """Look up the current coins of all tracked singletons and return the addresses of those that were spent."""
+
+        coins = dict(self._coins)
+        batches = split_batches(list(coins.keys()), self.batch_size)
+
+        async def lookup(batch):
+            return [cr async for cr in self.client.iter_coin_records_by_names(batch, include_spent_coins=True, decode=Decode.VIEW)]
+
+        spent = []
+        for coin_records in await gather_bounded([lookup(b) for b in batches], self.max_concurrency):
+            spent.extend(coins[cr.name] for cr in coin_records if cr.spent)
+        return spent
+
+
+    async def update(self) -> List[SingletonState]:
+        """Load pending singletons, refresh the singletons that were spent, and return the states that changed."""
+
+        connected = self.trigger.connected
+        spends, self._spends = self._spends, set()
+        self._updating = True
+        try:
+            if connected and self._synced:
+                spent = {self._coins[coin_id] for coin_id in spends if coin_id in self._coins}
+            else:
+                spent = await self._spent() if len(self._coins) > 0 else []
+            changed = await self._fetch(list(self._pending) + list(spent))
+            self._set(changed)
+        finally:
+            self._updating = False
+            self._spends = {coin_id for coin_id in self._spends if coin_id in self._coins} # spends streamed while fetching
+        self._synced = connected
+
+        if len(changed) > 0: logging.debug(f"Updated {len(changed)} of {len(self.singletons)} singletons")
+        if len(self._spends) > 0: self.trigger.fire()
+
+        return changed
+
+
+    def updates(self) -> AsyncIterator[SingletonState]:
+        """Keep the singleton states up to date and yield each state that changed."""
+
+        return self.trigger.run(self.update)
+
+
+    def __aiter__(self) -> AsyncIterator[SingletonState]:
+        return self.updates()
@@ -1,9 +1,14 @@
 import os
+import asyncio
 import httpx
 import yaml
-import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple, cast
+import time
+import weakref
+from collections import deque
+from concurrent.futures import Executor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, cast
 
 from chia.consensus.block_record import BlockRecord
 from chia.full_node.signage_point import SignagePoint
@@ -18,8 +23,19 @@ from chia.types.spend_bundle import SpendBundle
 from chia.types.unfinished_header_block import UnfinishedHeaderBlock
 from chia.util.byte_types import hexstr_to_bytes
 
-from .constants import NEWLINE, NodeProvider, Network, POST, MOJONODE_MAX_HEIGHT_DIFF, MOJONODE_STANDARD_ENDPOINTS, UNSUPPORTED_STANDARD_ENDPOINTS
-from .utils import hexstr_to_bytes32, coin_record_dict_backwards_compat, convert_mempool_item
+from .batch import convert_coin_record_batch, convert_additions_and_removals_batches
+from .cache import DECODED_ENDPOINTS, ResponseCache
+from .codec import get_codec
+from .connection import ConnectionPool
+from .daemon import DaemonTransport
+from .constants import NEWLINE, Decode, JsonCodec, NodeProvider, Network, POST, DEFAULT_DAEMON_PORT, DEFAULT_MAX_CONCURRENCY, EXECUTOR_THRESHOLD, STREAM_MAX_BUFFER_SIZE, MOJONODE_MAX_HEIGHT_DIFF, MOJONODE_PAGE_SIZE, MOJONODE_STANDARD_ENDPOINTS, NON_IDEMPOTENT_ENDPOINTS, UNSUPPORTED_STANDARD_ENDPOINTS
+from .jsonstream import JsonArrayStream
+from .offload import decode_response
+from .limiter import RateLimiter
+from .pool import NodePool
+from .retry import HedgingPolicy, RetryPolicy
+from .utils import hexstr_to_bytes32, convert_mempool_item, convert_mempool_items, convert_coin_record, convert_coin_records, convert_additions_and_removals, convert_block_record, convert_block_records, convert_full_block, convert_full_blocks, convert_coin_spend, convert_coin_spends, resolve_max_concurrency
+from .views import CoinRecordView, convert_coin_record_views, convert_additions_and_removals_views
 
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -56,13 +72,53 @@ class StandardClient():
          - by default, the page 1 is returned
          - the number of items per page is specified by constants.MOJONODE_PAGE_SIZE (currently 50)
       *  The page parameter is ignored when querying nodes that don't support pagination.
+      * The iter_coin_records_* methods walk all pages of a coin record query, prefetching the next page while the current one is consumed
+      * get_block_records, get_blocks and the iter_* methods split height ranges wider than the node provider allows
+        into windows, which are fetched concurrently (at most max_concurrency requests in flight) and merged in height order
+      * stream_blocks and stream_block_records parse responses incrementally and yield items one at a time with bounded memory
+      * With coalesce_requests enabled, concurrent identical requests share a single network round trip and decoded response.
+        Decoded responses may then be shared between callers and must not be modified
+      * With a response_cache, responses containing immutable data (blocks, block records, block spends, spent coins buried
+        deep enough) are served from the cache. See cache.ResponseCache for details
+      * The decode argument of coin record, block record, block and coin spend methods selects how responses are decoded:
+        Decode.RAW returns the response body as bytes, Decode.DICT the decoded JSON, and Decode.CHIA chia types (the default).
+        Skipping the construction of chia types saves CPU when only a few fields are needed. Methods that combine
+        several responses (iter_*, stream_*, get_block_records, get_blocks) don't support Decode.RAW.
+        Coin record methods also support Decode.VIEW, which returns views.CoinRecordView objects that decode fields on first access.
+        get_coin_records_* and get_additions_and_removals also support Decode.BATCH, which returns a batch.CoinRecordBatch
+        holding the coin records in columnar arrays for vectorized filtering and aggregation
+      * With a node_pool, requests are spread across several official Chia full nodes, and idempotent requests fail over
+        to another node if one fails. See pool.NodePool for details
+      * With a retry_policy, idempotent requests (all but push_tx) that fail with a transient error are retried with jittered
+        exponential backoff. With a hedging_policy, a duplicate of a slow idempotent request is sent and the first response is used
+      * With a rate_limiter, requests are rate limited and their concurrency is adapted to the load the node provider can sustain.
+        Retries and hedged requests count towards the limits. See limiter.RateLimiter for details
+      * With a connection_pool, connections are shared with other clients using the same pool. See connection.ConnectionPool for details
+      * With use_daemon enabled, RPCs to the full node running on localhost are multiplexed over a persistent websocket connection
+        to the Chia daemon, which saves the per-request HTTP overhead. Responses are limited to constants.DAEMON_MAX_MESSAGE_SIZE bytes
+        by default. See daemon.DaemonTransport for details
+      * With an executor, responses of at least executor_threshold bytes are decoded and converted in the executor,
+        so that the event loop keeps serving other requests. A ProcessPoolExecutor avoids contention for the GIL
     """
 
     def __init__(
             self,
             node_provider: NodeProvider = NodeProvider.FULLNODE,
             network: Network = Network.MAINNET,
-            timeout: Optional[int] = 5 # 5 second timeout is httpx default
+            timeout: Optional[int] = 5, # 5 second timeout is httpx default
+            max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+            json_codec: JsonCodec = JsonCodec.AUTO,
+            coalesce_requests: bool = False,
+            response_cache: Optional[ResponseCache] = None,
+            decode: Decode = Decode.CHIA,
+            executor: Optional[Executor] = None,
+            executor_threshold: int = EXECUTOR_THRESHOLD,
+            node_pool: Optional[NodePool] = None,
+            retry_policy: Optional[RetryPolicy] = None,
+            hedging_policy: Optional[HedgingPolicy] = None,
+            rate_limiter: Optional[RateLimiter] = None,
+            connection_pool: Optional[ConnectionPool] = None,
+            use_daemon: bool = False
     ): 
         """Initialize a StandardClient instance.
 
@@ -70,17 +126,39 @@ class StandardClient():
         node_provider -- node provider for standard RPCs. Default is NodeProvider.FULLNODE
         network -- network which the node provider is connected to. Default is Network.MAINNET
         timeout -- timeout in seconds for requests to the node provider. Default is 10 seconds. Set to None for no timeout
+        max_concurrency -- maximum number of concurrent requests when fetching a height range split into windows. Default is constants.DEFAULT_MAX_CONCURRENCY
+        json_codec -- JSON codec for encoding requests and decoding responses. Default is JsonCodec.AUTO, which uses orjson or msgspec if installed, and the json standard library module otherwise
+        coalesce_requests -- boolean indicating whether concurrent identical requests share a single network round trip. Default is False
+        response_cache -- cache for responses containing immutable data. Default is None (no caching)
+        decode -- default decoding level for methods with a decode argument. Default is Decode.CHIA
+        executor -- executor (e.g. concurrent.futures.ProcessPoolExecutor) for decoding large responses. Default is None (decode on the event loop)
+        executor_threshold -- minimum response size in bytes for decoding in the executor. Default is constants.EXECUTOR_THRESHOLD
+        node_pool -- pool of official Chia full nodes to spread requests across instead of the node running on localhost. Default is None
+        retry_policy -- policy for retrying idempotent requests that failed with a transient error. Default is None (no retries)
+        hedging_policy -- policy for hedging slow idempotent requests. Default is None (no hedging)
+        rate_limiter -- rate limiter and adaptive concurrency limiter applied to all requests except event streams. Can be shared between clients. Default is None (no limits)
+        connection_pool -- connection pool shared with other clients. Default is None (the client opens its own connections)
+        use_daemon -- boolean indicating whether to send RPCs to the full node running on localhost over a websocket connection to the Chia daemon instead of HTTPS. Default is False
         """
 
         self.node_provider = node_provider
 
-        if self.node_provider == NodeProvider.FULLNODE:
+        if use_daemon and (node_provider != NodeProvider.FULLNODE or node_pool is not None): raise ValueError("The Chia daemon can only be used with the full node running on localhost")
+
+        if node_pool is not None:
+            if self.node_provider != NodeProvider.FULLNODE: raise ValueError(f"Node pools not supported by node provider {self.node_provider.name}")
+            self.network = network
+            self.base_url = node_pool.base_url
+            self.headers = {"Content-Type": "application/json"}
+            self.cert = None
+        elif self.node_provider == NodeProvider.FULLNODE:
             if os.getenv('CHIA_ROOT') is None: raise NameError("Environment variable CHIA_ROOT not set")
             chia_root = os.getenv("CHIA_ROOT")
             with open(chia_root + "/config/config.yaml", "r") as file:
                 config_file = yaml.safe_load(file)
                 selected_network = config_file["full_node"]["selected_network"]
                 rpc_port = config_file["full_node"]["rpc_port"]
+                daemon_url = f"wss://{config_file.get('self_hostname', 'localhost')}:{config_file.get('daemon_port', DEFAULT_DAEMON_PORT)}"
             if selected_network == network.name.lower():
                 self.network = network
                 self.base_url = f"{self.node_provider.base_url()}:{rpc_port}"
@@ -105,9 +183,46 @@ class StandardClient():
             raise ValueError(f"Unknown node provider {self.node_provider.name}")
 
         if timeout is not None and timeout < 0: ValueError("Timeout must be None or a non-negative integer")
+        if max_concurrency < 1: raise ValueError("Maximum concurrency must be a positive integer")
         
         self.timeout = timeout
-        self.client = httpx.AsyncClient(base_url=self.base_url, http2=True, timeout=self.timeout, cert=self.cert, verify=False)
+        self.max_concurrency = max_concurrency
+        self.codec = get_codec(json_codec)
+        self.coalesce_requests = coalesce_requests
+        self._in_flight = {} # in-flight requests by request key if coalescing requests
+        self._decoded = weakref.WeakKeyDictionary() # decoded bodies of coalesced and cached responses
+        self.response_cache = response_cache
+        self.decode = decode
+        self.executor = executor
+        self.executor_threshold = executor_threshold
+        self.node_pool = node_pool
+        self.retry_policy = retry_policy
+        self.hedging_policy = hedging_policy
+        self.rate_limiter = rate_limiter
+        self.connection_pool = connection_pool
+        self.use_daemon = use_daemon
+        if node_pool is not None:
+            transport = node_pool
+        elif use_daemon:
+            transport = DaemonTransport(daemon_url, cert=self.cert, json_codec=json_codec)
+        elif connection_pool is not None:
+            transport = connection_pool.transport(self.base_url, cert=self.cert, verify=False)
+        else:
+            transport = None
+        self.client = httpx.AsyncClient(base_url=self.base_url, http2=True, timeout=self.timeout, cert=self.cert, verify=False, transport=transport)
+
+
+    async def aclose(self):
+        """Close the client's connections. Connections of a shared connection pool are left open."""
+
+        await self.client.aclose()
+
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
 
 
     def _check_heights(self, height_start: int, height_end: int) -> bool:
@@ -128,7 +243,98 @@ class StandardClient():
                 raise ValueError(f"Block height difference must not be greater than {MOJONODE_MAX_HEIGHT_DIFF} when querying Mojonode")
 
         return True
-    
+
+
+    def _height_windows(self, height_start: int, height_end: int) -> List[Tuple[int, int]]:
+        """Split a block height range into consecutive windows the node provider accepts in a single request.
+
+        Mojonode limits height ranges to constants.MOJONODE_MAX_HEIGHT_DIFF blocks. Full nodes accept any range,
+        in which case a single window is returned.
+
+        Arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+        """
+
+        if not (height_start >= 0 and height_end >= 0):
+            raise ValueError("Block heights must be non-negative")
+        elif height_start >= height_end:
+            raise ValueError("Start block height must be less than end block height")
+
+        if self.node_provider != NodeProvider.MOJONODE:
+            return [(height_start, height_end)]
+
+        return [(h, min(h + MOJONODE_MAX_HEIGHT_DIFF, height_end)) for h in range(height_start, height_end, MOJONODE_MAX_HEIGHT_DIFF)]
+
+
+    async def _iter_windows(
+            self,
+            fetch_window: Callable[[int, int], Awaitable[Any]],
+            windows: List[Tuple[int, int]],
+            max_concurrency: Optional[int] =None
+    ) -> AsyncIterator[Any]:
+        """Fetch height windows concurrently and yield their results in window order.
+
+        At most max_concurrency windows are in flight at any time. A window's result is yielded as soon as it and all preceding windows have been fetched.
+
+        Arguments:
+        fetch_window -- coroutine function taking the starting (incl) and ending (excl) height of a window
+        windows -- list of height windows as returned by _height_windows
+
+        Keyword arguments:
+        max_concurrency -- maximum number of windows fetched concurrently. Defaults to the client's max_concurrency
+        """
+
+        max_concurrency = resolve_max_concurrency(self, max_concurrency)
+
+        tasks = deque()
+        try:
+            for window in windows:
+                tasks.append(asyncio.ensure_future(fetch_window(*window)))
+                if len(tasks) >= max_concurrency:
+                    yield await tasks.popleft()
+            while tasks:
+                yield await tasks.popleft()
+        finally:
+            # Don't leave fetches running if the caller stops iterating early or a window fails
+            for task in tasks: task.cancel()
+
+
+    async def _iter_coin_records(
+            self,
+            fetch_page: Callable[[Optional[int], Optional[int], int], Awaitable[List[CoinRecord]]],
+            height_start: Optional[int],
+            height_end: Optional[int],
+            max_concurrency: Optional[int] =None
+    ) -> AsyncIterator[CoinRecord]:
+        """Yield coin records of a paginated coin record query over an arbitrary height range.
+
+        Arguments:
+        fetch_page -- coroutine function taking starting height, ending height and page, and returning a page of coin records
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+
+        Keyword arguments:
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        """
+
+        if height_start is None or height_end is None:
+            windows = [(height_start, height_end)]
+        else:
+            windows = self._height_windows(height_start, height_end)
+
+        if len(windows) == 1:
+            async for coin_record in self._iter_pages(lambda page: fetch_page(*windows[0], page)):
+                yield coin_record
+            return
+
+        async def fetch_window(window_start: int, window_end: int) -> List[CoinRecord]:
+            return [cr async for cr in self._iter_pages(lambda page: fetch_page(window_start, window_end, page))]
+
+        async for coin_records in self._iter_windows(fetch_window, windows, max_concurrency):
+            for coin_record in coin_records:
+                yield coin_record
+
             
     def _add_network_param(self, params: dict, no_network: bool) -> dict:
         """Add a network field to a dict of parameters.
@@ -158,16 +364,340 @@ class StandardClient():
         if timeout is not None and timeout < 0: timeout = self.timeout        
 
         url = self.base_url + "/" + endpoint
-        data = json.dumps(self._add_network_param(params, no_network))
+        data = self.codec.dumps(self._add_network_param(params, no_network))
 
-        if method == POST:
-            logging.info(f"Sending POST request{NEWLINE}  URL: {url}{NEWLINE}  data: {data}")
-            response = await self.client.post(url, content=data, headers=self.headers, timeout=timeout)
-        else:
+        if method != POST:
             raise ValueError(f"Unsupported REST method {method}")
 
+        key = (url, data)
+
+        if self.response_cache is not None and self.response_cache.is_cacheable(endpoint):
+            payload = self.response_cache.get(key)
+            if payload is not None:
+                logging.debug(f"Serving request to {url} from cache")
+                return httpx.Response(200, content=payload, request=httpx.Request(POST, url))
+
+        idempotent = "/" + endpoint not in NON_IDEMPOTENT_ENDPOINTS
+        send = lambda: self._send(url, lambda: self._post(url, data, timeout), idempotent)
+
+        if self.coalesce_requests and idempotent:
+            response = await self._coalesce(key, send)
+        else:
+            response = await send()
+
+        if self.response_cache is not None and response.status_code == 200 and self.response_cache.is_relevant(endpoint):
+            self._cache_response(endpoint, params, key, response)
+
+        return response
+
+
+    def _cache_response(self, endpoint: str, params: dict, key: Hashable, response: httpx.Response):
+        """Pass a response to the response cache, which decides whether to cache it.
+
+        Only responses the cache needs decoded (cache.DECODED_ENDPOINTS, which are small) are decoded here, and the decoded
+        response is memoized so that the caller doesn't decode it a second time. Other responses, such as large blocks,
+        are left for the caller to decode, in the client's executor if configured.
+
+        Arguments:
+        endpoint -- endpoint the request was sent to
+        params -- request parameters
+        key -- request key
+        response -- response to the request
+        """
+
+        decoded = None
+        if endpoint in DECODED_ENDPOINTS:
+            self._decoded.setdefault(response, None)
+            decoded = self._decode(response)
+        self.response_cache.update(endpoint, params, key, response.content, decoded)
+
+
+    async def _post(self, url: str, data: bytes, timeout: Optional[int]) -> httpx.Response:
+        """Send a POST request to the node provider.
+
+        Arguments:
+        url -- URL to send request to
+        data -- encoded request body
+        timeout -- request timeout in seconds
+        """
+
+        logging.info(f"Sending POST request{NEWLINE}  URL: {url}{NEWLINE}  data: {data.decode()}")
+        return await self.client.post(url, content=data, headers=self.headers, timeout=timeout)
+
+
+    async def _send(self, url: str, send: Callable[[], Awaitable[httpx.Response]], idempotent: bool =True, hedge: bool =True) -> httpx.Response:
+        """Send a request, applying the client's rate limiter, and its retry and hedging policies if the request is idempotent.
+
+        Once all attempts have been used up, the last response is returned or the last error raised.
+
+        Arguments:
+        url -- URL the request is sent to
+        send -- coroutine function sending the request
+
+        Keyword arguments:
+        idempotent -- boolean indicating whether the request may be sent more than once
+        hedge -- boolean indicating whether the hedging policy applies. Default is True
+        """
+
+        if self.rate_limiter is not None:
+            unlimited_send = send
+            send = lambda: self._limit(url, unlimited_send)
+
+        hedging = self.hedging_policy is not None and hedge
+        if not idempotent or (self.retry_policy is None and not hedging): return await send()
+
+        attempt = 0
+        while True:
+            last_attempt = self.retry_policy is None or attempt + 1 >= self.retry_policy.max_attempts
+            try:
+                response = await (self._hedge(url, send) if hedging else send())
+            except Exception as e:
+                if last_attempt or not self.retry_policy.is_transient_error(e): raise
+                delay = self.retry_policy.backoff(attempt)
+                logging.info(f"Retrying request to {url} in {delay:.3f} seconds after {e!r}")
+            else:
+                if last_attempt or not self.retry_policy.is_transient_response(response): return response
+                delay = self.retry_policy.backoff(attempt, response)
+                logging.info(f"Retrying request to {url} in {delay:.3f} seconds after status code {response.status_code}")
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+    async def _limit(self, url: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request once the client's rate limiter allows it, and report the outcome to the rate limiter.
+
+        Arguments:
+        url -- URL the request is sent to
+        send -- coroutine function sending the request
+        """
+
+        start = await self.rate_limiter.acquire()
+        try:
+            response = await send()
+        except BaseException as e:
+            self.rate_limiter.release(url, start, error=e)
+            raise
+        self.rate_limiter.release(url, start, response=response)
         return response
 
+
+    async def _hedge(self, url: str, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request, and send a duplicate if it hasn't completed after the hedging policy's delay.
+
+        The first response received is returned, and the other request is cancelled. Errors before the delay
+        are raised immediately. Once hedged, an error is only raised if both requests fail.
+
+        Arguments:
+        url -- URL the request is sent to
+        send -- coroutine function sending the request
+        """
+
+        async def timed_send():
+            start = time.monotonic()
+            response = await send()
+            self.hedging_policy.record(url, time.monotonic() - start)
+            return response
+
+        pending = {asyncio.ensure_future(timed_send())}
+        hedged = False
+        error = None
+        try:
+            while len(pending) > 0:
+                done, pending = await asyncio.wait(pending, timeout=None if hedged else self.hedging_policy.delay(url), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None: return task.result()
+                    error = task.exception()
+                if len(done) == 0:
+                    logging.debug(f"Hedging request to {url}")
+                    pending.add(asyncio.ensure_future(timed_send()))
+                    hedged = True
+                elif not hedged:
+                    break
+            raise error
+        finally:
+            for task in pending: task.cancel()
+
+
+    async def _coalesce(self, key: Hashable, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a request unless an identical one is already in flight, in which case its response is shared.
+
+        Arguments:
+        key -- request key. Requests with equal keys are considered identical
+        send -- coroutine function sending the request
+        """
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(send())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda f: self._in_flight.pop(key, None))
+        else:
+            logging.debug(f"Coalescing request with in-flight request to {key[0]}")
+
+        # Shield the shared request so that a cancelled caller doesn't cancel it for the others
+        response = await asyncio.shield(future)
+        self._decoded.setdefault(response, None)
+        return response
+
+
+    def _decode(self, response: httpx.Response) -> Any:
+        """Decode the JSON body of a response.
+
+        The raw response bytes are passed to the client's codec directly, without first decoding them into a str.
+        Responses shared by coalesced requests are decoded only once.
+
+        Arguments:
+        response -- response to a REST request
+        """
+
+        if response in self._decoded:
+            decoded = self._decoded[response]
+            if decoded is None:
+                decoded = self.codec.loads(response.content)
+                self._decoded[response] = decoded
+            return decoded
+
+        return self.codec.loads(response.content)
+
+
+    async def _decode_convert(self, response: httpx.Response, key: Optional[str], convert: Optional[Callable[[Any], Any]]) -> Any:
+        """Decode a response and convert the data in it, in the client's executor if the response is large.
+
+        Arguments:
+        response -- response to a REST request
+        key -- key of the data in the response body, or None for the entire body
+        convert -- module-level function converting the decoded data, or None to return it unchanged
+        """
+
+        # Responses that have been decoded already (coalesced or cached) are only converted
+        if self.executor is not None and len(response.content) >= self.executor_threshold and self._decoded.get(response) is None:
+            logging.debug(f"Decoding response of {len(response.content)} bytes in executor")
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, decode_response, response.content, self.codec.json_codec, key, convert)
+
+        data = self._decode(response)
+        if key is not None: data = data[key]
+        if convert is None: return data
+        return convert(data)
+
+
+    async def _convert(
+            self,
+            response: httpx.Response,
+            key: Optional[str],
+            convert: Callable[[Any], Any],
+            decode: Optional[Decode],
+            view: Optional[Callable[[Any], Any]] =None,
+            batch: Optional[Callable[[Any], Any]] =None
+    ) -> Any:
+        """Return the data in a response at the requested decoding level.
+
+        Arguments:
+        response -- response to a REST request
+        key -- key of the data in the response body, or None for the entire body
+        convert -- function converting the decoded data into chia types
+        decode -- decoding level, or None for the client's default
+
+        Keyword arguments:
+        view -- function wrapping the decoded data in views, or None if the method doesn't support Decode.VIEW
+        batch -- function converting the decoded data into batches, or None if the method doesn't support Decode.BATCH
+        """
+
+        if decode is None: decode = self.decode
+
+        if decode == Decode.RAW: return response.content
+        if decode == Decode.VIEW and view is None: raise ValueError("Decode.VIEW only supported by coin record methods")
+        if decode == Decode.BATCH and batch is None: raise ValueError("Decode.BATCH only supported by coin record list methods")
+
+        if decode == Decode.DICT: convert = None
+        elif decode == Decode.VIEW: convert = view
+        elif decode == Decode.BATCH: convert = batch
+
+        return await self._decode_convert(response, key, convert)
+
+
+    def _item_decode(self, decode: Optional[Decode], views: bool =False) -> Decode:
+        """Return the decoding level for methods that combine several responses, which can't return raw response bodies.
+
+        Arguments:
+        decode -- decoding level, or None for the client's default
+
+        Keyword arguments:
+        views -- boolean indicating whether the method supports Decode.VIEW
+        """
+
+        if decode is None: decode = self.decode
+        if decode == Decode.RAW: raise ValueError("Decode.RAW not supported by methods combining several responses")
+        if decode == Decode.VIEW and not views: raise ValueError("Decode.VIEW only supported by coin record methods")
+        if decode == Decode.BATCH: raise ValueError("Decode.BATCH not supported by methods combining several responses")
+        return decode
+
+
+    @asynccontextmanager
+    async def _stream_request(self, method: str, endpoint: str, params: dict, no_network: bool =False, timeout: Optional[int] =-1):
+        """Send a REST request and provide the response without reading its body.
+
+        The rate limiter and retry policy apply as for other requests. The rate limiter counts the request as completed
+        once the response headers have been received. Streamed requests are not hedged, since a duplicate request would
+        transfer the entire body a second time. Raises httpx.HTTPStatusError if the response status indicates an error.
+
+        Arguments:
+        method -- a REST method (always POST)
+        endpoint -- URI endpoint to send request to
+        params -- request parameters
+
+        Keywork arguments:
+        no_network -- boolean indicating whether to add a network field to params
+        timeout -- request timeout in seconds
+        """
+
+        if timeout is not None and timeout < 0: timeout = self.timeout
+
+        url = self.base_url + "/" + endpoint
+        data = self.codec.dumps(self._add_network_param(params, no_network))
+
+        if method != POST:
+            raise ValueError(f"Unsupported REST method {method}")
+
+        async def send() -> httpx.Response:
+            logging.info(f"Sending streaming POST request{NEWLINE}  URL: {url}{NEWLINE}  data: {data.decode()}")
+            request = self.client.build_request(POST, url, content=data, headers=self.headers, timeout=timeout)
+            response = await self.client.send(request, stream=True)
+            if response.status_code != 200: await response.aread() # error bodies are small, and reading them releases the connection if the response is retried
+            return response
+
+        response = await self._send(url, send, "/" + endpoint not in NON_IDEMPOTENT_ENDPOINTS, hedge=False)
+        try:
+            response.raise_for_status()
+            yield response
+        finally:
+            await response.aclose()
+
+
+    async def _stream_array(self, endpoint: str, params: dict, key: str, max_buffer_size: int, timeout: Optional[int] =-1) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the items of an array in the response body one at a time while the response is being received.
+
+        Arguments:
+        endpoint -- URI endpoint to send request to
+        params -- request parameters
+        key -- key of the array in the response body
+        max_buffer_size -- maximum number of bytes buffered for a single item
+
+        Keyword arguments:
+        timeout -- request timeout in seconds
+        """
+
+        parser = JsonArrayStream(key, max_buffer_size)
+
+        async with self._stream_request(POST, endpoint, params, timeout=timeout) as response:
+            async for chunk in response.aiter_bytes():
+                for item in parser.feed(chunk):
+                    yield self.codec.loads(item)
+                if parser.finished: break
+
+        if not parser.found: raise KeyError(key)
+
+    
     async def _request_no_network(self, method: str, endpoint: str, params: dict, timeout: Optional[int] =-1):
         """Send a REST request without specifying a network.
 
@@ -185,15 +715,45 @@ class StandardClient():
         return await self._request(method, endpoint, params, no_network=True, timeout=timeout)
 
     
-    async def get_coin_record_by_name(self, coin_id: bytes32, timeout: Optional[int] =-1) -> CoinRecord:
+    async def _iter_pages(self, fetch_page: Callable[[int], Awaitable[List[Any]]], page: int =1) -> AsyncIterator[Any]:
+        """Yield items of a paginated query, starting from the given page.
+
+        The request for the next page is sent before the items of the current page are yielded, so that
+        the network round trip overlaps with the caller's processing. Iteration stops on the first page
+        with fewer than constants.MOJONODE_PAGE_SIZE items. Nodes that don't support pagination return a single page.
+
+        Arguments:
+        fetch_page -- coroutine function returning the list of items on the page passed to it
+
+        Keyword arguments:
+        page -- first page to fetch
+        """
+
+        next_page = asyncio.ensure_future(fetch_page(page))
+        try:
+            while next_page is not None:
+                items = await next_page
+                if self.node_provider == NodeProvider.MOJONODE and len(items) >= MOJONODE_PAGE_SIZE:
+                    page += 1
+                    next_page = asyncio.ensure_future(fetch_page(page))
+                else:
+                    next_page = None
+                for item in items:
+                    yield item
+        finally:
+            # Don't leave a prefetch running if the caller stops iterating early
+            if next_page is not None: next_page.cancel()
+
+            
+    async def get_coin_record_by_name(self, coin_id: bytes32, timeout: Optional[int] =-1, decode: Optional[Decode] =None) -> CoinRecord:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
 
         params = {"name": coin_id.hex()}
 
-        coin_record = (await self._request(POST, "get_coin_record_by_name", params)).json()["coin_record"]
+        response = await self._request(POST, "get_coin_record_by_name", params)
 
-        return CoinRecord.from_json_dict(coin_record_dict_backwards_compat(coin_record))
+        return await self._convert(response, "coin_record", convert_coin_record, decode, CoinRecordView)
 
     
     async def get_coin_records_by_names(
@@ -203,7 +763,8 @@ class StandardClient():
             height_end: Optional[int] =None,
             include_spent_coins: bool =False,
             page: int =1,
-            timeout: Optional[int] =-1
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
     ) -> List[CoinRecord]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
@@ -222,11 +783,45 @@ class StandardClient():
             if height_start is None: params.pop("start_height")
             if height_end is None: params.pop("end_height")
 
-        coin_records = (await self._request(POST, "get_coin_records_by_names", params, timeout=timeout)).json()["coin_records"]
+        response = await self._request(POST, "get_coin_records_by_names", params, timeout=timeout)
 
-        return [CoinRecord.from_json_dict(coin_record_dict_backwards_compat(cr)) for cr in coin_records]
+        return await self._convert(response, "coin_records", convert_coin_records, decode, convert_coin_record_views, convert_coin_record_batch)
 
     
+
+    async def iter_coin_records_by_names(
+            self,
+            coin_ids: List[bytes32],
+            height_start: Optional[int] =None,
+            height_end: Optional[int] =None,
+            include_spent_coins: bool =False,
+            max_concurrency: Optional[int] =None,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[CoinRecord]:
+        """Iterate over coin records for given coin IDs across all pages and height windows.
+
+        Arguments:
+        coin_ids -- list of coin IDs (coin names)
+
+        Keyword arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+        include_spent_coins -- boolean indicating whether to include spent coins
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        timeout -- request timeout in seconds
+        decode -- decoding level of the coin records (Decode.DICT, Decode.CHIA or Decode.VIEW). Defaults to the client's decoding level
+        """
+
+        decode = self._item_decode(decode, views=True)
+
+        async for coin_record in self._iter_coin_records(
+                lambda hs, he, page: self.get_coin_records_by_names(coin_ids, hs, he, include_spent_coins, page, timeout, decode),
+                height_start, height_end, max_concurrency
+        ):
+            yield coin_record
+
+
     async def get_coin_records_by_parent_ids(
             self,
             parent_ids: List[bytes32],
@@ -234,7 +829,8 @@ class StandardClient():
             height_end: Optional[int] =None,
             include_spent_coins: bool =False,
             page: int =1,
-            timeout: Optional[int] =-1
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
     ) -> List[CoinRecord]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
@@ -253,11 +849,45 @@ class StandardClient():
             if height_start is None: params.pop("start_height")
             if height_end is None: params.pop("end_height")
 
-        coin_records = (await self._request(POST, "get_coin_records_by_parent_ids", params)).json()["coin_records"]
+        response = await self._request(POST, "get_coin_records_by_parent_ids", params)
 
-        return [CoinRecord.from_json_dict(coin_record_dict_backwards_compat(cr)) for cr in coin_records]
+        return await self._convert(response, "coin_records", convert_coin_records, decode, convert_coin_record_views, convert_coin_record_batch)
 
     
+
+    async def iter_coin_records_by_parent_ids(
+            self,
+            parent_ids: List[bytes32],
+            height_start: Optional[int] =None,
+            height_end: Optional[int] =None,
+            include_spent_coins: bool =False,
+            max_concurrency: Optional[int] =None,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[CoinRecord]:
+        """Iterate over coin records for given parent coin IDs across all pages and height windows.
+
+        Arguments:
+        parent_ids -- list of parent coin IDs
+
+        Keyword arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+        include_spent_coins -- boolean indicating whether to include spent coins
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        timeout -- request timeout in seconds
+        decode -- decoding level of the coin records (Decode.DICT, Decode.CHIA or Decode.VIEW). Defaults to the client's decoding level
+        """
+
+        decode = self._item_decode(decode, views=True)
+
+        async for coin_record in self._iter_coin_records(
+                lambda hs, he, page: self.get_coin_records_by_parent_ids(parent_ids, hs, he, include_spent_coins, page, timeout, decode),
+                height_start, height_end, max_concurrency
+        ):
+            yield coin_record
+
+
     async def get_coin_records_by_puzzle_hash(
             self,
             puzzle_hash: bytes32,
@@ -265,7 +895,8 @@ class StandardClient():
             height_end: Optional[int] =None,
             include_spent_coins: bool =False,
             page: int =1,
-            timeout: Optional[int] =-1
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
     ) -> List[CoinRecord]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
@@ -285,11 +916,45 @@ class StandardClient():
             if height_end is None: params.pop("end_height")
 
 
-        coin_records = (await self._request(POST, "get_coin_records_by_puzzle_hash", params, timeout=timeout)).json()["coin_records"]
+        response = await self._request(POST, "get_coin_records_by_puzzle_hash", params, timeout=timeout)
 
-        return [CoinRecord.from_json_dict(coin_record_dict_backwards_compat(cr)) for cr in coin_records]
+        return await self._convert(response, "coin_records", convert_coin_records, decode, convert_coin_record_views, convert_coin_record_batch)
 
         
+
+    async def iter_coin_records_by_puzzle_hash(
+            self,
+            puzzle_hash: bytes32,
+            height_start: Optional[int] =None,
+            height_end: Optional[int] =None,
+            include_spent_coins: bool =False,
+            max_concurrency: Optional[int] =None,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[CoinRecord]:
+        """Iterate over coin records for given puzzle hash across all pages and height windows.
+
+        Arguments:
+        puzzle_hash -- a puzzle hash
+
+        Keyword arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+        include_spent_coins -- boolean indicating whether to include spent coins
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        timeout -- request timeout in seconds
+        decode -- decoding level of the coin records (Decode.DICT, Decode.CHIA or Decode.VIEW). Defaults to the client's decoding level
+        """
+
+        decode = self._item_decode(decode, views=True)
+
+        async for coin_record in self._iter_coin_records(
+                lambda hs, he, page: self.get_coin_records_by_puzzle_hash(puzzle_hash, hs, he, include_spent_coins, page, timeout, decode),
+                height_start, height_end, max_concurrency
+        ):
+            yield coin_record
+
+
     async def get_coin_records_by_puzzle_hashes(
             self,
             puzzle_hashes: List[bytes32],
@@ -297,7 +962,8 @@ class StandardClient():
             height_end: Optional[int] =None,
             include_spent_coins: bool =False,
             page: int =1,
-            timeout: Optional[int] =-1
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
     ) -> List[CoinRecord]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
@@ -316,11 +982,45 @@ class StandardClient():
             if height_start is None: params.pop("start_height")
             if height_end is None: params.pop("end_height")
 
-        coin_records = (await self._request(POST, "get_coin_records_by_puzzle_hashes", params, timeout=timeout)).json()["coin_records"]
+        response = await self._request(POST, "get_coin_records_by_puzzle_hashes", params, timeout=timeout)
 
-        return [CoinRecord.from_json_dict(coin_record_dict_backwards_compat(cr)) for cr in coin_records]
+        return await self._convert(response, "coin_records", convert_coin_records, decode, convert_coin_record_views, convert_coin_record_batch)
 
     
+
+    async def iter_coin_records_by_puzzle_hashes(
+            self,
+            puzzle_hashes: List[bytes32],
+            height_start: Optional[int] =None,
+            height_end: Optional[int] =None,
+            include_spent_coins: bool =False,
+            max_concurrency: Optional[int] =None,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[CoinRecord]:
+        """Iterate over coin records for given puzzle hashes across all pages and height windows.
+
+        Arguments:
+        puzzle_hashes -- list of puzzle hashes
+
+        Keyword arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+        include_spent_coins -- boolean indicating whether to include spent coins
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        timeout -- request timeout in seconds
+        decode -- decoding level of the coin records (Decode.DICT, Decode.CHIA or Decode.VIEW). Defaults to the client's decoding level
+        """
+
+        decode = self._item_decode(decode, views=True)
+
+        async for coin_record in self._iter_coin_records(
+                lambda hs, he, page: self.get_coin_records_by_puzzle_hashes(puzzle_hashes, hs, he, include_spent_coins, page, timeout, decode),
+                height_start, height_end, max_concurrency
+        ):
+            yield coin_record
+
+
     async def get_coin_records_by_hint(
             self,
             hint: bytes32,
@@ -328,7 +1028,8 @@ class StandardClient():
             height_end: Optional[int] =None,
             include_spent_coins: bool =False,
             page: int =1,
-            timeout: Optional[int] =-1
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
     ) -> List[CoinRecord]:
         """Return coin records for coins hinted at.
 
@@ -343,6 +1044,7 @@ class StandardClient():
         include_spent_coins -- boolean indicating whether to include spent coins
         page -- page to be returned (if applicable)
         timeout -- request timeout in seconds
+        decode -- decoding level of the result. Defaults to the client's decoding level
         """
 
         if timeout is not None and timeout < 0: timeout = self.timeout
@@ -361,42 +1063,126 @@ class StandardClient():
             if height_start is None: params.pop("start_height")
             if height_end is None: params.pop("end_height")
 
-        coin_records = (await self._request(POST, "get_coin_records_by_hint", params, timeout=timeout)).json()["coin_records"]
+        response = await self._request(POST, "get_coin_records_by_hint", params, timeout=timeout)
 
-        return [CoinRecord.from_json_dict(coin_record_dict_backwards_compat(cr)) for cr in coin_records]
+        return await self._convert(response, "coin_records", convert_coin_records, decode, convert_coin_record_views, convert_coin_record_batch)
 
     
-    async def get_block_record_by_height(self, height: int, timeout: Optional[int] =-1) -> BlockRecord:
+
+    async def iter_coin_records_by_hint(
+            self,
+            hint: bytes32,
+            height_start: Optional[int] =None,
+            height_end: Optional[int] =None,
+            include_spent_coins: bool =False,
+            max_concurrency: Optional[int] =None,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[CoinRecord]:
+        """Iterate over coin records for coins hinted at across all pages and height windows.
+
+        Arguments:
+        hint -- the hint to examine
+
+        Keyword arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+        include_spent_coins -- boolean indicating whether to include spent coins
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        timeout -- request timeout in seconds
+        decode -- decoding level of the coin records (Decode.DICT, Decode.CHIA or Decode.VIEW). Defaults to the client's decoding level
+        """
+
+        decode = self._item_decode(decode, views=True)
+
+        async for coin_record in self._iter_coin_records(
+                lambda hs, he, page: self.get_coin_records_by_hint(hint, hs, he, include_spent_coins, page, timeout, decode),
+                height_start, height_end, max_concurrency
+        ):
+            yield coin_record
+
+
+    async def get_block_record_by_height(self, height: int, timeout: Optional[int] =-1, decode: Optional[Decode] =None) -> BlockRecord:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         params = {"height": height}
         
-        block_record = (await self._request(POST, "get_block_record_by_height", params, timeout=timeout)).json()["block_record"]
+        response = await self._request(POST, "get_block_record_by_height", params, timeout=timeout)
 
-        return BlockRecord.from_json_dict(block_record)
+        return await self._convert(response, "block_record", convert_block_record, decode)
 
     
-    async def get_block_record(self, header_hash: bytes32, timeout: Optional[int] =-1) -> BlockRecord:
+    async def get_block_record(self, header_hash: bytes32, timeout: Optional[int] =-1, decode: Optional[Decode] =None) -> BlockRecord:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         params = {"header_hash": header_hash.hex()}
 
-        block_record = (await self._request(POST, "get_block_record", params, timeout=timeout)).json()["block_record"]
+        response = await self._request(POST, "get_block_record", params, timeout=timeout)
+
+        return await self._convert(response, "block_record", convert_block_record, decode)
+
+    
+    async def _get_block_records(self, height_start: int, height_end: int, timeout: Optional[int] =-1, decode: Decode =Decode.CHIA) -> List[BlockRecord]:
+        """Return block records for a height range the node provider accepts in a single request, sorted by height."""
+
+        self._check_heights(height_start, height_end)
+    
+        params = {"start": height_start, "end": height_end}
 
-        return BlockRecord.from_json_dict(block_record)
+        response = await self._request(POST, "get_block_records", params, timeout=timeout)
+
+        if decode == Decode.DICT:
+            block_records = await self._decode_convert(response, "block_records", None)
+            return sorted(block_records, key=lambda br: br["height"])
+
+        block_records = await self._decode_convert(response, "block_records", convert_block_records)
+        return sorted(block_records, key=lambda br: br.height)
 
     
-    async def get_block_records(self, height_start: int =0, height_end: int =100, timeout: Optional[int] =-1) -> List[BlockRecord]:
-        """Return block records for given range of block heights.
+    async def get_block_records(
+            self,
+            height_start: int =0,
+            height_end: int =100,
+            timeout: Optional[int] =-1,
+            max_concurrency: Optional[int] =None,
+            decode: Optional[Decode] =None
+    ) -> List[BlockRecord]:
+        """Return block records for given range of block heights, sorted by height.
 
         Note that this endpoint's return type is List[BlockRecord], whereas the official full node RPC client returns List[Dict[str, Any]].
+        Ranges wider than the node provider allows are split into windows that are fetched concurrently.
         
         Keyword arguments:
         height_start -- starting block height (incl). This argument is required
         height_end -- ending block height (excl). This argument is required
         timeout -- request timeout in seconds
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        decode -- decoding level of the block records (Decode.DICT or Decode.CHIA). Defaults to the client's decoding level
+        """
+
+        return [br async for br in self.iter_block_records(height_start, height_end, timeout, max_concurrency, decode)]
+
+
+    async def iter_block_records(
+            self,
+            height_start: int,
+            height_end: int,
+            timeout: Optional[int] =-1,
+            max_concurrency: Optional[int] =None,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[BlockRecord]:
+        """Iterate over block records for given range of block heights in height order.
+
+        Arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+
+        Keyword arguments:
+        timeout -- request timeout in seconds
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        decode -- decoding level of the block records (Decode.DICT or Decode.CHIA). Defaults to the client's decoding level
         """
 
         if timeout is not None and timeout < 0: timeout = self.timeout
@@ -404,59 +1190,189 @@ class StandardClient():
         # This call requires a block height range to be provided
         if height_start is None or height_end is None:
             raise ValueError("Starting and ending block heights must be provided (cannot be None)")
-        
-        self._check_heights(height_start, height_end)
-    
-        params = {"start": height_start, "end": height_end}
 
-        block_records = (await self._request(POST, "get_block_records", params, timeout=timeout)).json()["block_records"]
+        decode = self._item_decode(decode)
+        windows = self._height_windows(height_start, height_end)
+
+        async for block_records in self._iter_windows(lambda hs, he: self._get_block_records(hs, he, timeout, decode), windows, max_concurrency):
+            for block_record in block_records:
+                yield block_record
+
+
+    async def stream_block_records(
+            self,
+            height_start: int,
+            height_end: int,
+            max_buffer_size: int =STREAM_MAX_BUFFER_SIZE,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[BlockRecord]:
+        """Stream block records for given range of block heights with bounded memory.
+
+        Block records are parsed and yielded one at a time while the response is being received.
+        Height windows are requested one after another.
+
+        Arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+
+        Keyword arguments:
+        max_buffer_size -- maximum number of bytes buffered for a single block record. Default is constants.STREAM_MAX_BUFFER_SIZE
+        timeout -- request timeout in seconds
+        decode -- decoding level of the block records (Decode.DICT or Decode.CHIA). Defaults to the client's decoding level
+        """
+
+        if height_start is None or height_end is None:
+            raise ValueError("Starting and ending block heights must be provided (cannot be None)")
+
+        decode = self._item_decode(decode)
 
-        return [BlockRecord.from_json_dict(br) for br in block_records]
+        for window_start, window_end in self._height_windows(height_start, height_end):
+            params = {"start": window_start, "end": window_end}
+            async for block_record in self._stream_array("get_block_records", params, "block_records", max_buffer_size, timeout):
+                yield block_record if decode == Decode.DICT else BlockRecord.from_json_dict(block_record)
 
     
-    async def get_block(self, header_hash: bytes32, timeout: Optional[int] =-1) -> FullBlock:
+    async def get_block(self, header_hash: bytes32, timeout: Optional[int] =-1, decode: Optional[Decode] =None) -> FullBlock:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         params = {"header_hash": header_hash.hex()}
         
-        block = (await self._request(POST, "get_block", params, timeout=timeout)).json()["block"]
+        response = await self._request(POST, "get_block", params, timeout=timeout)
 
-        return FullBlock.from_json_dict(block)
+        return await self._convert(response, "block", convert_full_block, decode)
 
     
-    async def get_blocks(self, height_start: int, height_end: int, timeout: Optional[int] =-1) -> List[FullBlock]:
+    async def _get_blocks(self, height_start: int, height_end: int, timeout: Optional[int] =-1, decode: Decode =Decode.CHIA) -> List[FullBlock]:
+        """Return full blocks for a height range the node provider accepts in a single request, sorted by height."""
+
+        self._check_heights(height_start, height_end)
+
+        params = {"start": height_start, "end": height_end}
+
+        response = await self._request(POST, "get_blocks", params, timeout=timeout)
+
+        if decode == Decode.DICT:
+            blocks = await self._decode_convert(response, "blocks", None)
+            return sorted(blocks, key=lambda b: b["reward_chain_block"]["height"])
+
+        blocks = await self._decode_convert(response, "blocks", convert_full_blocks)
+        return sorted(blocks, key=lambda b: b.height)
+
+    
+    async def get_blocks(
+            self,
+            height_start: int,
+            height_end: int,
+            timeout: Optional[int] =-1,
+            max_concurrency: Optional[int] =None,
+            decode: Optional[Decode] =None
+    ) -> List[FullBlock]:
+        """Return full blocks for given range of block heights, sorted by height.
+
+        Ranges wider than the node provider allows are split into windows that are fetched concurrently.
+
+        Arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+
+        Keyword arguments:
+        timeout -- request timeout in seconds
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        decode -- decoding level of the blocks (Decode.DICT or Decode.CHIA). Defaults to the client's decoding level
+        """
+
+        return [b async for b in self.iter_blocks(height_start, height_end, timeout, max_concurrency, decode)]
+
+
+    async def iter_blocks(
+            self,
+            height_start: int,
+            height_end: int,
+            timeout: Optional[int] =-1,
+            max_concurrency: Optional[int] =None,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[FullBlock]:
+        """Iterate over full blocks for given range of block heights in height order.
+
+        Arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+
+        Keyword arguments:
+        timeout -- request timeout in seconds
+        max_concurrency -- maximum number of height windows fetched concurrently. Defaults to the client's max_concurrency
+        decode -- decoding level of the blocks (Decode.DICT or Decode.CHIA). Defaults to the client's decoding level
+        """
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         if height_start is None or height_end is None:
             raise ValueError("Starting and ending block heights must be provided (cannot be None)")
 
-        self._check_heights(height_start, height_end)
+        decode = self._item_decode(decode)
+        windows = self._height_windows(height_start, height_end)
 
-        params = {"start": height_start, "end": height_end}
+        async for blocks in self._iter_windows(lambda hs, he: self._get_blocks(hs, he, timeout, decode), windows, max_concurrency):
+            for block in blocks:
+                yield block
 
-        blocks = (await self._request(POST, "get_blocks", params, timeout=timeout)).json()["blocks"]
 
-        return [FullBlock.from_json_dict(b) for b in blocks]
+    async def stream_blocks(
+            self,
+            height_start: int,
+            height_end: int,
+            max_buffer_size: int =STREAM_MAX_BUFFER_SIZE,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> AsyncIterator[FullBlock]:
+        """Stream full blocks for given range of block heights with bounded memory.
+
+        Unlike get_blocks and iter_blocks, which decode entire responses at once, blocks are parsed and yielded
+        one at a time while the response is being received. Height windows are requested one after another,
+        and blocks within a window are yielded in the order returned by the node provider.
+
+        Arguments:
+        height_start -- starting block height (incl)
+        height_end -- ending block height (excl)
+
+        Keyword arguments:
+        max_buffer_size -- maximum number of bytes buffered for a single block. Default is constants.STREAM_MAX_BUFFER_SIZE
+        timeout -- request timeout in seconds
+        decode -- decoding level of the blocks (Decode.DICT or Decode.CHIA). Defaults to the client's decoding level
+        """
+
+        if height_start is None or height_end is None:
+            raise ValueError("Starting and ending block heights must be provided (cannot be None)")
+
+        decode = self._item_decode(decode)
+
+        for window_start, window_end in self._height_windows(height_start, height_end):
+            params = {"start": window_start, "end": window_end}
+            async for block in self._stream_array("get_blocks", params, "blocks", max_buffer_size, timeout):
+                yield block if decode == Decode.DICT else FullBlock.from_json_dict(block)
 
         
-    async def get_additions_and_removals(self, header_hash: bytes32, timeout: Optional[int] =-1) -> Tuple[List[CoinRecord], List[CoinRecord]]:
+    async def get_additions_and_removals(
+            self,
+            header_hash: bytes32,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> Tuple[List[CoinRecord], List[CoinRecord]]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         params = {"header_hash": header_hash.hex()}
 
-        response = (await self._request(POST, "get_additions_and_removals", params, timeout=timeout)).json()
+        response = await self._request(POST, "get_additions_and_removals", params, timeout=timeout)
 
-        additions = []
-        removals = []
-        for coin_record in response["additions"]:
-            additions.append(CoinRecord.from_json_dict(coin_record_dict_backwards_compat(coin_record)))
-        for coin_record in response["removals"]:
-            removals.append(CoinRecord.from_json_dict(coin_record_dict_backwards_compat(coin_record)))
+        if decode is None: decode = self.decode
+        if decode == Decode.DICT:
+            additions_and_removals = self._decode(response)
+            return additions_and_removals["additions"], additions_and_removals["removals"]
 
-        return additions, removals
+        return await self._convert(response, None, convert_additions_and_removals, decode, convert_additions_and_removals_views, convert_additions_and_removals_batches)
 
     
     async def get_block_count_metrics(self, timeout: Optional[int] =-1) -> Dict[str, int]:
@@ -471,7 +1387,7 @@ class StandardClient():
         if timeout is not None and timeout < 0: timeout = self.timeout
 
         if self.node_provider == NodeProvider.FULLNODE:
-            return (await self._request(POST, "get_block_count_metrics", {}, timeout=timeout)).json()["metrics"]
+            return self._decode(await self._request(POST, "get_block_count_metrics", {}, timeout=timeout))["metrics"]
         else:
             raise ValueError(f"Endpoint get_block_count_metrics not supported by node provider ({self.node_provider})")
     
@@ -480,14 +1396,21 @@ class StandardClient():
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
-        blockchain_state = (await self._request(POST, "get_blockchain_state", {}, timeout=timeout)).json()["blockchain_state"]
+        blockchain_state = self._decode(await self._request(POST, "get_blockchain_state", {}, timeout=timeout))["blockchain_state"]
 
+        blockchain_state = dict(blockchain_state) # decoded response may be shared by coalesced requests
         if blockchain_state["peak"] is not None:
             blockchain_state["peak"] = BlockRecord.from_json_dict(blockchain_state["peak"])
         return cast(Dict[str, Any], blockchain_state)
 
     
-    async def get_puzzle_and_solution(self, coin_id: bytes32, height_spent: Optional[int] =None, timeout: Optional[int] =-1) -> CoinSpend:
+    async def get_puzzle_and_solution(
+            self,
+            coin_id: bytes32,
+            height_spent: Optional[int] =None,
+            timeout: Optional[int] =-1,
+            decode: Optional[Decode] =None
+    ) -> CoinSpend:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
@@ -503,20 +1426,20 @@ class StandardClient():
             else:
                 params["height"] = height_spent
             
-        coin_spend = (await self._request(POST, "get_puzzle_and_solution", params, timeout=timeout)).json()["coin_solution"]
+        response = await self._request(POST, "get_puzzle_and_solution", params, timeout=timeout)
 
-        return CoinSpend.from_json_dict(coin_spend)
+        return await self._convert(response, "coin_solution", convert_coin_spend, decode)
 
     
-    async def get_block_spends(self, header_hash: bytes32, timeout: Optional[int] =-1) -> List[CoinSpend]:
+    async def get_block_spends(self, header_hash: bytes32, timeout: Optional[int] =-1, decode: Optional[Decode] =None) -> List[CoinSpend]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         params = {"header_hash": header_hash.hex()}
         
-        block_spends = (await self._request(POST, "get_block_spends", params, timeout=timeout)).json()["block_spends"]
+        response = await self._request(POST, "get_block_spends", params, timeout=timeout)
 
-        return [CoinSpend.from_json_dict(bs) for bs in block_spends]
+        return await self._convert(response, "block_spends", convert_coin_spends, decode)
 
     
     async def get_all_mempool_items(self, timeout: Optional[int] =-1) -> Dict[bytes32, Dict[str, Any]]:
@@ -526,19 +1449,16 @@ class StandardClient():
         if not self.node_provider == NodeProvider.FULLNODE:
             raise ValueError(f"Endpoint get_all_mempool_items not supported by node provider ({self.node_provider})")
             
-        mempool_items = (await self._request(POST, "get_all_mempool_items", {}, timeout=timeout)).json()["mempool_items"]
+        response = await self._request(POST, "get_all_mempool_items", {}, timeout=timeout)
 
-        converted: Dict[bytes32, Dict[str, Any]] = {}
-        for tx_id_hex, item in mempool_items.items():
-            converted[hexstr_to_bytes32(tx_id_hex)] = convert_mempool_item(item)
-        return converted
+        return await self._decode_convert(response, "mempool_items", convert_mempool_items)
 
         
     async def get_all_mempool_tx_ids(self, timeout: Optional[int] =-1) -> List[bytes32]:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
 
-        tx_ids = (await self._request(POST, "get_all_mempool_tx_ids", {}, timeout=timeout)).json()["tx_ids"]
+        tx_ids = self._decode(await self._request(POST, "get_all_mempool_tx_ids", {}, timeout=timeout))["tx_ids"]
 
         return [hexstr_to_bytes32(tx_id_hex) for tx_id_hex in tx_ids]
 
@@ -554,16 +1474,16 @@ class StandardClient():
             "tx_id": tx_id.hex(),
             "include_pending": include_pending
         }
-        mempool_item = (await self._request(POST, "get_mempool_item_by_tx_id", params, timeout=timeout)).json()["mempool_item"]
+        response = await self._request(POST, "get_mempool_item_by_tx_id", params, timeout=timeout)
 
-        return convert_mempool_item(mempool_item)
+        return await self._decode_convert(response, "mempool_item", convert_mempool_item)
 
 
     async def get_initial_freeze_period(self, timeout: Optional[int] =-1) -> int:
 
         if timeout is not None and timeout < 0: timeout = self.timeout
 
-        initial_freeze_end_timestamp = (await self._request(POST, "get_initial_freeze_period", {}, timeout=timeout)).json()["INITIAL_FREEZE_END_TIMESTAMP"]
+        initial_freeze_end_timestamp = self._decode(await self._request(POST, "get_initial_freeze_period", {}, timeout=timeout))["INITIAL_FREEZE_END_TIMESTAMP"]
 
         return cast(int, initial_freeze_end_timestamp)
 
@@ -572,7 +1492,7 @@ class StandardClient():
 
         if timeout is not None and timeout < 0: timeout = self.timeout
 
-        return cast(bool, (await self._request(POST, "healthz", {}, timeout=timeout)).json()["success"])
+        return cast(bool, self._decode(await self._request(POST, "healthz", {}, timeout=timeout))["success"])
 
 
     async def get_fee_estimate(
@@ -627,7 +1547,7 @@ class StandardClient():
 
         # Send request
         if self.node_provider == NodeProvider.FULLNODE:
-            return (await self._request(POST, "get_fee_estimate", params, timeout=timeout)).json()
+            return self._decode(await self._request(POST, "get_fee_estimate", params, timeout=timeout))
         else:
             raise ValueError(f"Endpoint get_fee_estimate not supported by node provider ({self.node_provider})")
 
@@ -638,7 +1558,7 @@ class StandardClient():
 
         params = {"spend_bundle": spend_bundle.to_json_dict()}
 
-        response = (await self._request(POST, "push_tx", params, timeout=timeout)).json()
+        response = self._decode(await self._request(POST, "push_tx", params, timeout=timeout))
         
         return response
 
@@ -648,9 +1568,8 @@ class StandardClient():
         if timeout is not None and timeout < 0: timeout = self.timeout
 
         if self.node_provider == NodeProvider.FULLNODE:
-            response = (await self._request(POST, "get_network_info", {}, timeout=timeout)).json()
-            response.pop("success")
-            return response
+            response = self._decode(await self._request(POST, "get_network_info", {}, timeout=timeout))
+            return {k: v for k, v in response.items() if k != "success"}
         else:
             raise ValueError(f"Endpoint get_network_info not supported by node provider ({self.node_provider})")
 
@@ -676,7 +1595,7 @@ class StandardClient():
         }
         
         if self.node_provider == NodeProvider.FULLNODE:
-            return cast(int, (await self._request(POST, "get_network_space", params, timeout=timeout)).json()["space"])
+            return cast(int, self._decode(await self._request(POST, "get_network_space", params, timeout=timeout))["space"])
         else:
             raise ValueError(f"Endpoint get_network_space not supported by node provider ({self.node_provider})")
 
@@ -711,7 +1630,7 @@ class StandardClient():
             params = {"challenge_hash": challenge_hash.hex()}
         
         if self.node_provider == NodeProvider.FULLNODE:
-            response = (await self._request(POST, "get_recent_signage_point_or_eos", params, timeout=timeout)).json()
+            response = self._decode(await self._request(POST, "get_recent_signage_point_or_eos", params, timeout=timeout))
             if response["success"] == False or "error" in response.keys():
                 return None
             elif signage_point_hash is not None:
@@ -735,7 +1654,7 @@ class StandardClient():
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         if self.node_provider == NodeProvider.FULLNODE:
-            headers = (await self._request(POST, "get_unfinished_block_headers", {}, timeout=timeout)).json()["headers"]
+            headers = self._decode(await self._request(POST, "get_unfinished_block_headers", {}, timeout=timeout))["headers"]
             return [UnfinishedHeaderBlock.from_json_dict(h) for h in headers]
         else:
             raise ValueError(f"Endpoint get_unfinished_block_headers not supported by node provider ({self.node_provider})")
@@ -751,6 +1670,6 @@ class StandardClient():
         if timeout is not None and timeout < 0: timeout = self.timeout
         
         if self.node_provider == NodeProvider.FULLNODE:
-            return sorted([r for r in (await self._request(POST, "get_routes", {}, timeout=timeout)).json()["routes"] if r not in UNSUPPORTED_STANDARD_ENDPOINTS])
+            return sorted([r for r in self._decode(await self._request(POST, "get_routes", {}, timeout=timeout))["routes"] if r not in UNSUPPORTED_STANDARD_ENDPOINTS])
         elif self.node_provider == NodeProvider.MOJONODE:
             return sorted(MOJONODE_STANDARD_ENDPOINTS)
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class PollTrigger():
+    """Trigger for polling loops that fires every interval seconds, or earlier when Mojonode streams an event.
+
+    Without a client, the trigger fires every interval seconds. With a MojoClient, it also fires as soon as an event
+    for for_object arrives on the client's event stream, in which case interval only serves as a fallback for when
+    the stream is down. Events arriving while the polling loop is busy fire the trigger once. An on_event callback
+    can inspect each event and decide whether it fires the trigger.
+    """
+
+    def __init__(self, interval: float, client=None, for_object: Optional[str] =None, on_event: Optional[Callable[[Dict[str, Any]], bool]] =None):
+        """Initialize a PollTrigger instance.
+
+        Arguments:
+        interval -- maximum number of seconds between polls
+
+        Keyword arguments:
+        client -- MojoClient whose event stream fires the trigger. Default is None (fire every interval seconds only)
+        for_object -- object (coin, block, transaction) whose events fire the trigger. Default is None (all events)
+        on_event -- function called with each event dict, returning True if the event fires the trigger. Default is None (every event fires the trigger)
+        """
+
+        if interval <= 0: raise ValueError("Interval must be positive")
+
+        self.interval = interval
+        self.client = client
+        self.for_object = for_object
+        self.on_event = on_event
+        self._event = None # created on first use to bind it to the running event loop
+        self._listener = None
+        self._stream_id = None
+
+
+    @property
+    def connected(self) -> bool:
+        """True if the trigger is listening to an event stream that is connected to Mojonode."""
+
+        return self._stream_id is not None and self.client.stream_connected(self._stream_id)
+
+
+    async def _listen(self):
+        stream = self.client.events(for_object=self.for_object)
+        self._stream_id = await stream.__anext__()
+        try:
+            async for event in stream:
+                if self.on_event is None or self.on_event(event): self._event.set()
+        finally:
+            self._stream_id = None
+            await stream.aclose()
+
+
+    def _start(self):
+        if self._event is None: self._event = asyncio.Event()
+        if self.client is not None and self._listener is None: self._listener = asyncio.ensure_future(self._listen())
+
+
+    def fire(self):
+        """Fire the trigger, e.g. to poll right away."""
+
+        if self._event is None: self._event = asyncio.Event()
+        self._event.set()
+
+
+    async def wait(self):
+        """Wait until the trigger fires or interval seconds have passed."""
+
+        self._start()
+        try:
+            await asyncio.wait_for(self._event.wait(), self.interval)
+        except asyncio.TimeoutError:
+            pass
+        self._event.clear()
+
+
+    async def run(self, poll: Callable[[], Awaitable[Iterable[T]]]) -> AsyncIterator[T]:
+        """Poll right away and then each time the trigger fires, and yield the items of each poll's result.
+
+        Starts listening to the client's event stream before the first poll, and stops when the iteration ends.
+
+        Arguments:
+        poll -- coroutine function returning the items to yield
+        """
+
+        self._start()
+        try:
+            while True:
+                for item in await poll():
+                    yield item
+                await self.wait()
+        finally:
+            await self.aclose()
+
+
+    async def aclose(self):
+        """Stop listening to the client's event stream."""
+
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
@@ -1,8 +1,12 @@
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional, Sequence, Tuple
+from chia.consensus.block_record import BlockRecord
 from chia.types.blockchain_format.sized_bytes import bytes32
 from chia.types.blockchain_format.coin import Coin
 from chia.types.blockchain_format.program import Program
 from chia.types.coin_record import CoinRecord
+from chia.types.coin_spend import CoinSpend
+from chia.types.full_block import FullBlock
 from chia.types.spend_bundle import SpendBundle
 from chia.util.byte_types import hexstr_to_bytes
 
@@ -12,8 +16,44 @@ def hexstr_to_bytes32(hexstr: str) -> bytes32:
 
 
 def coin_record_dict_backwards_compat(coin_record: Dict[str, Any]) -> Dict[str, Any]:
-    del coin_record["spent"]
-    return coin_record
+    # Return a copy rather than deleting the key, since decoded responses may be shared
+    return {k: v for k, v in coin_record.items() if k != "spent"}
+
+
+def convert_coin_record(coin_record: Dict[str, Any]) -> CoinRecord:
+    return CoinRecord.from_json_dict(coin_record_dict_backwards_compat(coin_record))
+
+
+def convert_coin_records(coin_records: List[Dict[str, Any]]) -> List[CoinRecord]:
+    return [CoinRecord.from_json_dict(coin_record_dict_backwards_compat(cr)) for cr in coin_records]
+
+
+def convert_additions_and_removals(additions_and_removals: Dict[str, Any]) -> Tuple[List[CoinRecord], List[CoinRecord]]:
+    return convert_coin_records(additions_and_removals["additions"]), convert_coin_records(additions_and_removals["removals"])
+
+
+def convert_block_record(block_record: Dict[str, Any]) -> BlockRecord:
+    return BlockRecord.from_json_dict(block_record)
+
+
+def convert_block_records(block_records: List[Dict[str, Any]]) -> List[BlockRecord]:
+    return [BlockRecord.from_json_dict(br) for br in block_records]
+
+
+def convert_full_block(block: Dict[str, Any]) -> FullBlock:
+    return FullBlock.from_json_dict(block)
+
+
+def convert_full_blocks(blocks: List[Dict[str, Any]]) -> List[FullBlock]:
+    return [FullBlock.from_json_dict(b) for b in blocks]
+
+
+def convert_coin_spend(coin_spend: Dict[str, Any]) -> CoinSpend:
+    return CoinSpend.from_json_dict(coin_spend)
+
+
+def convert_coin_spends(coin_spends: List[Dict[str, Any]]) -> List[CoinSpend]:
+    return [CoinSpend.from_json_dict(cs) for cs in coin_spends]
 
 
 def convert_mempool_item(mempool_item: dict) -> Dict[str, Any]:
@@ -34,6 +74,10 @@ def convert_mempool_item(mempool_item: dict) -> Dict[str, Any]:
     return converted_mempool_item
 
 
+def convert_mempool_items(mempool_items: Dict[str, dict]) -> Dict[bytes32, Dict[str, Any]]:
+    return {hexstr_to_bytes32(tx_id_hex): convert_mempool_item(item) for tx_id_hex, item in mempool_items.items()}
+
+
 def convert_tx(tx: dict) -> Dict[str, Any]:
 
     return {
@@ -77,3 +121,29 @@ def convert_coin_transactions(coin_transactions: Dict[str, Optional[str]]) -> Di
             converted_coin_transactions["removed_by"] = hexstr_to_bytes32(coin_transactions["removed_by"])
         
     return converted_coin_transactions
+
+
+async def gather_bounded(coroutines: List[Awaitable[Any]], max_concurrency: int) -> List[Any]:
+    """Run coroutines concurrently, at most max_concurrency at a time, and return their results in order."""
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(coroutine: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*[run(c) for c in coroutines])
+
+
+def split_batches(items: Sequence[Any], batch_size: int) -> List[Sequence[Any]]:
+    """Split items into consecutive batches of at most batch_size items."""
+
+    return [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+
+def resolve_max_concurrency(client, max_concurrency: Optional[int]) -> int:
+    """Return max_concurrency, or the client's max_concurrency if it is None, after checking that it is positive."""
+
+    if max_concurrency is None: max_concurrency = client.max_concurrency
+    if max_concurrency < 1: raise ValueError("Maximum concurrency must be a positive integer")
+    return max_concurrency
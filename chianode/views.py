@@ -0,0 +1,225 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from chia.consensus.block_record import BlockRecord
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+from chia.types.spend_bundle import SpendBundle
+
+from .utils import hexstr_to_bytes32, convert_block_record, convert_coin_record, convert_tx
+
+
+class CoinRecordView():
+    """Lightweight view of a coin record as returned by the node provider.
+
+    Integer and boolean fields are read from the underlying dict directly. Hex fields are converted to bytes32,
+    and the Coin is built, only when they are first accessed. Use to_coin_record to convert the view into a CoinRecord.
+    """
+
+    __slots__ = ("data", "_coin", "_name")
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialize a CoinRecordView instance.
+
+        Arguments:
+        data -- coin record dict as returned by the node provider
+        """
+
+        self.data = data
+        self._coin = None
+        self._name = None
+
+
+    def __repr__(self) -> str:
+        return f"CoinRecordView({self.data!r})"
+
+
+    @property
+    def amount(self) -> int:
+        return self.data["coin"]["amount"]
+
+    @property
+    def parent_coin_info(self) -> bytes32:
+        return self.coin.parent_coin_info
+
+    @property
+    def puzzle_hash(self) -> bytes32:
+        return self.coin.puzzle_hash
+
+    @property
+    def coin(self) -> Coin:
+        if self._coin is None:
+            coin = self.data["coin"]
+            self._coin = Coin(hexstr_to_bytes32(coin["parent_coin_info"]), hexstr_to_bytes32(coin["puzzle_hash"]), coin["amount"])
+        return self._coin
+
+    @property
+    def name(self) -> bytes32:
+        if self._name is None:
+            self._name = self.coin.name()
+        return self._name
+
+    @property
+    def confirmed_block_index(self) -> int:
+        return self.data["confirmed_block_index"]
+
+    @property
+    def spent_block_index(self) -> int:
+        return self.data["spent_block_index"]
+
+    @property
+    def spent(self) -> bool:
+        return self.data["spent_block_index"] > 0
+
+    @property
+    def coinbase(self) -> bool:
+        return self.data["coinbase"]
+
+    @property
+    def timestamp(self) -> int:
+        return self.data["timestamp"]
+
+
+    def to_coin_record(self) -> CoinRecord:
+        """Convert the view into a CoinRecord."""
+
+        return convert_coin_record(self.data)
+
+
+def convert_coin_record_views(coin_records: List[Dict[str, Any]]) -> List[CoinRecordView]:
+    return [CoinRecordView(cr) for cr in coin_records]
+
+
+def convert_additions_and_removals_views(additions_and_removals: Dict[str, Any]) -> Tuple[List[CoinRecordView], List[CoinRecordView]]:
+    return convert_coin_record_views(additions_and_removals["additions"]), convert_coin_record_views(additions_and_removals["removals"])
+
+
+class EventView():
+    """Lightweight view of a Mojonode event.
+
+    The header fields ts, type and object are read when the view is created, so that events can be filtered and routed
+    without decoding their data. The object ID and chia types are built only when they are first accessed.
+    The decoded event dict is available as data, and the event's object as data["data"].
+    """
+
+    __slots__ = ("data", "ts", "type", "object", "_id")
+
+    def __init__(self, data: Dict[str, Any]):
+        """Initialize an EventView instance.
+
+        Arguments:
+        data -- event dict as streamed by Mojonode
+        """
+
+        self.data = data
+        self.ts: str = data["ts"]
+        self.type: str = data["type"]
+        self.object: str = data["object"]
+        self._id = None
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(ts={self.ts}, type={self.type})"
+
+
+    @property
+    def id(self) -> Optional[bytes32]:
+        """ID of the event's object (coin ID, header hash or transaction ID)."""
+
+        if self._id is None:
+            id_hex = self.data.get("id")
+            self._id = hexstr_to_bytes32(id_hex) if id_hex is not None else self._object_id()
+        return self._id
+
+    def _object_id(self) -> Optional[bytes32]:
+        return None
+
+
+class CoinEventView(EventView):
+    """View of a coin event. The event's object is a coin record."""
+
+    __slots__ = ("_coin_record", "_coin")
+
+    def __init__(self, data: Dict[str, Any]):
+        EventView.__init__(self, data)
+        self._coin_record = None
+        self._coin = None
+
+
+    @property
+    def coin(self) -> Coin:
+        if self._coin is None:
+            coin = self.data["data"]["coin"]
+            self._coin = Coin(hexstr_to_bytes32(coin["parent_coin_info"]), hexstr_to_bytes32(coin["puzzle_hash"]), coin["amount"])
+        return self._coin
+
+    @property
+    def coin_record(self) -> CoinRecord:
+        if self._coin_record is None:
+            self._coin_record = convert_coin_record(self.data["data"])
+        return self._coin_record
+
+    def _object_id(self) -> bytes32:
+        return self.coin.name()
+
+
+class BlockEventView(EventView):
+    """View of a block event. The event's object is a block record."""
+
+    __slots__ = ("_block_record",)
+
+    def __init__(self, data: Dict[str, Any]):
+        EventView.__init__(self, data)
+        self._block_record = None
+
+
+    @property
+    def height(self) -> int:
+        return self.data["data"]["height"]
+
+    @property
+    def block_record(self) -> BlockRecord:
+        if self._block_record is None:
+            self._block_record = convert_block_record(self.data["data"])
+        return self._block_record
+
+    def _object_id(self) -> bytes32:
+        return hexstr_to_bytes32(self.data["data"]["header_hash"])
+
+
+class TransactionEventView(EventView):
+    """View of a transaction event. The event's object is a transaction as returned by MojoClient.get_transaction."""
+
+    __slots__ = ("_transaction", "_spend_bundle")
+
+    def __init__(self, data: Dict[str, Any]):
+        EventView.__init__(self, data)
+        self._transaction = None
+        self._spend_bundle = None
+
+
+    @property
+    def transaction(self) -> Dict[str, Any]:
+        if self._transaction is None:
+            self._transaction = convert_tx(self.data["data"])
+        return self._transaction
+
+    @property
+    def spend_bundle(self) -> SpendBundle:
+        if self._spend_bundle is None:
+            if self._transaction is not None:
+                self._spend_bundle = self._transaction["mempool_item"]["spend_bundle"]
+            else:
+                self._spend_bundle = SpendBundle.from_json_dict(self.data["data"]["mempool_item"]["spend_bundle"])
+        return self._spend_bundle
+
+    def _object_id(self) -> bytes32:
+        return hexstr_to_bytes32(self.data["data"]["mempool_item"]["spend_bundle_name"])
+
+
+# Event view classes by object (constants.MOJONODE_EVENT_OBJECTS)
+EVENT_VIEWS = {"coin": CoinEventView, "block": BlockEventView, "transaction": TransactionEventView}
+
+
+def convert_event_view(event: Dict[str, Any]) -> EventView:
+    return EVENT_VIEWS.get(event["object"], EventView)(event)
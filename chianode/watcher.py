@@ -0,0 +1,193 @@
+import logging
+from collections import deque
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+
+from chia.consensus.block_record import BlockRecord
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+
+from .chain import ChainFollower
+from .constants import ChainEventType, Decode, DEFAULT_CHAIN_POLL_INTERVAL, DEFAULT_CHAIN_WINDOW, PUZZLE_HASH_BATCH_SIZE
+from .utils import gather_bounded, resolve_max_concurrency, split_batches
+
+
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+
+class PuzzleHashDelta():
+    """Coins with watched puzzle hashes created and spent in a block.
+
+    If reverted is True, the block was disconnected from the main chain by a reorg and its changes were undone,
+    i.e. the created coins no longer exist and the spent coins are unspent again.
+    """
+
+    __slots__ = ("block_record", "created", "spent", "reverted")
+
+    def __init__(self, block_record: BlockRecord, created: List[CoinRecord], spent: List[CoinRecord], reverted: bool =False):
+        self.block_record = block_record
+        self.created = created
+        self.spent = spent
+        self.reverted = reverted
+
+    def __bool__(self) -> bool:
+        return len(self.created) > 0 or len(self.spent) > 0
+
+    def __repr__(self) -> str:
+        return f"PuzzleHashDelta(height={self.block_record.height}, created={len(self.created)}, spent={len(self.spent)}, reverted={self.reverted})"
+
+
+class PuzzleHashWatcher():
+    """Watcher keeping an index of the unspent coins of a large set of puzzle hashes.
+
+    The index is loaded once with get_coin_records_by_puzzle_hashes, splitting the puzzle hashes into batches of
+    batch_size that are fetched concurrently. After that, the watcher follows the chain with a ChainFollower and
+    fetches the additions and removals of each new transaction block only, so that the cost of an update scales with
+    chain activity rather than with the number of puzzle hashes watched. Coins created or spent with a watched puzzle hash
+    are yielded as a PuzzleHashDelta per block. Blocks disconnected by a reorg are reverted.
+
+    The index must not be modified.
+    """
+
+    def __init__(
+            self,
+            client,
+            puzzle_hashes: Iterable[bytes32] = (),
+            batch_size: int = PUZZLE_HASH_BATCH_SIZE,
+            max_concurrency: Optional[int] = None,
+            interval: float = DEFAULT_CHAIN_POLL_INTERVAL,
+            window: int = DEFAULT_CHAIN_WINDOW,
+            use_events: bool = False
+    ):
+        """Initialize a PuzzleHashWatcher instance.
+
+        Arguments:
+        client -- StandardClient or MojoClient to fetch coin records with
+
+        Keyword arguments:
+        puzzle_hashes -- puzzle hashes to watch. More can be added with watch
+        batch_size -- maximum number of puzzle hashes per request when loading coins. Default is constants.PUZZLE_HASH_BATCH_SIZE
+        max_concurrency -- maximum number of concurrent requests. Defaults to the client's max_concurrency
+        interval -- maximum number of seconds between polls for new blocks. Default is constants.DEFAULT_CHAIN_POLL_INTERVAL
+        window -- number of recent blocks that can be reverted on a reorg. Default is constants.DEFAULT_CHAIN_WINDOW
+        use_events -- boolean indicating whether to poll on Mojonode block events. Requires a MojoClient. Default is False
+        """
+
+        if batch_size < 1: raise ValueError("Batch size must be a positive integer")
+
+        self.client = client
+        self.batch_size = batch_size
+        self.max_concurrency = resolve_max_concurrency(client, max_concurrency)
+        self.follower = ChainFollower(client, interval=interval, window=window, use_events=use_events)
+        self.unspent: Dict[bytes32, Dict[bytes32, CoinRecord]] = {} # unspent coin records by coin ID by puzzle hash
+        self._pending = set(puzzle_hashes) # puzzle hashes whose coins haven't been loaded yet
+        self._deltas: Dict[bytes32, PuzzleHashDelta] = {} # applied deltas of recent blocks by header hash, for reverting
+        self._delta_order = deque()
+
+
+    def watch(self, puzzle_hashes: Iterable[bytes32]):
+        """Add puzzle hashes to watch. Their coins are loaded on the next update."""
+
+        self._pending.update(ph for ph in puzzle_hashes if ph not in self.unspent)
+
+    def unwatch(self, puzzle_hashes: Iterable[bytes32]):
+        """Stop watching puzzle hashes and drop their coins from the index."""
+
+        for ph in puzzle_hashes:
+            self.unspent.pop(ph, None)
+            self._pending.discard(ph)
+
+
+    def get_unspent(self, puzzle_hash: bytes32) -> List[CoinRecord]:
+        """Return the unspent coin records of a watched puzzle hash."""
+
+        return list(self.unspent.get(puzzle_hash, {}).values())
+
+
+    async def _load(self):
+        """Load the unspent coins of pending puzzle hashes in concurrent batches."""
+
+        puzzle_hashes = list(self._pending)
+        batches = split_batches(puzzle_hashes, self.batch_size)
+
+        async def load_batch(batch: List[bytes32]) -> List[CoinRecord]:
+            return [cr async for cr in self.client.iter_coin_records_by_puzzle_hashes(batch, decode=Decode.CHIA)]
+
+        for ph in puzzle_hashes: self.unspent[ph] = {}
+        for coin_records in await gather_bounded([load_batch(b) for b in batches], self.max_concurrency):
+            for coin_record in coin_records:
+                if not coin_record.spent: self.unspent[coin_record.coin.puzzle_hash][coin_record.name] = coin_record
+
+        self._pending.difference_update(puzzle_hashes)
+        logging.debug(f"Loaded unspent coins of {len(puzzle_hashes)} puzzle hashes in {len(batches)} batches")
+
+
+    def _apply(self, block_record: BlockRecord, additions: List[CoinRecord], removals: List[CoinRecord]) -> PuzzleHashDelta:
+        """Apply a connected block's additions and removals to the index, recording only actual changes."""
+
+        created = []
+        for coin_record in additions:
+            coins = self.unspent.get(coin_record.coin.puzzle_hash)
+            if coins is not None and coin_record.name not in coins:
+                coins[coin_record.name] = coin_record
+                created.append(coin_record)
+
+        spent = []
+        for coin_record in removals:
+            coins = self.unspent.get(coin_record.coin.puzzle_hash)
+            if coins is not None and coin_record.name in coins:
+                spent.append(coins.pop(coin_record.name))
+
+        delta = PuzzleHashDelta(block_record, created, spent)
+        self._deltas[block_record.header_hash] = delta
+        self._delta_order.append(block_record.header_hash)
+        while len(self._delta_order) > self.follower.window:
+            self._deltas.pop(self._delta_order.popleft(), None)
+        return delta
+
+
+    def _revert(self, block_record: BlockRecord) -> PuzzleHashDelta:
+        """Undo the changes of a disconnected block."""
+
+        delta = self._deltas.pop(block_record.header_hash, None)
+        if delta is None: return PuzzleHashDelta(block_record, [], [], reverted=True)
+
+        for coin_record in delta.created:
+            coins = self.unspent.get(coin_record.coin.puzzle_hash)
+            if coins is not None: coins.pop(coin_record.name, None)
+        for coin_record in delta.spent:
+            coins = self.unspent.get(coin_record.coin.puzzle_hash)
+            if coins is not None: coins[coin_record.name] = coin_record
+
+        return PuzzleHashDelta(block_record, delta.created, delta.spent, reverted=True)
+
+
+    async def update(self) -> List[PuzzleHashDelta]:
+        """Load pending puzzle hashes, process new blocks, and return the resulting deltas in block order."""
+
+        events = await self.follower.poll()
+        if len(self._pending) > 0: await self._load()
+
+        # Fetch the additions and removals of connected transaction blocks concurrently
+        connected = [e.block_record for e in events if e.type == ChainEventType.CONNECT and e.block_record.is_transaction_block]
+        results = await gather_bounded([self.client.get_additions_and_removals(br.header_hash, decode=Decode.CHIA) for br in connected], self.max_concurrency)
+        additions_and_removals = {br.header_hash: result for br, result in zip(connected, results)}
+
+        deltas = []
+        for event in events:
+            block_record = event.block_record
+            if event.type == ChainEventType.DISCONNECT:
+                deltas.append(self._revert(block_record))
+            elif block_record.header_hash in additions_and_removals:
+                deltas.append(self._apply(block_record, *additions_and_removals[block_record.header_hash]))
+
+        return [d for d in deltas if d]
+
+
+    def deltas(self) -> AsyncIterator[PuzzleHashDelta]:
+        """Keep the index up to date and yield the changes to it."""
+
+        return self.follower.trigger.run(self.update)
+
+
+    def __aiter__(self) -> AsyncIterator[PuzzleHashDelta]:
+        return self.deltas()
@@ -1,3 +1,4 @@
+import httpx
 import pytest
 
 from chianode.utils import hexstr_to_bytes32
@@ -11,16 +12,32 @@ GENESIS_BLOCK_HEADER_HASH = {
     "mainnet": hexstr_to_bytes32("0xd780d22c7a87c9e01d98b49a0910f6701c3b95015741316b3fda042e5d7b81d2")
 }
 
-def get_client(node_provider: NodeProvider, timeout=5):
+def get_client(node_provider: NodeProvider, timeout=5, **kwargs):
 
     if node_provider == NodeProvider.FULLNODE:
-        return StandardClient(timeout=timeout)
+        return StandardClient(timeout=timeout, **kwargs)
     elif node_provider == NodeProvider.MOJONODE:
-        return MojoClient(timeout=timeout)
+        return MojoClient(timeout=timeout, **kwargs)
     else:
         raise ValueError(f"Unknown node provider {node_provider.name}")
 
 
+def get_mock_client(handler, **kwargs) -> StandardClient:
+    """Return a client sending its requests to handler, a function taking an httpx.Request and returning an httpx.Response."""
+
+    node = StandardClient(NodeProvider.MOJONODE, **kwargs)
+    node.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return node
+
+
+def get_mock_event_client(handler, **kwargs) -> MojoClient:
+    """Return a MojoClient sending its Mojonode requests, including event streams, to handler."""
+
+    node = MojoClient(**kwargs)
+    node.mojoclient = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return node
+
+
 #header_hash = "0x7357071bb77de2e98b9b1daf6b87f67dd8481fa144bcc03d331dba8664fc04f9" # BH 1 (transaction block w/o transactions)
 #header_hash = "0x058740efbd4bc33e23c46ff8b9f3207879e10aa96fe0d62ea976320f268b6f27" # BH 250005 (transaction block w/ transactions) -> additions and removals
 #header_hash = "0x9ec0447c9a4f5183f3235523aacf01fefb915f5ad90e2b5f1b45894412a4fb92" # BH 4030596 (not a transaction block)
@@ -0,0 +1,37 @@
+from chia.types.blockchain_format.sized_bytes import bytes32
+
+from chianode.batch import CoinRecordBatch
+from chianode.utils import convert_coin_records
+
+
+def coin_record_dict(parent: str, puzzle_hash: str, amount: int, spent_block_index: int =0):
+    return {
+        "coin": {"parent_coin_info": "0x" + parent * 32, "puzzle_hash": "0x" + puzzle_hash * 32, "amount": amount},
+        "confirmed_block_index": 100,
+        "spent_block_index": spent_block_index,
+        "coinbase": False,
+        "timestamp": 1680000000,
+    }
+
+
+### Coin record batches ###
+async def test_coin_record_batch():
+
+    coin_records = [
+        coin_record_dict("01", "ab", 2**63),
+        coin_record_dict("02", "ab", 2**63 + 5),
+        coin_record_dict("03", "cd", 7, spent_block_index=200),
+        coin_record_dict("04", "cd", 3),
+    ]
+
+    batch = CoinRecordBatch.from_dicts(coin_records)
+
+    assert len(batch) == 4, "Incorrect batch length"
+    assert batch.to_coin_records() == convert_coin_records(coin_records), "Coin records differ from converted coin records"
+    assert batch.name(2) == convert_coin_records(coin_records)[2].name, "Incorrect coin name"
+    assert batch.total_amount() == 2**64 + 15, "Incorrect total amount"
+    assert batch.balance_by_puzzle_hash() == {bytes32(b"\xab" * 32): 2**64 + 5, bytes32(b"\xcd" * 32): 3}, "Incorrect balances"
+
+    unspent = batch.with_puzzle_hash(bytes32(b"\xcd" * 32)).unspent()
+    assert unspent.to_coin_records() == convert_coin_records(coin_records[3:]), "Incorrect filtered coin records"
+    assert len(CoinRecordBatch.concat([batch, unspent])) == 5, "Incorrect concatenated batch length"
@@ -0,0 +1,76 @@
+import httpx
+
+from tests.conftest import get_mock_client
+
+from chianode.cache import ResponseCache, DiskResponseCache
+
+
+URL = "https://api.mojonode.com/get_block_record_by_height"
+
+
+def block_record_by_height_response(height):
+    return {"block_record": {"height": height}, "success": True}
+
+
+### Response caches ###
+async def test_response_cache_confirmation_depth():
+
+    cache = ResponseCache(max_entries=10, confirmation_depth=32)
+
+    # Not cached before a peak has been observed
+    cache.update("get_block_record_by_height", {"height": 100}, (URL, b"100"), b"100", block_record_by_height_response(100))
+    assert len(cache) == 0, "Block record cached without known peak"
+
+    cache.observe_peak(1000, "0xaa", "0x99")
+    cache.update("get_block_record_by_height", {"height": 100}, (URL, b"100"), b"100", block_record_by_height_response(100))
+    cache.update("get_block_record_by_height", {"height": 990}, (URL, b"990"), b"990", block_record_by_height_response(990))
+    assert cache.get((URL, b"100")) == b"100", "Final block record not cached"
+    assert cache.get((URL, b"990")) is None, "Block record above confirmation depth cached"
+
+    # Peak extending the previous one keeps cached responses
+    cache.observe_peak(1001, "0xbb", "0xaa")
+    cache.update("get_block_record_by_height", {"height": 969}, (URL, b"969"), b"969", block_record_by_height_response(969))
+    assert len(cache) == 2, "Cached response dropped without reorg"
+
+    # Lower peak from a lagging node is ignored
+    cache.observe_peak(900, "0x11", "0x10")
+    assert cache.peak_height == 1001 and len(cache) == 2, "Lower peak treated as reorg"
+
+    # Reorg drops height-keyed responses within confirmation depth of the new peak
+    cache.observe_peak(1001, "0xcc", "0xaa")
+    assert cache.get((URL, b"969")) is None, "Cached response not dropped after reorg"
+    assert cache.get((URL, b"100")) == b"100", "Cached response below confirmation depth dropped after reorg"
+
+
+async def test_disk_response_cache(tmp_path):
+
+    path = str(tmp_path / "cache.sqlite")
+
+    cache = DiskResponseCache(path, max_entries=5, write_batch_size=2)
+    cache.observe_peak(1000, "0xaa", "0x99")
+    for h in range(10):
+        cache.put((URL, str(h).encode()), str(h).encode(), h)
+    cache.close()
+
+    cache = DiskResponseCache(path, max_entries=5)
+    assert len(cache) == 5, "Cache not limited to max entries"
+    assert cache.peak_height == 1000, "Peak not persisted"
+    assert cache.get((URL, b"9")) == b"9", "Most recent response not persisted"
+    assert cache.get((URL, b"0")) is None, "Least recently used response not evicted"
+    cache.close()
+
+    # Access times are written by count on read-heavy workloads, not only when responses are added
+    cache = DiskResponseCache(path, max_entries=5, write_batch_size=3, flush_interval=None)
+    for _ in range(4):
+        for h in range(5, 10): cache.get((URL, str(h).encode()))
+    assert len(cache._accessed) < 3, "Access times not written"
+    cache.close()
+
+
+async def test_response_cache_lookups():
+
+    cache = ResponseCache(max_entries=10)
+    node = get_mock_client(lambda request: httpx.Response(200, json={"coin_records": [], "success": True}), response_cache=cache)
+
+    await node._request("POST", "get_coin_records_by_puzzle_hash", {"puzzle_hash": "0x00"})
+    assert cache.misses == 0, "Cache looked up for endpoint whose responses are never cached"
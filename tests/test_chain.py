@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from chianode.chain import ChainFollower
+from chianode.constants import ChainEventType
+
+
+class MockChainClient():
+    """Client serving a chain of block records identified by (height, fork) pairs."""
+
+    def __init__(self, height: int):
+        self.chain = [self.block_record(h, 0, 0) for h in range(height + 1)]
+
+    @staticmethod
+    def block_record(height: int, fork: int, prev_fork: int) -> SimpleNamespace:
+        return SimpleNamespace(height=height, weight=height, header_hash=(height, fork), prev_hash=(height - 1, prev_fork))
+
+    def extend(self, blocks: int, fork: int =0):
+        for _ in range(blocks):
+            prev = self.chain[-1]
+            self.chain.append(self.block_record(prev.height + 1, fork, prev.header_hash[1]))
+
+    def reorg(self, depth: int, blocks: int, fork: int):
+        del self.chain[-depth:]
+        self.extend(blocks, fork)
+
+    async def get_blockchain_state(self) -> dict:
+        return {"peak": self.chain[-1]}
+
+    async def get_block_records(self, height_start: int, height_end: int, decode=None) -> list:
+        return self.chain[height_start:height_end]
+
+
+### Chain follower ###
+async def test_chain_follower_reorg():
+
+    client = MockChainClient(100)
+    follower = ChainFollower(client, window=20)
+
+    events = await follower.poll()
+    assert [(e.type, e.block_record.height) for e in events] == [(ChainEventType.CONNECT, 100)], "Didn't start with the peak"
+
+    client.extend(3)
+    events = await follower.poll()
+    assert [e.block_record.height for e in events] == [101, 102, 103], "New blocks not connected in order"
+
+    client.reorg(2, 3, fork=1)
+    events = await follower.poll()
+    assert [(e.type, e.block_record.header_hash) for e in events] == [
+        (ChainEventType.DISCONNECT, (103, 0)),
+        (ChainEventType.DISCONNECT, (102, 0)),
+        (ChainEventType.CONNECT, (102, 1)),
+        (ChainEventType.CONNECT, (103, 1)),
+        (ChainEventType.CONNECT, (104, 1))
+    ], "Reorg not traced to fork point"
+    assert follower.peak.header_hash == (104, 1), "Incorrect peak"
+    assert follower.get_block_record((103, 0)) is None, "Disconnected block still in window"
+
+    assert await follower.poll() == [], "Unchanged peak produced events"
+
+
+async def test_chain_follower_catch_up():
+
+    client = MockChainClient(50)
+    follower = ChainFollower(client, window=20, start_height=10)
+
+    heights = []
+    while follower.peak is None or follower.peak.height < 50:
+        heights += [e.block_record.height for e in await follower.poll()]
+
+    assert heights == list(range(10, 51)), "Blocks not connected in order while catching up"
+    assert len(follower._by_height) == 20, "Window not bounded"
+    assert follower.get_block_record_by_height(31) is not None and follower.get_block_record_by_height(30) is None, "Incorrect window"
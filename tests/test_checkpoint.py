@@ -0,0 +1,67 @@
+import asyncio
+import httpx
+
+from tests.conftest import get_mock_event_client
+
+from chianode.checkpoint import CheckpointStore, FileCheckpointStore, SQLiteCheckpointStore
+from chianode.mojoclient import MojoClient
+
+
+def mock_event_client(events: list, connections: list) -> MojoClient:
+    """MojoClient streaming the given timestamps from from_ts (inclusive) onwards, three events per connection.
+
+    Each connection stays open without sending data after its last event.
+    """
+
+    async def stream(start: int):
+        for ts in events[start:start + 3]:
+            yield f'data: {{"ts": "{ts}", "object": "coin", "type": "test"}}\n\n'.encode()
+        await asyncio.Event().wait()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        from_ts = request.url.params["from_ts"]
+        connections.append(from_ts)
+        return httpx.Response(200, content=stream(0 if from_ts == "$" else events.index(from_ts)))
+
+    return get_mock_event_client(handler)
+
+
+### Event stream checkpoints ###
+async def test_events_resume_on_reconnect():
+
+    connections = []
+    client = mock_event_client(["1", "2", "3", "4", "5"], connections)
+    stream = client.events(checkpoint_store=CheckpointStore(), idle_timeout=0.1)
+    stream_id = await stream.__anext__()
+
+    received = []
+    async for event in stream:
+        received.append(event["ts"])
+        if event["ts"] == "5": await client.close_stream(stream_id)
+
+    assert received == ["1", "2", "3", "4", "5"], "Events lost or duplicated at reconnect boundary"
+    assert connections == ["$", "3"], "Stream not resumed from last event received"
+
+
+async def test_events_resume_from_checkpoint(tmp_path):
+
+    for store_class, name in [(FileCheckpointStore, "checkpoints.json"), (SQLiteCheckpointStore, "checkpoints.sqlite")]:
+        path = str(tmp_path / name)
+        client = mock_event_client(["1", "2", "3", "4", "5"], [])
+
+        store = store_class(path, write_batch_size=100, flush_interval=None)
+        stream = client.events(for_object="coin", checkpoint_store=store)
+        await stream.__anext__()
+        async for event in stream:
+            if event["ts"] == "3": break # event 3 received but not acknowledged
+        await stream.aclose()
+        store.close()
+
+        store = store_class(path)
+        assert store.load("coin:") == "2", f"{store_class.__name__} didn't persist last acknowledged event"
+        stream = client.events(for_object="coin", checkpoint_store=store)
+        await stream.__anext__()
+        event = await stream.__anext__()
+        assert event["ts"] == "3", f"{store_class.__name__} didn't resume after last acknowledged event"
+        await stream.aclose()
+        store.close()
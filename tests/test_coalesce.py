@@ -0,0 +1,25 @@
+import asyncio
+import httpx
+
+from tests.conftest import get_mock_client
+
+
+### Request coalescing ###
+async def test_coalesce_requests():
+
+    requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        await asyncio.sleep(0.05) # keep the request in flight while the others are sent
+        return httpx.Response(200, json={"network_name": "mainnet", "success": True})
+
+    for coalesce_requests, expected in [(True, 1), (False, 10)]:
+        requests.clear()
+        node = get_mock_client(handler, coalesce_requests=coalesce_requests)
+
+        responses = await asyncio.gather(*[node._request("POST", "get_network_info", {}) for _ in range(10)])
+
+        assert len(requests) == expected, f"Incorrect number of requests sent with coalesce_requests={coalesce_requests}"
+        assert all(node._decode(r)["network_name"] == "mainnet" for r in responses), "Incorrect response"
+        assert len(node._in_flight) == 0, "Completed request still in flight"
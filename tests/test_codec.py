@@ -0,0 +1,27 @@
+from chianode.codec import get_codec, StdlibCodec
+from chianode.constants import JsonCodec
+
+
+### JSON codecs ###
+async def test_codec_roundtrip():
+
+    codec = get_codec(JsonCodec.AUTO)
+
+    obj = {"height": 4000000, "header_hash": "0x12345678901234567890123456789012", "coins": [{"amount": 1750000000000}], "success": True}
+
+    assert codec.loads(codec.dumps(obj)) == obj, "Roundtrip changed data"
+    assert isinstance(codec.dumps(obj), bytes), "Encoded data is not bytes"
+
+
+async def test_codec_large_ints():
+
+    # Chia data contains integers that don't fit into 64 bits (e.g. weight, total_iters, network space)
+    data = b'{"space": 34359738368000000000000, "weight": [1, 18446744073709551616], "delta": -9223372036854775809}'
+
+    for json_codec in [JsonCodec.AUTO, JsonCodec.STDLIB]:
+        codec = get_codec(json_codec)
+        response = codec.loads(data)
+        assert response["space"] == 34359738368000000000000, "Large integer not decoded exactly"
+        assert isinstance(response["weight"][1], int), "Large integer decoded as float"
+        assert response["delta"] == -9223372036854775809, "Negative integer below 64 bits not decoded exactly"
+        assert codec.loads(codec.dumps(response)) == response, "Roundtrip changed data"
@@ -0,0 +1,44 @@
+import asyncio
+import httpx
+
+from chianode.connection import ConnectionPool
+
+
+async def serve_http(connections: list, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Minimal HTTP/1.1 server with keep-alive, recording each connection it accepts."""
+
+    connections.append(writer)
+    body = b'{"success": true}'
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"): await reader.readexactly(int(line.split(b":")[1]))
+            content = b"" if head.startswith(b"HEAD") else body
+            writer.write(b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\ncontent-length: %d\r\n\r\n" % len(body) + content)
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+
+
+### Connection pools ###
+async def test_connection_pool_shared():
+
+    connections = []
+    server = await asyncio.start_server(lambda r, w: serve_http(connections, r, w), "127.0.0.1", 0)
+    base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    async with ConnectionPool(http2=False) as pool:
+        clients = [httpx.AsyncClient(base_url=base_url, transport=pool.transport(base_url)) for _ in range(5)]
+
+        await pool.prewarm()
+        assert len(connections) == 1, "Connection not prewarmed"
+
+        for client in clients:
+            response = await client.post("/healthz", content=b"{}")
+            assert response.json()["success"], "Request failed"
+            await client.aclose()
+
+        assert len(connections) == 1, "Clients didn't share the pool's connection"
+
+    server.close()
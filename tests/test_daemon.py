@@ -0,0 +1,79 @@
+import asyncio
+import json
+import httpx
+import pytest
+from aiohttp import web
+
+from chianode.daemon import DaemonTransport
+
+
+async def start_daemon(handle_rpc):
+    """Minimal Chia daemon relaying requests for chia_full_node to handle_rpc, which returns the reply data.
+
+    Like the actual daemon, it drops requests for services that aren't running.
+    """
+
+    async def websocket_handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        async def reply(message, data):
+            await ws.send_str(json.dumps({**message, "ack": True, "origin": message["destination"], "destination": message["origin"], "data": data}))
+
+        async for msg in ws:
+            message = json.loads(msg.data)
+            if message["destination"] == "daemon":
+                await reply(message, {"success": message["command"] == "register_service"})
+            elif message["destination"] == "chia_full_node":
+                asyncio.ensure_future(handle_rpc(message)).add_done_callback(lambda f, m=message: asyncio.ensure_future(reply(m, f.result())))
+        return ws
+
+    app = web.Application()
+    app.router.add_get("/", websocket_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"ws://127.0.0.1:{port}"
+
+
+### Daemon transport ###
+async def test_daemon_transport_multiplexes_requests():
+
+    async def handle_rpc(message):
+        # Reply to later requests first
+        await asyncio.sleep(0.1 / (1 + message["data"]["i"]))
+        return {"command": message["command"], "i": message["data"]["i"], "success": True}
+
+    runner, url = await start_daemon(handle_rpc)
+    transport = DaemonTransport(url)
+
+    async with httpx.AsyncClient(base_url=DaemonTransport.base_url, transport=transport) as client:
+        responses = await asyncio.gather(*[client.post("/get_coin_record_by_name", json={"i": i}) for i in range(10)])
+
+    assert [r.json()["i"] for r in responses] == list(range(10)), "Replies not matched to requests"
+    assert all(r.json()["command"] == "get_coin_record_by_name" for r in responses), "Wrong command sent"
+
+    await runner.cleanup()
+
+
+async def test_daemon_transport_timeout_and_reconnect():
+
+    async def handle_rpc(message):
+        return {"success": True}
+
+    runner, url = await start_daemon(handle_rpc)
+
+    async with httpx.AsyncClient(base_url=DaemonTransport.base_url, transport=DaemonTransport(url, destination="chia_wallet"), timeout=0.2) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.post("/get_wallets", json={})
+
+    transport = DaemonTransport(url)
+    async with httpx.AsyncClient(base_url=DaemonTransport.base_url, transport=transport) as client:
+        await client.post("/healthz", json={})
+        await transport._websocket.close()
+        response = await client.post("/healthz", json={})
+        assert response.json()["success"], "Transport didn't reconnect"
+
+    await runner.cleanup()
@@ -0,0 +1,187 @@
+import asyncio
+import httpx
+import json
+
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+
+from tests.conftest import get_mock_event_client
+
+from chianode.constants import Decode
+from chianode.retry import RetryPolicy
+from chianode.views import BlockEventView, CoinEventView
+
+
+### Event stream liveness ###
+async def test_events_idle_timeout_and_close():
+
+    connections = []
+    open_connections = []
+
+    async def hanging_stream(i: int):
+        open_connections.append(i)
+        try:
+            yield f'data: {{"ts": "{i}", "object": "coin", "type": "test"}}\n\n'.encode()
+            await asyncio.Event().wait() # connection stays open without sending data
+        finally:
+            open_connections.remove(i)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        connections.append(request.url.params["from_ts"])
+        return httpx.Response(200, content=hanging_stream(len(connections)))
+
+    client = get_mock_event_client(handler)
+    stream = client.events(idle_timeout=0.1)
+    stream_id = await stream.__anext__()
+
+    assert (await stream.__anext__())["ts"] == "1", "First event not received"
+    assert (await stream.__anext__())["ts"] == "2", "Idle stream not reconnected"
+    assert connections[:2] == ["$", "1"], "Idle stream not resumed from last event"
+
+    await client.close_stream(stream_id)
+    assert open_connections == [], "Connection not released when stream closed"
+    await stream.aclose()
+
+
+async def test_events_reconnect_backoff():
+
+    connections = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        connections.append(request.url.params["from_ts"])
+        return httpx.Response(503)
+
+    client = get_mock_event_client(handler)
+    stream = client.events(reconnect_policy=RetryPolicy(backoff_base=0.01, backoff_max=0.05))
+    stream_id = await stream.__anext__()
+    consumer = asyncio.ensure_future(stream.__anext__())
+
+    await asyncio.sleep(0.3)
+    assert 1 < len(connections) < 60, f"Reconnects not delayed by backoff ({len(connections)} connections)"
+
+    await client.close_stream(stream_id)
+    assert client._streams == {}, "Stream not closed"
+    try:
+        await asyncio.wait_for(consumer, 1)
+    except StopAsyncIteration:
+        pass
+
+
+async def test_events_idle_reconnect_without_backoff():
+
+    connections = []
+
+    async def quiet_stream():
+        yield b": heartbeat\n\n"
+        await asyncio.Event().wait()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        connections.append(request.url.params["from_ts"])
+        return httpx.Response(200, content=quiet_stream())
+
+    client = get_mock_event_client(handler)
+    stream = client.events(idle_timeout=0.05, reconnect_policy=RetryPolicy(backoff_base=10, backoff_max=10))
+    stream_id = await stream.__anext__()
+    consumer = asyncio.ensure_future(stream.__anext__())
+
+    await asyncio.sleep(0.3)
+    assert len(connections) > 2, "Reconnects of idle connections delayed by backoff"
+
+    await client.close_stream(stream_id)
+    try:
+        await asyncio.wait_for(consumer, 1)
+    except StopAsyncIteration:
+        pass
+
+
+async def test_events_empty_stream_backoff():
+
+    connections = []
+    ticks = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        connections.append(asyncio.get_running_loop().time())
+        return httpx.Response(200, content=b"") # accepted, then closed without data
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    client = get_mock_event_client(handler)
+    stream = client.events(reconnect_policy=RetryPolicy(backoff_base=0.05, backoff_max=1))
+    stream_id = await stream.__anext__()
+    consumer = asyncio.ensure_future(stream.__anext__())
+    ticking = asyncio.ensure_future(ticker())
+
+    await asyncio.sleep(0.3)
+    assert 1 < len(connections) < 20, f"Reconnects of empty streams not delayed by backoff ({len(connections)} connections)"
+    assert connections[-1] - connections[0] > 0.05, "Connection attempts not spaced out by backoff"
+    assert ticks > 10, "Reconnect loop starved other tasks"
+
+    ticking.cancel()
+    await client.close_stream(stream_id)
+    try:
+        await asyncio.wait_for(consumer, 1)
+    except StopAsyncIteration:
+        pass
+
+
+async def test_events_aclose():
+
+    client = get_mock_event_client(lambda request: httpx.Response(200, content=b""))
+    for stream in [client.events(), client.events_batched()]:
+        await stream.__anext__()
+        await stream.aclose()
+    assert client._streams == {}, "Stream not closed with its generator before the first event"
+
+
+### Batched event stream ###
+async def test_events_batched():
+
+    async def stream(n: int):
+        for i in range(n):
+            yield f'data: {{"ts": "{i}", "object": "coin", "type": "test"}}\n\n'.encode()
+        await asyncio.Event().wait()
+
+    client = get_mock_event_client(lambda request: httpx.Response(200, content=stream(7)))
+    batches = client.events_batched(max_items=3, max_latency_ms=50)
+    stream_id = await batches.__anext__()
+
+    received = []
+    async for batch in batches:
+        received.append([e["ts"] for e in batch])
+        if len(received) == 3: await client.close_stream(stream_id)
+
+    assert received == [["0", "1", "2"], ["3", "4", "5"], ["6"]], "Events not batched by size and latency"
+
+
+### Event views ###
+async def test_event_views():
+
+    coin_record = CoinRecord(Coin(bytes32(b"\x00" * 32), bytes32(b"\x01" * 32), 1000), 10, 0, False, 1680000000)
+    events = [
+        {"ts": "1", "object": "coin", "type": "add", "data": coin_record.to_json_dict()},
+        {"ts": "2", "object": "block", "type": "add", "data": {"height": 10, "header_hash": "0x" + "02" * 32}}
+    ]
+
+    async def stream():
+        for e in events:
+            yield f"data: {json.dumps(e)}\n\n".encode()
+        await asyncio.Event().wait()
+
+    client = get_mock_event_client(lambda request: httpx.Response(200, content=stream()))
+    batches = client.events_batched(max_items=2, decode=Decode.VIEW)
+    stream_id = await batches.__anext__()
+    coin_event, block_event = await batches.__anext__()
+    await client.close_stream(stream_id)
+    await batches.aclose()
+
+    assert isinstance(coin_event, CoinEventView) and isinstance(block_event, BlockEventView), "Events not wrapped in views by object"
+    assert (coin_event.ts, coin_event.type, coin_event.object) == ("1", "add", "coin"), "Incorrect header fields"
+    assert coin_event._coin_record is None, "Coin record built before access"
+    assert coin_event.id == coin_record.name, "Incorrect coin ID"
+    assert coin_event.coin_record == coin_record, "Incorrect coin record"
+    assert block_event.height == 10 and block_event.id == bytes32(b"\x02" * 32), "Incorrect block fields"
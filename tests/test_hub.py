@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+
+from chianode.constants import OverflowPolicy
+from chianode.hub import EventHub
+
+
+class MockEventClient():
+    """Client streaming the events put into its queue. Exceptions put into the queue are raised by the stream."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue()
+        self._streams = {}
+        self.streams_opened = 0
+
+    async def events(self, for_object: str =None, from_ts: str ="$", filters=""):
+        self.streams_opened += 1
+        stream_id = str(self.streams_opened)
+        self._streams[stream_id] = True
+        try:
+            yield stream_id
+            while True:
+                item = await self.queue.get()
+                if isinstance(item, Exception): raise item
+                yield item
+        finally:
+            self._streams.pop(stream_id)
+
+
+def event(i: int, obj: str) -> dict:
+    return {"ts": str(i), "object": obj, "type": "test"}
+
+
+### Event hub ###
+async def test_event_hub_fan_out():
+
+    client = MockEventClient()
+    async with EventHub(client) as hub:
+        coins = hub.subscribe(for_object="coin")
+        everything = hub.subscribe(predicate=lambda e: int(e["ts"]) % 2 == 0)
+        for i in range(6): client.queue.put_nowait(event(i, "coin" if i < 3 else "block"))
+
+        received = []
+        async for e in coins:
+            received.append(e["ts"])
+            if len(received) == 3: coins.close()
+        assert received == ["0", "1", "2"], "Incorrect events received for object"
+
+        received = []
+        async for e in everything:
+            received.append(e["ts"])
+            if len(received) == 3: everything.close()
+        assert received == ["0", "2", "4"], "Predicate not applied"
+
+    assert client.streams_opened == 1, "Subscribers didn't share one upstream stream"
+    assert len(client._streams) == 0, "Upstream stream not closed with last subscription"
+
+
+async def test_event_hub_overflow():
+
+    client = MockEventClient()
+    async with EventHub(client) as hub:
+        latest = hub.subscribe(maxsize=2, overflow=OverflowPolicy.DROP_OLDEST)
+        strict = hub.subscribe(maxsize=2, overflow=OverflowPolicy.DISCONNECT)
+        keeper = hub.subscribe(maxsize=10)
+        for i in range(5): client.queue.put_nowait(event(i, "coin"))
+        while keeper.queue.qsize() < 5: await asyncio.sleep(0.01)
+
+        assert [latest.queue.get_nowait()["ts"] for _ in range(2)] == ["3", "4"], "Oldest events not dropped"
+        assert latest.dropped == 3, "Dropped events not counted"
+
+        received = []
+        with pytest.raises(asyncio.QueueFull):
+            async for e in strict: received.append(e["ts"])
+        assert received == ["0", "1"], "Buffered events not delivered before disconnecting"
+        assert strict not in hub.subscriptions, "Overflowed subscription not removed"
+
+
+async def test_event_hub_upstream_error():
+
+    client = MockEventClient()
+    async with EventHub(client) as hub:
+        subscription = hub.subscribe()
+        client.queue.put_nowait(event(0, "coin"))
+        client.queue.put_nowait(ValueError("Malformed event"))
+
+        received = []
+        async def consume():
+            async for e in subscription: received.append(e["ts"])
+        with pytest.raises(ValueError, match="Malformed event"):
+            await asyncio.wait_for(consume(), 1)
+        assert received == ["0"], "Buffered events not delivered before the error"
+        assert subscription.closed and hub.subscriptions == [], "Subscription not closed on upstream error"
+        assert len(client._streams) == 0, "Upstream stream not closed after error"
@@ -0,0 +1,52 @@
+import asyncio
+import httpx
+import time
+
+from chianode.limiter import AIMDLimiter, RateLimiter, TokenBucket
+
+
+### Rate limiting ###
+async def test_token_bucket():
+
+    bucket = TokenBucket(rate=100, burst=5)
+
+    start = time.monotonic()
+    for _ in range(25): await bucket.acquire()
+
+    # 5 tokens available immediately, the remaining 20 at 100 per second
+    assert time.monotonic() - start >= 0.19, "Token bucket exceeded rate"
+
+
+async def test_aimd_limiter():
+
+    limiter = AIMDLimiter(initial_limit=8, max_limit=16)
+
+    starts = []
+    for _ in range(8):
+        await limiter.acquire()
+        starts.append(time.monotonic())
+    assert limiter.in_flight == 8, "Incorrect number of requests in flight"
+
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done(), "Concurrency limit exceeded"
+
+    # Overload signals from requests sent before the decrease only decrease the limit once
+    for start in starts[:4]: limiter.release(start, overloaded=True)
+    assert limiter.limit == 4, "Limit not decreased multiplicatively once"
+
+    for start in starts[4:]: limiter.release(start, overloaded=False)
+    assert limiter.limit > 4, "Limit not increased additively"
+    await asyncio.sleep(0)
+    assert waiter.done(), "Waiting request not woken up"
+
+
+async def test_rate_limiter_overload():
+
+    limiter = RateLimiter(initial_concurrency=8)
+    request = httpx.Request("POST", "https://api.mojonode.com/get_network_info")
+
+    start = await limiter.acquire()
+    limiter.release("get_network_info", start, response=httpx.Response(429, request=request))
+
+    assert limiter.concurrency.limit == 4, "Limit not decreased on 429 response"
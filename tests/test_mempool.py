@@ -0,0 +1,62 @@
+import httpx
+import json
+
+from chianode.constants import NodeProvider
+from chianode.mempool import MempoolMirror
+from chianode.pool import Node, NodePool
+from chianode.standardclient import StandardClient
+from chianode.utils import hexstr_to_bytes32
+
+
+def mempool_item(tx_id: str) -> dict:
+    return {
+        "additions": [],
+        "cost": 1000,
+        "fee": 10,
+        "npc_result": {},
+        "removals": [],
+        "spend_bundle": {"coin_spends": [], "aggregated_signature": "0xc0" + "00" * 95},
+        "spend_bundle_name": tx_id
+    }
+
+
+def mock_client(mempool: list, requests: list) -> StandardClient:
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.url.path)
+        if request.url.path == "/get_all_mempool_tx_ids":
+            return httpx.Response(200, json={"tx_ids": mempool, "success": True})
+        if request.url.path == "/get_mempool_item_by_tx_id":
+            tx_id = json.loads(request.content)["tx_id"]
+            if "0x" + tx_id not in mempool: return httpx.Response(200, json={"error": "not found", "success": False})
+            return httpx.Response(200, json={"mempool_item": mempool_item("0x" + tx_id), "success": True})
+        return httpx.Response(404)
+
+    node = Node("https://node0:8555", transport=httpx.MockTransport(handler))
+    return StandardClient(NodeProvider.FULLNODE, node_pool=NodePool([node], health_check_interval=None))
+
+
+### Mempool mirror ###
+async def test_mempool_mirror_sync():
+
+    tx_ids = ["0x" + f"{i:064x}" for i in range(5)]
+    mempool = tx_ids[:3]
+    requests = []
+    mirror = MempoolMirror(mock_client(mempool, requests))
+    deltas = []
+    mirror.add_callback(deltas.append)
+
+    delta = await mirror.sync()
+    assert set(delta.added.keys()) == {hexstr_to_bytes32(t) for t in tx_ids[:3]}, "Initial sync didn't add entire mempool"
+    assert len(delta.removed) == 0, "Initial sync removed items"
+
+    mempool[:] = tx_ids[2:]
+    requests.clear()
+    delta = await mirror.sync()
+    assert set(delta.added.keys()) == {hexstr_to_bytes32(t) for t in tx_ids[3:]}, "Incorrect items added"
+    assert set(delta.removed.keys()) == {hexstr_to_bytes32(t) for t in tx_ids[:2]}, "Incorrect items removed"
+    assert requests.count("/get_mempool_item_by_tx_id") == 2, "Items already in the mirror fetched again"
+    assert set(mirror.items.keys()) == {hexstr_to_bytes32(t) for t in tx_ids[2:]}, "Mirror out of sync"
+
+    assert not await mirror.sync(), "Unchanged mempool produced a delta"
+    assert len(deltas) == 2, "Callbacks not called for non-empty deltas only"
@@ -1,3 +1,4 @@
+import asyncio
 from pytest import fixture
 from tests.conftest import NODE_PROVIDER, GENESIS_BLOCK_HEADER_HASH, get_client
 
@@ -12,7 +13,9 @@ from chia.types.coin_spend import CoinSpend
 from chia.types.full_block import FullBlock
 
 from chianode.utils import hexstr_to_bytes32
-from chianode.constants import NodeProvider
+from chianode.cache import ResponseCache
+from chianode.views import CoinRecordView
+from chianode.constants import NodeProvider, Decode, MOJONODE_PAGE_SIZE
 
 
 ### Standard endpoints ###
@@ -30,6 +33,40 @@ async def test_get_coin_record_by_name():
     assert response.coin.puzzle_hash == hexstr_to_bytes32("0x997a541493e903cab06be45b375afe2392f7e12d26777e66ab6b58151084a78e"), "Incorrect puzzle hash"
 
 
+async def test_get_coin_record_by_name_decode():
+
+    coin_name = hexstr_to_bytes32("0x9c085e5ae0e383ef13d0391283c066824af2228dadf6c8623cba1689d552804c")
+
+    node = get_client(NODE_PROVIDER)
+
+    raw = await node.get_coin_record_by_name(coin_name, decode=Decode.RAW)
+    assert isinstance(raw, bytes), "Raw response not bytes"
+
+    response = await node.get_coin_record_by_name(coin_name, decode=Decode.DICT)
+    assert isinstance(response, dict), "Response not a dict (or missing)"
+    assert response["confirmed_block_index"] == 395182, "Incorrect confirmed block index"
+    assert response["spent_block_index"] == 400000, "Incorrect spent block index"
+    assert response["coin"]["amount"] == (await node.get_coin_record_by_name(coin_name)).coin.amount, "Amount differs from decoded coin record"
+
+
+
+async def test_get_coin_records_by_names_view():
+
+    height_start = 395182
+    height_end = 395183
+    coin_name_1 = hexstr_to_bytes32("0x9c085e5ae0e383ef13d0391283c066824af2228dadf6c8623cba1689d552804c")
+
+    node = get_client(NODE_PROVIDER)
+
+    response = await node.get_coin_records_by_names([coin_name_1], height_start, height_end, True, 1, decode=Decode.VIEW)
+
+    assert isinstance(response, list), "Response is not a list (or missing)"
+    assert isinstance(response[0], CoinRecordView), "Element in response list is not a coin record view (or missing)"
+    assert response[0].name == coin_name_1, "Incorrect coin name"
+    assert response[0].spent_block_index == 400000, "Incorrect spent block index"
+    assert response[0].to_coin_record() == (await node.get_coin_records_by_names([coin_name_1], height_start, height_end, True, 1))[0], "Converted view differs from coin record"
+
+
 async def test_get_coin_records_by_names():
 
     # Test 1
@@ -159,6 +196,29 @@ async def test_get_coin_records_by_puzzle_hash():
     assert response[0].timestamp == 1694508671, "Incorrect timestamp"
 
     
+async def test_iter_coin_records_by_puzzle_hash():
+
+    node = get_client(NODE_PROVIDER)
+
+    puzzle_hash = hexstr_to_bytes32("0xf9cd704e2aace4203e17ed600bfc9fd20f475671e30d41cae912090febf16c20")
+
+    response = [cr async for cr in node.iter_coin_records_by_puzzle_hash(puzzle_hash, include_spent_coins=True)]
+
+    # Walking the pages by hand must return the same coin records
+    expected = []
+    page = 1
+    while True:
+        coin_records = await node.get_coin_records_by_puzzle_hash(puzzle_hash, None, None, True, page)
+        expected += coin_records
+        if len(coin_records) < MOJONODE_PAGE_SIZE: break
+        page += 1
+
+    for cr in response:
+        assert isinstance(cr, CoinRecord), "Element in response is not a coin record (or missing)"
+    assert len(response) >= 10, "Missing coin record(s)"
+    assert sorted([cr.name for cr in response]) == sorted([cr.name for cr in expected]), "Coin records differ from paginated query"
+
+    
 async def test_get_coin_records_by_puzzle_hashes():
 
     node = get_client(NODE_PROVIDER)
@@ -297,6 +357,18 @@ async def test_get_block_records():
     for h in range(len(response)):
         assert response[h].height == height_start + h, "Incorrect block height"
 
+    # Test 3 (range wider than MOJONODE_MAX_HEIGHT_DIFF is split into windows)
+    height_start = 4000000
+    height_end = 4000250
+
+    response = await node.get_block_records(height_start, height_end, max_concurrency=2)
+
+    assert isinstance(response, list), "Response not a list (or missing)"
+    assert len(response) >= height_end - height_start, "Block record(s) missing"
+    assert len(response) <= height_end - height_start, "Too many block records"
+    for h in range(len(response)):
+        assert response[h].height == height_start + h, "Incorrect block height"
+
 
 async def test_get_block():
 
@@ -358,6 +430,28 @@ async def test_get_block():
     assert response.reward_chain_block.signage_point_index == 22, "Incorrect reward chain block signage point index"
 
     
+async def test_get_block_cached():
+
+    cache = ResponseCache(max_entries=10)
+    node = get_client(NODE_PROVIDER, response_cache=cache)
+
+    header_hash = GENESIS_BLOCK_HEADER_HASH["mainnet"]
+
+    block_1 = await node.get_block(header_hash)
+    block_2 = await node.get_block(header_hash)
+
+    assert block_1 == block_2, "Cached block differs from fetched block"
+    assert cache.hits == 1, "Block not served from cache"
+    assert len(cache) == 1, "Unexpected number of cached responses"
+
+    # Block records by height are only cached once a peak has been observed
+    await node.get_block_record_by_height(1)
+    assert len(cache) == 1, "Block record cached without known peak"
+    await node.get_blockchain_state()
+    await node.get_block_record_by_height(1)
+    assert len(cache) == 2, "Block record by height not cached"
+
+
 async def test_get_blocks():
 
     node = get_client(NODE_PROVIDER)
@@ -386,6 +480,22 @@ async def test_get_blocks():
             assert response[h].foliage_transaction_block is None, "Foliage transaction block is not None"
 
 
+async def test_stream_blocks():
+
+    node = get_client(NODE_PROVIDER)
+
+    height_start = 4030570
+    height_end = 4030620
+
+    expected = await node.get_blocks(height_start, height_end)
+
+    response = [b async for b in node.stream_blocks(height_start, height_end)]
+
+    for b in response:
+        assert isinstance(b, FullBlock), "Streamed element is not a full block"
+    assert sorted([b.header_hash for b in response]) == sorted([b.header_hash for b in expected]), "Streamed blocks differ from get_blocks"
+
+
 async def test_get_additions_and_removals():
 
     node = get_client(NODE_PROVIDER)
@@ -444,6 +554,18 @@ async def test_get_blockchain_state(blockchain_state_keys, peak_keys, sync_keys)
     assert set(sync_keys).issubset(response["sync"].keys()), "Missing key(s) in sync"
 
 
+async def test_get_blockchain_state_coalesced():
+
+    node = get_client(NODE_PROVIDER, coalesce_requests=True)
+
+    responses = await asyncio.gather(*[node.get_blockchain_state() for _ in range(10)])
+
+    for response in responses:
+        assert isinstance(response["peak"], BlockRecord), "Peak is not a block record"
+        assert response["peak"].header_hash == responses[0]["peak"].header_hash, "Coalesced requests returned different peaks"
+    assert len(node._in_flight) == 0, "Completed request still in flight"
+
+
 async def test_get_puzzle_and_solution():
 
     node = get_client(NODE_PROVIDER)
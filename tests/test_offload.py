@@ -0,0 +1,55 @@
+import asyncio
+import chia_rs
+import httpx
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.reduction import ForkingPickler
+
+from tests.conftest import get_mock_client
+
+from chianode.cache import ResponseCache
+from chianode.codec import get_codec
+from chianode.constants import JsonCodec
+from chianode.offload import decode_response
+from chianode.utils import convert_coin_records
+
+
+### Process pool offload ###
+async def test_decode_response_process_pool():
+
+    coin_records = [
+        {
+            "coin": {"parent_coin_info": "0x" + f"{i:064x}", "puzzle_hash": "0x" + "ab" * 32, "amount": 1750000000000 + i},
+            "confirmed_block_index": 100,
+            "spent_block_index": 0,
+            "coinbase": False,
+            "timestamp": 1680000000,
+        }
+        for i in range(10)
+    ]
+    content = get_codec(JsonCodec.STDLIB).dumps({"coin_records": coin_records, "success": True})
+
+    # Coins are native (chia_rs) objects, which can only be returned from the worker process with the registered reducers
+    with ProcessPoolExecutor(1) as executor:
+        response = await asyncio.get_running_loop().run_in_executor(executor, decode_response, content, JsonCodec.STDLIB, "coin_records", convert_coin_records)
+
+    assert response == convert_coin_records(coin_records), "Coin records decoded in process pool differ"
+    assert chia_rs.Coin not in ForkingPickler._extra_reducers, "Reducers registered in the process using the client"
+
+
+async def test_cached_response_decoded_in_executor():
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/get_block_spends": return httpx.Response(200, json={"error": "not found", "success": False})
+        return httpx.Response(200, json={"block_record": {"height": 1}, "success": True})
+
+    cache = ResponseCache(max_entries=10)
+    with ThreadPoolExecutor(1) as executor:
+        node = get_mock_client(handler, response_cache=cache, executor=executor, executor_threshold=1)
+
+        response = await node._request("POST", "get_block_record", {"header_hash": "0x00"})
+        assert len(cache) == 1, "Content-addressed response not cached"
+        assert node._decoded.get(response) is None, "Cached response decoded on the event loop"
+        assert (await node._decode_convert(response, "block_record", None))["height"] == 1, "Incorrect response decoded in executor"
+
+        await node._request("POST", "get_block_spends", {"header_hash": "0x00"})
+        assert len(cache) == 1, "Failed response cached"
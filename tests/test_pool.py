@@ -0,0 +1,42 @@
+import httpx
+
+from chianode.constants import NodeProvider
+from chianode.pool import Node, NodePool
+from chianode.standardclient import StandardClient
+
+
+def mock_node(name: str, peak_height: int, available: bool =True) -> Node:
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if not available: raise httpx.ConnectError(f"{name} unavailable")
+        if request.url.path == "/healthz": return httpx.Response(200, json={"success": True})
+        if request.url.path == "/get_blockchain_state":
+            return httpx.Response(200, json={"blockchain_state": {"peak": {"height": peak_height}}, "success": True})
+        return httpx.Response(200, json={"node": name, "success": True})
+
+    return Node(f"https://{name}:8555", transport=httpx.MockTransport(handler))
+
+
+### Node pools ###
+async def test_node_pool_failover():
+
+    nodes = [mock_node("node0", 1000), mock_node("node1", 1000, available=False), mock_node("node2", 1000)]
+    node = StandardClient(NodeProvider.FULLNODE, node_pool=NodePool(nodes, health_check_interval=None))
+
+    for _ in range(6):
+        response = node._decode(await node._request("POST", "get_network_info", {}))
+        assert response["node"] in ["node0", "node2"], "Request not failed over to available node"
+
+    assert not nodes[1].healthy, "Unavailable node not marked unhealthy"
+    assert all(n.outstanding == 0 for n in nodes), "Outstanding requests not tracked correctly"
+
+
+async def test_node_pool_health_check():
+
+    nodes = [mock_node("node0", 1000), mock_node("node1", 1000, available=False), mock_node("node2", 900)]
+    pool = NodePool(nodes, max_peak_lag=10, health_check_interval=None)
+
+    healthy = await pool.check_health()
+
+    assert healthy == [nodes[0]], "Incorrect healthy nodes"
+    assert nodes[2].peak_height == 900, "Incorrect peak height"
@@ -0,0 +1,70 @@
+import asyncio
+import httpx
+
+from tests.conftest import get_mock_client
+
+from chianode.retry import HedgingPolicy, RetryPolicy
+
+
+### Retries and hedging ###
+async def test_retry_transient_errors():
+
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if request.url.path == "/push_tx": raise httpx.ConnectError("Connection reset")
+        if len(attempts) == 1: raise httpx.ReadTimeout("Timed out")
+        if len(attempts) == 2: return httpx.Response(503)
+        return httpx.Response(200, json={"success": True})
+
+    node = get_mock_client(handler, retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01))
+
+    assert node._decode(await node._request("POST", "get_network_info", {}))["success"], "Request not retried until successful"
+    assert len(attempts) == 3, "Incorrect number of attempts"
+
+    attempts.clear()
+    try:
+        await node._request("POST", "push_tx", {})
+        assert False, "Error not raised"
+    except httpx.ConnectError:
+        assert len(attempts) == 1, "Non-idempotent request retried"
+
+
+async def test_hedged_request():
+
+    attempts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if len(attempts) == 1: await asyncio.sleep(10) # stuck request
+        return httpx.Response(200, json={"success": True})
+
+    node = get_mock_client(handler, hedging_policy=HedgingPolicy(initial_delay=0.05))
+
+    response = await asyncio.wait_for(node._request("POST", "get_network_info", {}), 1)
+
+    assert node._decode(response)["success"], "Hedged request failed"
+    assert len(attempts) == 2, "Request not hedged"
+
+
+async def test_streamed_request_errors():
+
+    attempts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        attempts.append(request.url.path)
+        if len(attempts) == 1: return httpx.Response(503)
+        if len(attempts) == 2: return httpx.Response(200, json={"block_records": [{"height": 1}, {"height": 2}], "success": True})
+        return httpx.Response(400, json={"error": "bad request", "success": False})
+
+    node = get_mock_client(handler, retry_policy=RetryPolicy(max_attempts=3, backoff_base=0.01))
+
+    items = [item async for item in node._stream_array("get_block_records", {"start": 1, "end": 3}, "block_records", 1024)]
+    assert items == [{"height": 1}, {"height": 2}], "Streamed request not retried until successful"
+
+    try:
+        async for _ in node._stream_array("get_block_records", {"start": 1, "end": 3}, "block_records", 1024): pass
+        assert False, "Error not raised"
+    except httpx.HTTPStatusError as e:
+        assert e.response.status_code == 400, "Incorrect error raised for error response"
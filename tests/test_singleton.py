@@ -0,0 +1,104 @@
+import asyncio
+from types import SimpleNamespace
+
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+
+from chianode.singleton import SingletonTracker
+
+
+class MockSingletonClient():
+    """Client serving singletons whose current coins can be spent and recreated."""
+
+    max_concurrency = 4
+
+    def __init__(self, addresses: list):
+        self.coins = {a: CoinRecord(Coin(bytes32(b"\x00" * 32), bytes32(b"\x01" * 32), i), 1, 0, False, 0) for i, a in enumerate(addresses)}
+        self.requests = []
+        self.connected = True
+        self._streams = {}
+        self._events = asyncio.Queue()
+
+    def spend(self, address: str):
+        old = self.coins[address]
+        self.coins[address] = CoinRecord(Coin(old.name, old.coin.puzzle_hash, old.coin.amount), 2, 0, False, 0)
+        self.coins[old.name] = CoinRecord(old.coin, 1, 2, False, 0) # spent record of the previous coin
+        self._events.put_nowait({"ts": "1", "object": "coin", "type": "test", "data": self.coins[old.name].to_json_dict()})
+
+    async def events(self, for_object: str =None):
+        self._streams["stream"] = None
+        try:
+            yield "stream"
+            while True:
+                yield await self._events.get()
+        finally:
+            self._streams.pop("stream")
+
+    def stream_connected(self, stream_id: str) -> bool:
+        return self.connected
+
+    async def get_latest_singleton_spend(self, address: str) -> tuple:
+        self.requests.append("get_latest_singleton_spend")
+        return SimpleNamespace(address=address), self.coins[address]
+
+    async def iter_coin_records_by_names(self, coin_ids: list, include_spent_coins: bool =False, decode=None):
+        self.requests.append("get_coin_records_by_names")
+        for coin_id in coin_ids:
+            yield self.coins.get(coin_id) or next(cr for cr in self.coins.values() if cr.name == coin_id)
+
+
+### Singleton tracker ###
+async def test_singleton_tracker():
+
+    addresses = [f"nft{i}" for i in range(10)]
+    client = MockSingletonClient(addresses)
+    tracker = SingletonTracker(client, addresses, batch_size=4)
+
+    changed = await tracker.update()
+    assert {s.address for s in changed} == set(addresses), "Singletons not loaded"
+    assert client.requests.count("get_latest_singleton_spend") == 10, "Incorrect number of initial loads"
+
+    client.requests.clear()
+    client.spend("nft3")
+    changed = await tracker.update()
+    assert [s.address for s in changed] == ["nft3"], "Spent singleton not updated"
+    assert tracker.get("nft3").coin_record.confirmed_block_index == 2, "Current coin not updated"
+    assert client.requests.count("get_coin_records_by_names") == 3, "Current coins not looked up in batches"
+    assert client.requests.count("get_latest_singleton_spend") == 1, "Unspent singletons fetched again"
+
+
+async def test_singleton_tracker_events():
+
+    addresses = [f"nft{i}" for i in range(10)]
+    client = MockSingletonClient(addresses)
+    client.spend("nft5") # spend of an untracked coin, streamed before the tracker loaded its singletons
+    tracker = SingletonTracker(client, addresses, batch_size=4, interval=0.05, use_events=True)
+    changed = asyncio.Queue()
+
+    async def consume():
+        async for state in tracker:
+            changed.put_nowait(state)
+    consumer = asyncio.ensure_future(consume())
+
+    loaded = [(await changed.get()).address for _ in addresses]
+    assert set(loaded) == set(addresses), "Singletons not loaded"
+    await asyncio.sleep(0.2) # updates while connected switch to streamed spends
+
+    client.requests.clear()
+    client.spend("nft3")
+    state = await asyncio.wait_for(changed.get(), 1)
+    assert state.address == "nft3" and state.coin_record.confirmed_block_index == 2, "Streamed spend not applied"
+    assert client.requests == ["get_latest_singleton_spend"], "Current coins polled while event stream connected"
+
+    client.connected = False
+    client.requests.clear()
+    client._events = asyncio.Queue() # spends no longer streamed
+    client.spend("nft7")
+    state = await asyncio.wait_for(changed.get(), 1)
+    assert state.address == "nft7", "Spend not polled while event stream down"
+    assert "get_coin_records_by_names" in client.requests, "Current coins not polled while event stream down"
+
+    consumer.cancel()
+    await asyncio.gather(consumer, return_exceptions=True)
+    assert client._streams == {}, "Event stream not closed"
@@ -0,0 +1,83 @@
+from types import SimpleNamespace
+
+from chia.types.blockchain_format.coin import Coin
+from chia.types.blockchain_format.sized_bytes import bytes32
+from chia.types.coin_record import CoinRecord
+
+from chianode.watcher import PuzzleHashWatcher
+
+
+def puzzle_hash(i: int) -> bytes32:
+    return bytes32(i.to_bytes(32, "big"))
+
+
+def coin_record(ph: bytes32, amount: int, height: int, spent_height: int =0) -> CoinRecord:
+    return CoinRecord(Coin(bytes32(b"\x00" * 32), ph, amount), height, spent_height, False, 0)
+
+
+class MockWatcherClient():
+    """Client serving a chain whose blocks create and spend coins."""
+
+    max_concurrency = 4
+
+    def __init__(self):
+        self.chain = []
+        self.blocks = {} # additions and removals by header hash
+        self.coin_records = {}
+        self.requests = []
+        self.add_block([], [])
+
+    def add_block(self, additions: list, removals: list, fork: int =0):
+        height = len(self.chain)
+        prev_hash = self.chain[-1].header_hash if height > 0 else None
+        block_record = SimpleNamespace(height=height, weight=height, header_hash=(height, fork), prev_hash=prev_hash, is_transaction_block=True)
+        self.chain.append(block_record)
+        removals = [coin_record(cr.coin.puzzle_hash, cr.coin.amount, cr.confirmed_block_index, height) for cr in removals]
+        self.blocks[block_record.header_hash] = (additions, removals)
+        for cr in additions + removals: self.coin_records[cr.name] = cr
+
+    async def get_blockchain_state(self) -> dict:
+        return {"peak": self.chain[-1]}
+
+    async def get_block_records(self, height_start: int, height_end: int, decode=None) -> list:
+        return self.chain[height_start:height_end]
+
+    async def get_additions_and_removals(self, header_hash, decode=None) -> tuple:
+        self.requests.append("get_additions_and_removals")
+        return self.blocks[header_hash]
+
+    async def iter_coin_records_by_puzzle_hashes(self, puzzle_hashes: list, decode=None):
+        self.requests.append("get_coin_records_by_puzzle_hashes")
+        for cr in self.coin_records.values():
+            if cr.coin.puzzle_hash in puzzle_hashes and not cr.spent: yield cr
+
+
+### Puzzle hash watcher ###
+async def test_puzzle_hash_watcher():
+
+    client = MockWatcherClient()
+    phs = [puzzle_hash(i) for i in range(10)]
+    old = [coin_record(phs[i], 1, 0) for i in range(10)]
+    client.add_block(old, [])
+
+    watcher = PuzzleHashWatcher(client, phs[:5], batch_size=2)
+    await watcher.update()
+    assert client.requests.count("get_coin_records_by_puzzle_hashes") == 3, "Puzzle hashes not loaded in batches"
+    assert all(len(watcher.get_unspent(ph)) == 1 for ph in phs[:5]), "Unspent coins not loaded"
+    assert watcher.get_unspent(phs[5]) == [], "Coins of unwatched puzzle hash loaded"
+
+    new = coin_record(phs[0], 2, 2)
+    client.add_block([new, coin_record(phs[6], 2, 2)], [old[1], old[7]])
+    client.requests.clear()
+    deltas = await watcher.update()
+    assert client.requests == ["get_additions_and_removals"], "Update didn't only fetch the new block's additions and removals"
+    assert len(deltas) == 1 and deltas[0].created == [new] and [cr.name for cr in deltas[0].spent] == [old[1].name], "Incorrect delta"
+    assert watcher.get_unspent(phs[1]) == [], "Spent coin still in index"
+
+    # Reorg the new block out
+    del client.chain[-1]
+    client.add_block([], [], fork=1)
+    client.add_block([], [], fork=1)
+    deltas = await watcher.update()
+    assert deltas[0].reverted and deltas[0].created == [new], "Disconnected block not reverted"
+    assert len(watcher.get_unspent(phs[0])) == 1 and len(watcher.get_unspent(phs[1])) == 1, "Index not restored after reorg"